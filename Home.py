@@ -1,196 +1,39 @@
 import streamlit as st
 from datetime import datetime
 import pytz
-import json
-import time  # For potential delays or loading indicators
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import (
-    StaleElementReferenceException,
-    NoSuchElementException,
-)
 
-# Import webdriver-manager if available (but don't fail if not)
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-except ImportError:
-    ChromeDriverManager = None
+from app_files.breakdowns import get_calculation_memo
+from app_files.live_rates import (
+    POLL_INTERVAL,
+    RATES_FRESH,
+    apply_rates,
+    format_age,
+    get_rate_aggregator,
+    get_rate_history,
+    get_rate_fetch,
+    get_rate_poller,
+    get_scraper_breaker,
+    rates_age,
+    rates_freshness,
+    started_driver_pool,
+    sync_live_rates,
+)
 
 RATE_DICT = dict()
 
-
-# --- Function to get live rates ---
-@st.cache_data(ttl=10)  # Optional: Cache for 10 seconds to avoid rapid re-fetching
-def get_rates():
-    """
-    Get the live rates of Au and Ag from vickygold.in, handling dynamic content.
-    Uses Selenium for fetching the rates.
-    """
-    # Use the Selenium approach to get rates
-    return get_rates_with_selenium()
+# Seconds per point of the intraday movement chart
+INTRADAY_BUCKET = 5 * 60
 
 
-# Function to get rates with Selenium
-def get_rates_with_selenium():
+def format_rate(value):
     """
-    Selenium-based approach to get rates.
+    Whole rupees without decimals, otherwise with paise.
     """
-    driver = None  # Initialize driver to None for the finally block
-    try:
-        # Setup chrome options
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")  # Often necessary in headless mode
-        options.add_argument(
-            "--window-size=1920x1080"
-        )  # Can sometimes help with element finding
-
-        # Try the newer Selenium Manager approach first (Selenium 4.6.0+)
-        try:
-            # This approach uses Selenium Manager which automatically handles driver compatibility
-            driver = webdriver.Chrome(options=options)
-        except Exception as e:
-            # Fallback to webdriver-manager if the built-in manager fails
-            print(f"Selenium Manager failed: {e}. Falling back to webdriver-manager...")
-            # Force webdriver-manager to get the latest version
-            from webdriver_manager.chrome import ChromeDriverManager
-            from webdriver_manager.core.utils import ChromeType
-
-            # Use cache_valid_range=0 to force checking for the latest driver
-            driver = webdriver.Chrome(
-                service=Service(
-                    ChromeDriverManager(
-                        chrome_type=ChromeType.CHROMIUM, cache_valid_range=0
-                    ).install()
-                ),
-                options=options,
-            )
+    return f"{value:,.0f}" if value == int(value) else f"{value:,.2f}"
 
-        # Get the dynamic content from the website
-        driver.get("https://vickygold.in/Liverate.html")
 
-        # Wait for the dynamic content to load
-        driver.implicitly_wait(6)  # Implicit wait for elements to appear initially
-
-        # Get the current time in IST
-        ist = pytz.timezone("Asia/Kolkata")
-        ist_time = datetime.now(ist).strftime("%Y-%m-%d %H:%M:%S %Z")
-
-        rates = {"timestamp": ist_time}
-
-        # Unified approach to extract both gold and silver rates at once
-        # Wait for the elements to be properly loaded
-        time.sleep(3)
-
-        try:
-            # Use a single approach to extract all rates at once using global XPaths
-            # This avoids refreshing the page between gold and silver extraction
-
-            # Get all rate elements at once
-            all_symbols = driver.find_elements(By.XPATH, "//span[@id='GoldSymbol']")
-            all_rates = driver.find_elements(By.XPATH, "//span[@id='GoldSell']")
-
-            # Process all rates
-            for i in range(min(len(all_symbols), len(all_rates))):
-                try:
-                    symbol_text = all_symbols[i].text.strip()
-                    rate_text = all_rates[i].text.strip()
-
-                    # Skip empty entries
-                    if not symbol_text or not rate_text:
-                        continue
-
-                    # Add prefix if we can determine if it's gold or silver based on parent container
-                    parent_element = all_symbols[i].find_element(
-                        By.XPATH, "../../../.."
-                    )
-                    parent_id = parent_element.get_attribute("id")
-
-                    # Add appropriate prefix for clarity if not already present
-                    if parent_id == "silverproduct" and "Silver" not in symbol_text:
-                        prefix = "Silver "
-                    elif parent_id == "divProduct" and "Gold" not in symbol_text:
-                        prefix = "Gold "
-                    else:
-                        prefix = ""
-
-                    final_symbol = f"{prefix}{symbol_text}"
-                    rates[final_symbol] = rate_text
-
-                except Exception as e:
-                    print(f"Error extracting rate for item {i}: {e}")
-                    continue
-
-        except Exception as e:
-            print(f"Error extracting rates: {e}")
-            # Continue to fallback methods
-
-        # Check if any rates were found besides the timestamp
-        if len(rates) <= 1:
-            # Last resort - direct extraction by ID
-            print(
-                "No rates found with container approach. Trying direct ID extraction..."
-            )
-
-            try:
-                # Find all elements with ID="GoldSymbol"
-                all_symbol_elements = driver.find_elements(
-                    By.XPATH, "//*[@id='GoldSymbol']"
-                )
-                all_rate_elements = driver.find_elements(
-                    By.XPATH, "//*[@id='GoldSell']"
-                )
-
-                if len(all_symbol_elements) > 0 and len(all_rate_elements) > 0:
-                    for i in range(
-                        min(len(all_symbol_elements), len(all_rate_elements))
-                    ):
-                        symbol_text = all_symbol_elements[i].text.strip()
-                        rate_text = all_rate_elements[i].text.strip()
-
-                        if symbol_text and rate_text:
-                            rates[symbol_text] = rate_text
-            except Exception as e:
-                print(f"Error in direct extraction: {e}")
-
-            # If still no rates, try parsing the page source using regex
-            if len(rates) <= 1:
-                try:
-                    html_content = driver.page_source
-                    # Look for rates using regex pattern matching
-                    import re
-
-                    # Simple pattern to find GoldSymbol and GoldSell pairs in HTML
-                    pattern = r'id="GoldSymbol"[^>]*>([^<]+)</span>.*?id="GoldSell"[^>]*>([^<]+)</span>'
-                    matches = re.findall(pattern, html_content, re.DOTALL)
-
-                    for symbol, rate in matches:
-                        if symbol.strip() and rate.strip():
-                            rates[symbol.strip()] = rate.strip()
-
-                except Exception as e:
-                    print(f"Error during HTML content extraction: {e}")
-
-        # Return the collected rates
-        return rates
-
-    except Exception as e:
-        error_message = f"An error occurred during scraping: {e}"
-        print(error_message)  # Log the error for debugging
-        return {"error": error_message}
-
-    finally:
-        # Ensure driver is quit even if an error occurs
-        if driver:
-            try:
-                driver.quit()
-            except Exception as quit_e:
-                print(f"Error quitting WebDriver: {quit_e}")
+# Seconds a click on "Live Rates" waits for the very first rates after a server start
+FIRST_RATES_TIMEOUT = 20
 
 
 # Main Streamlit App
@@ -292,6 +135,9 @@ if "live_rates" not in st.session_state:
 if "last_fetch_error" not in st.session_state:
     st.session_state["last_fetch_error"] = None
 
+# Pick up rates published by the background poller since the last rerun
+sync_live_rates()
+
 # Create a clean container for the rates display
 rates_container = st.container()
 
@@ -305,84 +151,31 @@ with col_btn:
     # minimal spacer to slightly nudge button
     st.write("")
     if st.button("📊 Live Rates", use_container_width=True):
-        with st.spinner("Fetching live rates..."):
-            rates_data = get_rates()
-
-            # Check if there was an error fetching the rates
-            if "error" in rates_data:
-                st.session_state["live_rates"] = None
-                st.session_state["last_fetch_error"] = rates_data["error"]
-                with col_status:
-                    st.error(
-                        f"Failed to fetch rates: {st.session_state['last_fetch_error']}"
-                    )
-            else:
-                st.session_state["live_rates"] = rates_data
-                st.session_state["last_fetch_error"] = None
-
-                # Reset the user_modified_gold_rate flag when fetching new rates
-                # This allows the new rates to be applied to all pages
-                if "user_modified_gold_rate" in st.session_state:
-                    del st.session_state["user_modified_gold_rate"]
-
-                print(f"{rates_data=}")
-                gold_995_key = next(
-                    (key for key in rates_data if "gold 995 100gms" in key.lower()),
-                    None,
+        poller = get_rate_poller()
+        snapshot = poller.snapshot()
+        if snapshot is None:
+            # Only right after a server start: wait for the poller's first fetch
+            with st.spinner("Fetching live rates..."):
+                poller.refresh()
+                snapshot = poller.wait_for_snapshot(FIRST_RATES_TIMEOUT)
+
+        # Check if there was an error fetching the rates
+        if snapshot is None:
+            st.session_state["live_rates"] = None
+            st.session_state["last_fetch_error"] = (
+                poller.last_error or "Timed out waiting for the live rates."
+            )
+            with col_status:
+                st.error(
+                    f"Failed to fetch rates: {st.session_state['last_fetch_error']}"
                 )
-
-                if gold_995_key:
-                    try:
-                        # Extract and clean the rate value (label may include dynamic suffixes)
-                        rate_str = rates_data[gold_995_key]
-                        # Remove non-numeric characters except decimal point
-                        clean_rate = "".join(
-                            c for c in rate_str if c.isdigit() or c == "."
-                        )
-                        rate_value = float(clean_rate)
-
-                        # Store the per gram rate (100gms rate divided by 100)
-                        st.session_state["current_gold_rate_per_gram"] = (
-                            rate_value / 10
-                        )  # Calculate 916 (22k) gold rate
-                        # Formula: (Gold 995 rate / 24 * 22) + 500, then ceiling to the next 500
-                        rate_916 = (rate_value / 24 * 22) + 500
-                        # Ceiling to the next 500
-                        import math
-
-                        rate_916 = (
-                            math.ceil(rate_916 / 500) * 500
-                        )  # Store the 916 gold rate for display and use in calculator pages
-                        st.session_state["gold_rate_916"] = rate_916
-
-                        # Reset the user_modified_gold_rate flag when fetching new rates
-                        if "user_modified_gold_rate" in st.session_state:
-                            del st.session_state["user_modified_gold_rate"]
-
-                        # Update the gold_rate in session state for all calculator pages
-                        if "is_22k" in st.session_state and st.session_state.is_22k:
-                            st.session_state.gold_rate = float(
-                                rate_916 / 10
-                            )  # Convert to per gram
-                        else:
-                            # For 24k, use the direct rate
-                            st.session_state.gold_rate = float(
-                                st.session_state["current_gold_rate_per_gram"]
-                            )
-
-                        # Update the gold_rate session state variable for pages
-                        # Only set the per-gram rate if user hasn't manually set it
-                        if "is_22k" in st.session_state and st.session_state["is_22k"]:
-                            st.session_state.gold_rate = float(
-                                rate_916 / 10
-                            )  # Convert to per gram
-                        else:
-                            # For 24k, use the direct rate
-                            st.session_state.gold_rate = float(
-                                st.session_state["current_gold_rate_per_gram"]
-                            )
-                    except (ValueError, KeyError) as e:
-                        print(f"Error extracting gold rate for calculator: {e}")
+        else:
+            # Apply the latest rates to all pages, replacing a manually entered rate
+            apply_rates(snapshot, reset_user_rate=True)
+            # The rates on hand are shown right away; older ones are refreshed
+            # in the background and picked up on a later rerun
+            if rates_age() > POLL_INTERVAL:
+                poller.refresh()
 
 # Add extra spacing after the Live Rates button
 st.markdown("<div style='margin: 20px 0;'></div>", unsafe_allow_html=True)
@@ -390,7 +183,17 @@ st.markdown("<div style='margin: 20px 0;'></div>", unsafe_allow_html=True)
 # Display timestamp as caption right below the Live Rates button
 if st.session_state["live_rates"] and "timestamp" in st.session_state["live_rates"]:
     timestamp = st.session_state["live_rates"]["timestamp"]
-    st.caption(f"Last updated: {timestamp}")
+    served_by = " via ".join(
+        st.session_state["live_rates"][key]
+        for key in ("source", "tier")
+        if st.session_state["live_rates"].get(key)
+    )
+    st.caption(
+        f"Last updated: {timestamp}, {format_age(rates_age())}"
+        + (f" ({served_by})" if served_by else "")
+    )
+    if rates_freshness(rates_age()) != RATES_FRESH:
+        st.warning("These rates are out of date, fresh rates are being fetched.")
 
 # Add a success message to let users know rates are synchronized
 # This will show whether rates are from fetching or manual entry
@@ -403,9 +206,9 @@ with rates_container:
         # Error is already displayed above when the button is clicked
         pass
     elif st.session_state["live_rates"]:
-        rates = st.session_state["live_rates"].copy()
-        rates.pop("timestamp", None)  # Remove timestamp as we've already displayed it
-        num_rates = len(rates)
+        # Rates parsed into typed records at fetch time
+        rate_book = st.session_state["live_rate_book"]
+        num_rates = len(rate_book)
         if num_rates > 0:
             # Display 916 (22k) gold rate if available
             if "gold_rate_916" in st.session_state:
@@ -425,16 +228,8 @@ with rates_container:
                 )
 
             # Separate gold and silver rates
-            gold_rates = [
-                (name, rate)
-                for name, rate in rates.items()
-                if "Gold" in name or "GOLD" in name
-            ]
-            silver_rates = [
-                (name, rate)
-                for name, rate in rates.items()
-                if "Silver" in name or "SILVER" in name
-            ]
+            gold_rates = rate_book.by_metal("gold")
+            silver_rates = rate_book.by_metal("silver")
 
             # Display gold rates in the first row (first 2)
             if gold_rates:
@@ -442,19 +237,16 @@ with rates_container:
                     min(len(gold_rates), 2)
                 )  # Show at most 2 gold rates
 
-                for j, (name, rate) in enumerate(
+                for j, record in enumerate(
                     gold_rates[:2]
                 ):  # Limit to first 2 gold rates
                     with gold_cols[j]:
-                        # Clean rate value for display
-                        display_rate = int(rate.split(" ")[-1] if " " in rate else rate)
-
                         # Format with appropriate gold border styling
                         st.markdown(
                             f"""
                             <div class="gold-rate">
-                                <p class="rate-label">{name}</p>
-                                <p class="rate-value">₹{display_rate:,}</p>
+                                <p class="rate-label">{record.symbol}</p>
+                                <p class="rate-value">₹{format_rate(record.value)}</p>
                             </div>
                             """,
                             unsafe_allow_html=True,
@@ -469,19 +261,16 @@ with rates_container:
                     min(len(silver_rates), 3)
                 )  # Show at most 3 silver rates
 
-                for j, (name, rate) in enumerate(
+                for j, record in enumerate(
                     silver_rates[:3]
                 ):  # Limit to first 3 silver rates
                     with silver_cols[j]:
-                        # Clean rate value for display
-                        display_rate = int(rate.split(" ")[-1] if " " in rate else rate)
-
                         # Format with silver border styling
                         st.markdown(
                             f"""
                             <div class="silver-rate">
-                                <p class="rate-label">{name}</p>
-                                <p class="rate-value">₹{display_rate:,}</p>
+                                <p class="rate-label">{record.symbol}</p>
+                                <p class="rate-value">₹{format_rate(record.value)}</p>
                             </div>
                             """,
                             unsafe_allow_html=True,
@@ -493,6 +282,105 @@ with rates_container:
             "Click the 'Live Rates' button to fetch the latest gold and silver rates."
         )
 
+# Latency and error counters of each rate source
+with st.expander("Rate sources"):
+    st.dataframe(
+        [
+            {"source": name, **stats}
+            for name, stats in get_rate_aggregator().stats().items()
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+    breaker = get_scraper_breaker().stats()
+    st.caption(
+        f"Selenium scraper circuit: {breaker['state']}"
+        + (f", retrying in {breaker['retry_in']:.0f} s" if breaker["retry_in"] else "")
+        + (f" · failures: {breaker['failures']}" if breaker["failures"] else "")
+    )
+    pool = started_driver_pool()
+    if pool is None:
+        st.caption("Browser pool: not started, plain HTTP has served every fetch")
+    else:
+        browsers = pool.stats()
+        st.caption(
+            f"Browser pool: {browsers['size']} browser(s), {browsers['idle']} idle"
+            f" · launched {browsers['launched']}, reused {browsers['reused']},"
+            f" recycled {browsers['recycled']}, discarded {browsers['discarded']}"
+            + (
+                f" · checkout timeouts: {browsers['timeouts']}"
+                if browsers["timeouts"]
+                else ""
+            )
+        )
+        # Loaded already, with the pool
+        from app_files.scraper import readiness_stats
+
+        ready = readiness_stats()
+        if "p50_ms" in ready:
+            st.caption(
+                f"Time for the rates to show in the browser: p50 {ready['p50_ms']:,.0f} ms"
+                f" · p95 {ready['p95_ms']:,.0f} ms · max {ready['max_ms']:,.0f} ms"
+                f" over {ready['fetches']} fetch(es)"
+                + (
+                    f" · not ready in time: {ready['timeouts']}"
+                    if ready["timeouts"]
+                    else ""
+                )
+            )
+        elif ready["fetches"]:
+            st.caption(
+                f"The rates didn't show in the browser in time on {ready['fetches']}"
+                " fetch(es)"
+            )
+    fetches = get_rate_fetch().stats()
+    st.caption(
+        f"Fetches executed: {fetches['executed']} · coalesced: {fetches['coalesced']}"
+        f" · served by another process: {fetches['coalesced_remote']}"
+        + (f" · timed out: {fetches['timeouts']}" if fetches["timeouts"] else "")
+    )
+    memo = get_calculation_memo().stats()
+    st.caption(
+        f"Calculation cache: {memo['entries']} results ({memo['bytes'] / 1024:,.0f} KB)"
+        f" · hits {memo['hits']}, misses {memo['misses']}"
+        + (
+            f" ({memo['hit_rate']:.0%} hit rate)"
+            if memo["hit_rate"] is not None
+            else ""
+        )
+        + f" · evicted {memo['evictions']}"
+    )
+
+# Today's movement of the rates, from the rate history
+with st.expander("Intraday movement"):
+    # The rates of the current snapshot, so a rerun doesn't query the history; it is
+    # only queried while the chart is switched on (Streamlit doesn't report whether an
+    # expander is open)
+    rate_book = st.session_state.get("live_rate_book") or ()
+    symbol = st.selectbox(
+        "Rate", sorted(record.symbol for record in rate_book), key="intraday_symbol"
+    )
+    if symbol and st.toggle("Show today's chart", key="intraday_chart"):
+        history = get_rate_history()
+        ist = pytz.timezone("Asia/Kolkata")
+        day_start = datetime.now(ist).replace(hour=0, minute=0, second=0, microsecond=0)
+        series = history.downsample(
+            symbol,
+            day_start.timestamp(),
+            day_start.timestamp() + 86400,
+            INTRADAY_BUCKET,
+        )
+        if series:
+            st.line_chart(
+                {
+                    "time": [datetime.fromtimestamp(row[0], ist) for row in series],
+                    "rate": [row[4] for row in series],  # closing rate of each bucket
+                },
+                x="time",
+                y="rate",
+            )
+        else:
+            st.caption("No rates recorded today yet.")
 
 # --- Rest of the existing Home page content ---
 if "mesage_shown" not in st.session_state:
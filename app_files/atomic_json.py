@@ -0,0 +1,21 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_json_atomic(path, data):
+    """
+    Write `data` as JSON to `path` atomically (through a temporary file in the same
+    directory), so a crash mid-write never leaves a truncated file behind.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
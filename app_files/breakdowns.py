@@ -0,0 +1,194 @@
+"""
+The calculators' results together with the markdown the pages render for them,
+memoized across reruns and sessions.
+
+Most reruns of a calculator page come from widgets that don't change its inputs (or
+from another session with the same inputs); those get the results and the formatted
+texts from the cache instead of recomputing and reformatting them.
+"""
+
+from types import MappingProxyType
+from typing import NamedTuple
+
+import streamlit as st
+
+from app_files.calculate import cost_price_gold, gold_making_charges, gold_sell
+from app_files.memo import LRUMemo, memoized
+
+
+class Breakdown(NamedTuple):
+    """
+    - **"results"**: the tuple returned by the calculator
+    - **"texts"**: read-only {name: markdown} of the values as the page displays them
+    """
+
+    results: tuple
+    texts: MappingProxyType
+
+
+# --- One cache shared by all sessions of the process ---
+@st.cache_resource
+def get_calculation_memo():
+    return LRUMemo(max_entries=2048, max_bytes=8 * 1024 * 1024)
+
+
+@memoized(get_calculation_memo)
+def gold_sell_breakdown(
+    gold_rate,
+    qty,
+    weight,
+    making_charge_perc,
+    hm_charges_per_pc,
+    extra_charges,
+    calculate_with_tax,
+    carat,
+    is_24k_rate,
+):
+    results = gold_sell(
+        gold_rate,
+        qty,
+        weight,
+        making_charge_perc,
+        hm_charges_per_pc,
+        extra_charges,
+        calculate_with_tax,
+        carat,
+        is_24k_rate,
+    )
+    (
+        hm_rate,
+        gold_charges,
+        making_charges,
+        hm_charges,
+        tax,
+        total_before_tax,
+        total_price,
+        pure_gold_weight,
+        total_recouped_pure_weight,
+        making_charge_wt_pure,
+    ) = results
+
+    texts = {
+        "gold_charges": f":orange[₹**{gold_charges:,.2f}**]",
+        "hm_rate": f"(₹**{hm_rate:,.2f}/gm.**)",
+        "making_charges": f":green[₹ **{making_charges:,.2f}**]",
+        "making_charges_per_gm": f"**(₹{making_charges/weight:,.2f}/gm.)**",
+        "making_and_extra": (
+            f"Making Charges: ₹{(making_charges-extra_charges):,.2f} "
+            f"+ Extra charges: ₹{extra_charges:,.2f}"
+        ),
+        "hm_charges": f":green[₹**{hm_charges:,.2f}**]",
+        "hm_charges_per_pc": f"**(₹{hm_charges_per_pc}/pc.)**",
+        "total_before_tax": f"Total before tax: ₹{total_before_tax:,.2f}",
+        "tax": f":green[₹ **{tax:,.2f}**]",
+        "gst_split": f"SGST: ₹{tax/2:,.2f} + CGST: ₹{tax/2:,.2f}",
+        "total_price": f"## :green[₹ **{total_price:,.2f}**]",
+        # Detailed info
+        "gold_charges_info": (
+            f"Here we have used **{carat} Carat** gold, whose price is **₹{hm_rate:,.2f}** per gram."
+        ),
+        "making_charges_info": (
+            f"Here we have used **{making_charge_perc:.3f}%** making charges, which is **₹{making_charges:,.2f}** and extra charges of **₹{extra_charges:,.2f}**."
+        ),
+        "hm_charges_info": f"The standard hallmark charges are **₹{hm_charges_per_pc}/pc.**",
+        "tax_info": (
+            f"Here we have used **1.5%** SGST {tax/2:,.2f} + **1.5%** CGST {tax/2:,.2f} = **₹{tax:,.2f}**."
+        ),
+        "pure_weight_info": (
+            f"**Pure Wt.** ({pure_gold_weight:.4f} gm.) + **Excess Pure M.C. Wt.** ({making_charge_wt_pure:.4f} gm.) = **Total Recouped Pure Wt.** ({total_recouped_pure_weight:.4f} gm.)"
+        ),
+    }
+    return Breakdown(results, MappingProxyType(texts))
+
+
+@memoized(get_calculation_memo)
+def making_charges_breakdown(
+    gold_rate,
+    gold_weight,
+    total_price,
+    hm_charges,
+    no_pcs,
+    gst,
+    extra_charges,
+    carat,
+    is_24k_rate,
+):
+    results = gold_making_charges(
+        gold_rate,
+        gold_weight,
+        total_price,
+        hm_charges,
+        no_pcs,
+        gst,
+        extra_charges,
+        carat,
+        is_24k_rate,
+    )
+    making_charge_perc, making_charges = results
+
+    texts = {
+        "making_charge_perc": f"## :green[**{making_charge_perc:.3f}%**]",
+        "making_charges": f"## :green[₹ **{making_charges:,.2f}**]",
+    }
+    return Breakdown(results, MappingProxyType(texts))
+
+
+@memoized(get_calculation_memo)
+def cost_price_breakdown(
+    gold_rate,
+    goldsmith_loss_perc,
+    baseline,
+    carat,
+    extra_charges,
+    total_weight,
+    is_24k_rate,
+):
+    results = cost_price_gold(
+        gold_rate,
+        goldsmith_loss_perc,
+        baseline,
+        carat,
+        extra_charges,
+        total_weight,
+        is_24k_rate,
+    )
+    (
+        total_pure_wt,
+        total_payable_wt,
+        goldsmith_loss_wt,
+        goldsmith_loss_wt_24k_price,
+        breakeven_making_perc,
+        cp_total,
+    ) = results
+
+    texts = {
+        "total_pure_wt": f":green[**{total_pure_wt:,.4f} gm.**]",
+        "goldsmith_loss_wt": f":green[**{goldsmith_loss_wt:,.4f} gm.**]",
+        "total_payable_wt": f"## :orange[**{total_payable_wt:,.4f} gm.**]",
+        "goldsmith_loss_wt_24k_price": f":green[**₹ {goldsmith_loss_wt_24k_price:,.2f}**]",
+        "breakeven_making_perc": f"### :orange[**{breakeven_making_perc:,.2f}%**]",
+        "cp_total": f"## :orange[₹ **{cp_total:,.2f}**]",
+    }
+    return Breakdown(results, MappingProxyType(texts))
+
+
+@memoized(get_calculation_memo)
+def gold_sell_what_if(row_name, row_values, column_name, column_values, **inputs):
+    """
+    The total price over a grid of two `gold_sell` inputs (see `gold_sell_grid`), as a
+    DataFrame with the row values as index and the column values as columns.
+    Computed in one vectorized call and memoized per set of inputs.
+    """
+    # Only loaded when a grid is asked for
+    import pandas as pd
+
+    from app_files.calculate_batch import gold_sell_grid
+
+    totals = gold_sell_grid(
+        row_name, row_values, column_name, column_values, **inputs
+    ).total_price
+    return pd.DataFrame(
+        totals,
+        index=pd.Index(row_values, name=row_name),
+        columns=pd.Index(column_values, name=column_name),
+    )
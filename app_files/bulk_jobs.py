@@ -0,0 +1,476 @@
+"""
+Run the calculators over whole files: CSV, Excel (.xlsx) or Parquet, in and out.
+
+The input is read and the output written chunk by chunk, so a file may be far larger
+than memory. Each chunk is validated (the job's required columns must be there) and its
+columns coerced to numbers and yes/no flags, blank optional cells taking the
+calculator's defaults; the calculation runs on the chunk in one vectorized call.
+Every input row is written out with the results and an `invalid_columns` column naming
+the cells with text that isn't a number, or blank required cells (empty if none).
+Results named like an input column get a "_calculated" suffix.
+
+Excel files are read and written with openpyxl in its streaming modes, Parquet files
+with pyarrow; both are only imported for those formats. An Excel sheet holds at most
+1,048,576 rows.
+
+Usage (from the repository root):
+    python -m app_files.bulk_jobs gold_sell bills.parquet priced.csv
+    python -m app_files.bulk_jobs making_charges quotes.xlsx solved.parquet --chunk-rows 50000
+"""
+
+import argparse
+import inspect
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from app_files.calculate_batch import (
+    MAX_PLAUSIBLE_MAKING_PERC,
+    cost_price_gold_batch,
+    gold_making_charges_batch,
+    gold_sell_batch,
+    making_charge_flags,
+)
+
+FORMAT_CSV = "csv"
+FORMAT_EXCEL = "excel"
+FORMAT_PARQUET = "parquet"
+FORMATS_BY_SUFFIX = {
+    ".csv": FORMAT_CSV,
+    ".xlsx": FORMAT_EXCEL,
+    ".xlsm": FORMAT_EXCEL,
+    ".parquet": FORMAT_PARQUET,
+    ".pq": FORMAT_PARQUET,
+}
+
+INVALID_COLUMNS = "invalid_columns"
+_TRUE_TEXTS = {"true", "1", "yes", "y"}
+
+
+def defaults_of(function):
+    """
+    {argument: default} of a calculator, the values of blank optional cells.
+    """
+    return {
+        name: parameter.default
+        for name, parameter in inspect.signature(function).parameters.items()
+        if parameter.default is not parameter.empty
+    }
+
+
+def is_blank(column):
+    """
+    True where a cell is missing or only whitespace.
+    """
+    return column.isna() | column.astype(str).str.strip().eq("")
+
+
+def coerce_numbers(column, default=None):
+    """
+    (numbers, invalid) of a column: a float array and a bool array marking the cells
+    with text that isn't a number. Blank cells take `default`; without one, they are
+    NaN and invalid too.
+    """
+    blank = is_blank(column)
+    numbers = pd.to_numeric(column.where(~blank), errors="coerce")
+    invalid = numbers.isna() & ~blank
+    if default is None:
+        invalid |= blank
+    else:
+        numbers = numbers.where(~blank, default)
+    return numbers.to_numpy(float, na_value=np.nan), invalid.to_numpy()
+
+
+def coerce_flags(column, default=False):
+    """
+    A yes/no column (True/False, 1/0, yes/no) as booleans; blank cells are `default`
+    and anything else is False.
+    """
+    if column.dtype == bool:
+        return column
+    flags = column.astype(str).str.strip().str.lower().isin(_TRUE_TEXTS)
+    return flags.where(~is_blank(column), default).astype(bool)
+
+
+def invalid_column_names(invalid):
+    """
+    The names of a row's invalid cells, space separated, from {column: bool array}.
+    """
+    invalid = pd.DataFrame(invalid)
+    return invalid.dot(invalid.columns + " ").str.strip()
+
+
+class BulkJob(NamedTuple):
+    """
+    A calculation that can be run over a file.
+
+    - **"name"**: the name the job is run by
+    - **"title"**: shown on the page
+    - **"calculate"**: called with the columns as keyword arguments, returns
+      {result name: array}
+    - **"required"**: columns every input needs
+    - **"numeric"**: every numeric input column, required or optional
+    - **"flags"**: the yes/no input columns
+    - **"example"**: {column: value} of a sample row, for templates
+    - **"defaults"**: {column: value} taken by blank optional cells
+    """
+
+    name: str
+    title: str
+    calculate: object
+    required: tuple
+    numeric: tuple
+    flags: tuple
+    example: dict
+    defaults: dict
+
+
+def _gold_sell(**columns):
+    return gold_sell_batch(**columns)._asdict()
+
+
+def _making_charges(max_perc=MAX_PLAUSIBLE_MAKING_PERC, **columns):
+    results = gold_making_charges_batch(**columns)
+    return {
+        **results._asdict(),
+        "flag": making_charge_flags(results.making_charge_perc, max_perc),
+    }
+
+
+def _cost_price(**columns):
+    return cost_price_gold_batch(**columns)._asdict()
+
+
+JOBS = {
+    job.name: job
+    for job in (
+        BulkJob(
+            "gold_sell",
+            "Gold Buy: price items",
+            _gold_sell,
+            ("gold_rate", "weight", "making_charge_perc"),
+            (
+                "gold_rate",
+                "weight",
+                "making_charge_perc",
+                "qty",
+                "hm_charges_per_pc",
+                "extra_charges",
+                "carat",
+            ),
+            ("calculate_with_tax", "is_24k_rate"),
+            {
+                "gold_rate": 9150.0,
+                "weight": 10.5,
+                "making_charge_perc": 12.0,
+                "qty": 1,
+                "hm_charges_per_pc": 53,
+                "extra_charges": 0.0,
+                "carat": 22,
+                "calculate_with_tax": True,
+                "is_24k_rate": False,
+            },
+            defaults_of(gold_sell_batch),
+        ),
+        BulkJob(
+            "making_charges",
+            "Making Charge: solve quoted totals",
+            _making_charges,
+            ("gold_rate", "gold_weight", "total_price"),
+            (
+                "gold_rate",
+                "gold_weight",
+                "total_price",
+                "hm_charges",
+                "no_pcs",
+                "gst",
+                "extra_charges",
+                "carat",
+            ),
+            ("is_24k_rate",),
+            {
+                "gold_rate": 9150.0,
+                "gold_weight": 10.5,
+                "total_price": 110000.0,
+                "hm_charges": 53,
+                "no_pcs": 1,
+                "gst": 3,
+                "extra_charges": 0.0,
+                "carat": 22,
+                "is_24k_rate": False,
+            },
+            defaults_of(gold_making_charges_batch),
+        ),
+        BulkJob(
+            "cost_price",
+            "Cost Price: cost pieces",
+            _cost_price,
+            ("gold_rate", "total_weight"),
+            (
+                "gold_rate",
+                "goldsmith_loss_perc",
+                "baseline",
+                "carat",
+                "extra_charges",
+                "total_weight",
+            ),
+            ("is_24k_rate",),
+            {
+                "gold_rate": 9150.0,
+                "goldsmith_loss_perc": 4.0,
+                "baseline": 0.92,
+                "carat": 22,
+                "extra_charges": 0.0,
+                "total_weight": 10.5,
+                "is_24k_rate": False,
+            },
+            defaults_of(cost_price_gold_batch),
+        ),
+    )
+}
+
+
+class JobReport(NamedTuple):
+    """
+    - **"rows"**: rows read and written
+    - **"invalid_rows"**: rows with values that couldn't be read
+    - **"seconds"**: time the whole job took
+    """
+
+    rows: int
+    invalid_rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self):
+        return self.rows / max(self.seconds, 1e-9)
+
+
+def file_format(name):
+    """
+    FORMAT_CSV, FORMAT_EXCEL or FORMAT_PARQUET, from the suffix of a file name.
+    """
+    suffix = Path(str(name)).suffix.lower()
+    if suffix not in FORMATS_BY_SUFFIX:
+        raise ValueError(
+            f"Unsupported file type {suffix or name!r}; "
+            f"use one of {', '.join(FORMATS_BY_SUFFIX)}"
+        )
+    return FORMATS_BY_SUFFIX[suffix]
+
+
+def template(job):
+    """
+    A one-row DataFrame with every input column of `job`.
+    """
+    return pd.DataFrame([job.example])
+
+
+# --- Readers: a file (path or file object) as DataFrames of up to `chunk_rows` rows ---
+# CSV and Excel columns are read as text, so every chunk has the same column types
+# whatever its values; the job's columns are coerced to numbers and flags afterwards.
+def _read_csv(source, chunk_rows):
+    yield from pd.read_csv(source, chunksize=chunk_rows, dtype="string")
+
+
+def _read_excel(source, chunk_rows):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(name) for name in next(rows, ())]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                yield pd.DataFrame(chunk, columns=header).astype("string")
+                chunk = []
+        if chunk or not header:
+            yield pd.DataFrame(chunk, columns=header).astype("string")
+    finally:
+        workbook.close()
+
+
+def _read_parquet(source, chunk_rows):
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+READERS = {
+    FORMAT_CSV: _read_csv,
+    FORMAT_EXCEL: _read_excel,
+    FORMAT_PARQUET: _read_parquet,
+}
+
+
+# --- Writers: append DataFrames to a file, then `close()` it ---
+class _CsvWriter:
+    def __init__(self, destination):
+        self._file = open(destination, "w", newline="", encoding="utf-8")
+        self._header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+class _ExcelWriter:
+    def __init__(self, destination):
+        from openpyxl import Workbook
+
+        self._destination = destination
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+        self._header = True
+
+    def write(self, chunk):
+        if self._header:
+            self._sheet.append(list(chunk.columns))
+            self._header = False
+        # Empty cells for missing values, plain Python values for the rest
+        for row in (
+            chunk.astype(object).where(chunk.notna(), None).itertuples(index=False)
+        ):
+            self._sheet.append(list(row))
+
+    def close(self):
+        self._workbook.save(self._destination)
+
+
+class _ParquetWriter:
+    def __init__(self, destination):
+        self._destination = destination
+        self._writer = None
+
+    def write(self, chunk):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._writer = pq.ParquetWriter(self._destination, table.schema)
+        else:
+            table = pa.Table.from_pandas(
+                chunk, schema=self._writer.schema, preserve_index=False
+            )
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+WRITERS = {
+    FORMAT_CSV: _CsvWriter,
+    FORMAT_EXCEL: _ExcelWriter,
+    FORMAT_PARQUET: _ParquetWriter,
+}
+
+
+def run_chunk(job, chunk):
+    """
+    The rows of `chunk` (a DataFrame) with the results of `job` and the
+    `invalid_columns` of each row. The job's input columns are written as they were
+    coerced: numbers (NaN where invalid) and True/False, with the calculator's
+    defaults in blank optional cells.
+    """
+    missing = [name for name in job.required if name not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    columns = {}
+    invalid = {}
+    for name in job.numeric:
+        if name in chunk.columns:
+            columns[name], invalid[name] = coerce_numbers(
+                chunk[name], None if name in job.required else job.defaults[name]
+            )
+    for name in job.flags:
+        if name in chunk.columns:
+            columns[name] = coerce_flags(chunk[name], job.defaults[name]).to_numpy()
+
+    results = {
+        (f"{name}_calculated" if name in chunk.columns else name): values
+        for name, values in job.calculate(**columns).items()
+    }
+    return chunk.assign(
+        **columns,
+        **results,
+        **{INVALID_COLUMNS: invalid_column_names(invalid).to_numpy()},
+    )
+
+
+def run_job(
+    job,
+    source,
+    destination,
+    chunk_rows=100_000,
+    source_format=None,
+    destination_format=None,
+    progress=None,
+    on_chunk=None,
+):
+    """
+    Run `job` (a `BulkJob` or its name) over the file `source` (a path or file object),
+    writing the results to the path `destination` chunk by chunk. The formats are taken
+    from the file names unless given. `on_chunk(result)` is called with every chunk of
+    results and returns the rows to write; `progress(rows, seconds)` is called after
+    every chunk. Returns a `JobReport`.
+    """
+    job = JOBS[job] if isinstance(job, str) else job
+    source_format = source_format or file_format(getattr(source, "name", source))
+    destination_format = destination_format or file_format(destination)
+
+    started = time.perf_counter()
+    rows = 0
+    invalid_rows = 0
+    writer = WRITERS[destination_format](destination)
+    try:
+        for chunk in READERS[source_format](source, chunk_rows):
+            result = run_chunk(job, chunk)
+            rows += len(result)
+            invalid_rows += int((result[INVALID_COLUMNS] != "").sum())
+            writer.write(result if on_chunk is None else on_chunk(result))
+            if progress is not None:
+                progress(rows, time.perf_counter() - started)
+    finally:
+        writer.close()
+    return JobReport(rows, invalid_rows, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("job", choices=sorted(JOBS))
+    parser.add_argument("source", help="CSV, Excel or Parquet file to read")
+    parser.add_argument("destination", help="CSV, Excel or Parquet file to write")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    report = run_job(
+        args.job,
+        args.source,
+        args.destination,
+        args.chunk_rows,
+        progress=lambda rows, seconds: print(
+            f"{rows:,} rows ({rows / max(seconds, 1e-9):,.0f} rows/s)", end="\r"
+        ),
+    )
+    print(
+        f"{report.rows:,} rows in {report.seconds:.1f} s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    if report.invalid_rows:
+        print(f"{report.invalid_rows:,} row(s) have values that couldn't be read.")
+
+
+if __name__ == "__main__":
+    main()
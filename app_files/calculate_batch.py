@@ -0,0 +1,303 @@
+"""
+Vectorized versions of the calculators in `app_files.calculate`, for whole tables at once.
+
+Every argument may be a scalar or an array (or a column of a table); they are broadcast
+against each other like NumPy does. The formulas and the order of the floating point
+operations are those of the scalar functions, so each row matches them exactly.
+
+Kept apart from `app_files.calculate` so the pages don't import NumPy until they need it.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class GoldSellColumns(NamedTuple):
+    """
+    The results of `gold_sell_batch`, one array per value returned by `gold_sell`
+    and in the same order, so both unpack the same way.
+    """
+
+    hm_rate: np.ndarray
+    gold_charges: np.ndarray
+    making_charges: np.ndarray
+    hm_charges: np.ndarray
+    tax: np.ndarray
+    total_before_tax: np.ndarray
+    total_price: np.ndarray
+    pure_gold_weight: np.ndarray
+    total_recouped_pure_weight: np.ndarray
+    making_charge_wt_pure: np.ndarray
+
+
+def _column(values, dtype=np.float64):
+    return np.asarray(values, dtype=dtype)
+
+
+def gold_sell_batch(
+    gold_rate=9400,
+    qty=1,
+    weight=1,
+    making_charge_perc=14,
+    hm_charges_per_pc=53,
+    extra_charges=0,
+    calculate_with_tax=True,
+    carat=22,
+    is_24k_rate=False,
+):
+    """
+    `gold_sell` over arrays. Takes the same arguments, each a scalar or an array, and
+    returns a `GoldSellColumns` of arrays.
+
+    A table whose columns are named like the arguments (a dict of arrays or a
+    pandas DataFrame) can be priced with `gold_sell_batch(**table)`. Any other column
+    raises a TypeError, so a misspelled one isn't silently left at its default.
+    """
+    gold_rate = _column(gold_rate)
+    qty = _column(qty)
+    weight = _column(weight)
+    making_charge_perc = _column(making_charge_perc)
+    hm_charges_per_pc = _column(hm_charges_per_pc)
+    extra_charges = _column(extra_charges)
+    carat = _column(carat)
+    calculate_with_tax = _column(calculate_with_tax, bool)
+    is_24k_rate = _column(is_24k_rate, bool)
+    shape = np.broadcast_shapes(
+        gold_rate.shape,
+        qty.shape,
+        weight.shape,
+        making_charge_perc.shape,
+        hm_charges_per_pc.shape,
+        extra_charges.shape,
+        carat.shape,
+        calculate_with_tax.shape,
+        is_24k_rate.shape,
+    )
+
+    tax_rate = np.where(calculate_with_tax, 0.03, 0.0)
+    # Gold rate as per carat, converted from the 24k rate where needed
+    hm_rate = np.where(is_24k_rate, gold_rate * (carat / 24), gold_rate)
+
+    gold_charges = hm_rate * weight
+    making_charges = gold_charges * (making_charge_perc / 100) + extra_charges
+    hm_charges = hm_charges_per_pc * qty
+
+    total_before_tax = gold_charges + making_charges + hm_charges
+    tax = total_before_tax * tax_rate
+    total_price = total_before_tax + tax
+
+    pure_gold_weight = weight * (carat / 24)
+    total_recouped_pure_weight = pure_gold_weight * (1 + (making_charge_perc / 100))
+    making_charge_wt_pure = total_recouped_pure_weight - pure_gold_weight
+
+    # Every column as long as the table, also those that only depend on scalar inputs
+    return GoldSellColumns._make(
+        np.broadcast_to(column, shape)
+        for column in (
+            hm_rate,
+            gold_charges,
+            making_charges,
+            hm_charges,
+            tax,
+            total_before_tax,
+            total_price,
+            pure_gold_weight,
+            total_recouped_pure_weight,
+            making_charge_wt_pure,
+        )
+    )
+
+
+class MakingChargeColumns(NamedTuple):
+    """
+    The results of `gold_making_charges_batch`, like those of `gold_making_charges`.
+    """
+
+    making_charge_perc: np.ndarray
+    making_charges: np.ndarray
+
+
+# Making charge % above which a solved quote is flagged as implausible
+MAX_PLAUSIBLE_MAKING_PERC = 35.0
+
+# Flags of `making_charge_flags`
+FLAG_OK = ""
+FLAG_NEGATIVE = "negative"  # the total is below the metal value plus charges
+FLAG_IMPLAUSIBLE = "implausible"  # above the plausible making charge %
+FLAG_INVALID = "invalid"  # no percentage could be solved (zero or missing rate/weight)
+
+
+def gold_making_charges_batch(
+    gold_rate=9100,
+    gold_weight=1,
+    total_price=12000,
+    hm_charges=53,
+    no_pcs=1,
+    gst=3,
+    extra_charges=0,
+    carat=22,
+    is_24k_rate=False,
+):
+    """
+    `gold_making_charges` over arrays: back-solves the making charge % of every quoted
+    total. Rows without a rate or weight solve to NaN/inf instead of raising.
+    """
+    gold_rate = _column(gold_rate)
+    gold_weight = _column(gold_weight)
+    total_price = _column(total_price)
+    hm_charges = _column(hm_charges)
+    no_pcs = _column(no_pcs)
+    gst = _column(gst)
+    extra_charges = _column(extra_charges)
+    carat = _column(carat)
+    is_24k_rate = _column(is_24k_rate, bool)
+    shape = np.broadcast_shapes(
+        gold_rate.shape,
+        gold_weight.shape,
+        total_price.shape,
+        hm_charges.shape,
+        no_pcs.shape,
+        gst.shape,
+        extra_charges.shape,
+        carat.shape,
+        is_24k_rate.shape,
+    )
+
+    # Convert 24k rates to the respective carat rate
+    gold_rate = np.where(is_24k_rate, gold_rate * (carat / 24), gold_rate)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expr_1 = 1 + gst / 100
+        expr_2 = gold_rate * gold_weight
+        expr_3 = total_price - expr_1 * (extra_charges + hm_charges * no_pcs)
+
+        making_charge_perc = ((expr_3 / expr_2) - expr_1) * (100 / expr_1)
+        making_charges = (making_charge_perc / 100) * expr_2
+
+    return MakingChargeColumns(
+        np.broadcast_to(making_charge_perc, shape),
+        np.broadcast_to(making_charges, shape),
+    )
+
+
+def making_charge_flags(making_charge_perc, max_perc=MAX_PLAUSIBLE_MAKING_PERC):
+    """
+    One of the FLAG_* values per solved making charge %.
+    """
+    making_charge_perc = _column(making_charge_perc)
+    return np.select(
+        [
+            ~np.isfinite(making_charge_perc),
+            making_charge_perc < 0,
+            making_charge_perc > max_perc,
+        ],
+        [FLAG_INVALID, FLAG_NEGATIVE, FLAG_IMPLAUSIBLE],
+        FLAG_OK,
+    )
+
+
+class CostPriceColumns(NamedTuple):
+    """
+    The results of `cost_price_gold_batch`, like those of `cost_price_gold`.
+    """
+
+    total_pure_wt: np.ndarray
+    total_payable_wt: np.ndarray
+    goldsmith_loss_wt: np.ndarray
+    goldsmith_loss_wt_24k_price: np.ndarray
+    breakeven_making_perc: np.ndarray
+    cp_total: np.ndarray
+
+
+def cost_price_gold_batch(
+    gold_rate=9100,
+    goldsmith_loss_perc=4,
+    baseline=0.92,
+    carat=22,
+    extra_charges=0,
+    total_weight=1,
+    is_24k_rate=False,
+):
+    """
+    `cost_price_gold` over arrays, e.g. the pieces of a goldsmith's lot.
+
+    breakeven_making_perc and cp_total are rounded to 2 decimals with `np.round`, which
+    rounds the binary value: on an exact tie it can differ from `round()` by 0.01.
+    """
+    gold_rate = _column(gold_rate)
+    goldsmith_loss_perc = _column(goldsmith_loss_perc)
+    baseline = _column(baseline)
+    carat = _column(carat)
+    extra_charges = _column(extra_charges)
+    total_weight = _column(total_weight)
+    is_24k_rate = _column(is_24k_rate, bool)
+    shape = np.broadcast_shapes(
+        gold_rate.shape,
+        goldsmith_loss_perc.shape,
+        baseline.shape,
+        carat.shape,
+        extra_charges.shape,
+        total_weight.shape,
+        is_24k_rate.shape,
+    )
+
+    gold_rate_24k = np.where(is_24k_rate, gold_rate, gold_rate / (carat / 24.0))
+
+    total_pure_wt = total_weight * (carat / 24.0)
+    # Payable to the goldsmith, in 24k purity
+    total_payable_wt = (baseline + (goldsmith_loss_perc / 100.0)) * total_weight
+    # The excess weight (in 24k) the goldsmith charges as making charges
+    goldsmith_loss_wt = total_payable_wt - total_pure_wt
+    with np.errstate(divide="ignore", invalid="ignore"):
+        breakeven_making_perc = np.round((goldsmith_loss_wt / total_pure_wt) * 100.0, 2)
+
+    goldsmith_loss_wt_24k_price = goldsmith_loss_wt * gold_rate_24k
+    cp_total = np.round(total_payable_wt * gold_rate_24k + extra_charges, 2)
+
+    return CostPriceColumns._make(
+        np.broadcast_to(column, shape)
+        for column in (
+            total_pure_wt,
+            total_payable_wt,
+            goldsmith_loss_wt,
+            goldsmith_loss_wt_24k_price,
+            breakeven_making_perc,
+            cp_total,
+        )
+    )
+
+
+def lot_totals(columns):
+    """
+    The totals of a lot costed with `cost_price_gold_batch`: weights, excess weight and
+    its price, cost, and the break-even making % of the lot as a whole.
+    """
+    total_pure_wt = float(np.sum(columns.total_pure_wt))
+    goldsmith_loss_wt = float(np.sum(columns.goldsmith_loss_wt))
+    return {
+        "pieces": int(np.size(columns.total_pure_wt)),
+        "total_pure_wt": total_pure_wt,
+        "total_payable_wt": float(np.sum(columns.total_payable_wt)),
+        "goldsmith_loss_wt": goldsmith_loss_wt,
+        "goldsmith_loss_wt_24k_price": float(
+            np.sum(columns.goldsmith_loss_wt_24k_price)
+        ),
+        "breakeven_making_perc": (
+            round(goldsmith_loss_wt / total_pure_wt * 100.0, 2)
+            if total_pure_wt
+            else None
+        ),
+        "cp_total": round(float(np.sum(columns.cp_total)), 2),
+    }
+
+
+def gold_sell_grid(row_name, row_values, column_name, column_values, **inputs):
+    """
+    `gold_sell_batch` over every combination of two inputs, e.g. gold rate × making
+    charge %: `row_values` of `row_name` down, `column_values` of `column_name` across.
+    The other arguments are taken from `inputs`. Returns a `GoldSellColumns` of 2-D arrays.
+    """
+    inputs[row_name] = _column(row_values)[:, np.newaxis]
+    inputs[column_name] = _column(column_values)[np.newaxis, :]
+    return gold_sell_batch(**inputs)
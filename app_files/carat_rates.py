@@ -0,0 +1,116 @@
+"""
+The gold rates of every carat, derived once per rate snapshot.
+
+The live 24k (995) rate is quoted per 10 g. The rate of each carat is that rate scaled by
+carat / 24, plus a premium, rounded to a step, all per 10 g; `CARAT_RULES` sets how each
+carat is rounded. The pages look their default rates up in the table instead of deriving
+them on every rerun.
+"""
+
+import math
+from typing import NamedTuple
+
+ROUND_UP = "up"
+ROUND_DOWN = "down"
+ROUND_NEAREST = "nearest"
+
+# The live rate the table is derived from: (metal, purity, unit) in the rate book
+BASE_RATE = ("gold", "995", "100gms")
+CARATS = range(1, 25)
+
+
+class RoundingRule(NamedTuple):
+    """
+    How the rate of a carat is derived from the 24k rate, in ₹ per 10 g.
+
+    - **"step"**: the rate is rounded to a multiple of this (0: not rounded)
+    - **"premium"**: added to the scaled 24k rate before rounding
+    - **"mode"**: ROUND_UP, ROUND_DOWN or ROUND_NEAREST (halves go up)
+    """
+
+    step: float = 10
+    premium: float = 0
+    mode: str = ROUND_NEAREST
+
+    def apply(self, value):
+        value += self.premium
+        if not self.step:
+            return value
+        if self.mode == ROUND_UP:
+            return math.ceil(value / self.step) * self.step
+        if self.mode == ROUND_DOWN:
+            return math.floor(value / self.step) * self.step
+        return math.floor(value / self.step + 0.5) * self.step
+
+
+# Carats without a rule of their own: to the nearest ₹1 per gram
+DEFAULT_RULE = RoundingRule()
+CARAT_RULES = {
+    # The shop's 916 rate: ₹500 over the scaled 995 rate, up to the next ₹500
+    22: RoundingRule(step=500, premium=500, mode=ROUND_UP),
+    # The live rate itself
+    24: RoundingRule(step=0),
+}
+
+
+class CaratRateTable(NamedTuple):
+    """
+    The rates of gold of every carat derived from one 24k rate. The tuples are indexed
+    by carat (index 0 is unused), so a lookup is a tuple read.
+
+    - **"rate_24k_per_10g"**: the live 24k rate the table was built from
+    - **"per_10g"**: rate of each carat per 10 g, rounded as per its rule
+    - **"per_gram"**: the same per gram
+    - **"equivalent_24k"**: the 24k rate per gram that prices each carat at `per_gram`
+    """
+
+    rate_24k_per_10g: float
+    per_10g: tuple
+    per_gram: tuple
+    equivalent_24k: tuple
+
+    def rate(self, carat, per_10g=False):
+        """
+        The rate of `carat` gold, per gram (or per 10 g).
+        """
+        return (self.per_10g if per_10g else self.per_gram)[carat]
+
+    def rate_as_24k(self, carat):
+        """
+        The rate to enter as 24k so that `carat` gold is priced at `rate(carat)`.
+        """
+        return self.equivalent_24k[carat]
+
+    def rows(self):
+        """
+        (carat, per gram, per 10 g) from 24k down, e.g. to display the table.
+        """
+        return [
+            (carat, self.per_gram[carat], self.per_10g[carat])
+            for carat in reversed(CARATS)
+        ]
+
+
+def build_carat_rates(rate_24k_per_10g, rules=None, default_rule=DEFAULT_RULE):
+    """
+    The `CaratRateTable` of a 24k rate per 10 g, with `rules` ({carat: RoundingRule},
+    CARAT_RULES by default) and `default_rule` for the other carats.
+    """
+    rules = CARAT_RULES if rules is None else rules
+    per_10g = [0.0] + [
+        float(rules.get(carat, default_rule).apply(rate_24k_per_10g / 24 * carat))
+        for carat in CARATS
+    ]
+    per_gram = [rate / 10 for rate in per_10g]
+    equivalent_24k = [0.0] + [per_gram[carat] / carat * 24 for carat in CARATS]
+    return CaratRateTable(
+        rate_24k_per_10g, tuple(per_10g), tuple(per_gram), tuple(equivalent_24k)
+    )
+
+
+def carat_rates_from_book(book, rules=None):
+    """
+    The `CaratRateTable` of a snapshot's `RateBook`, or None without a 24k gold rate.
+    """
+    record = book.find(*BASE_RATE)
+    return None if record is None else build_carat_rates(record.value, rules)
@@ -0,0 +1,122 @@
+import random
+import threading
+import time
+from collections import Counter
+
+CLOSED = "closed"  # calls go through
+OPEN = "open"  # calls are refused until the backoff has passed
+HALF_OPEN = "half_open"  # a single probe call is let through
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency (here: launching Chrome to scrape a site that is
+    down) and probes it again after an exponential backoff with jitter.
+
+    - **"failure_threshold"**: consecutive failures that open the circuit
+    - **"base_backoff"**: seconds the circuit stays open the first time
+    - **"max_backoff"**: upper bound of the backoff, which doubles on every failed probe
+    - **"jitter"**: the backoff is randomised by up to this fraction, so several workers don't
+      retry in lockstep
+    - **"ignored_classes"**: failure classes that are counted but never open the circuit
+
+    Callers check `allow()` before the call and report the outcome with
+    `record_success()` or `record_failure(failure_class)`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=3,
+        base_backoff=30,
+        max_backoff=15 * 60,
+        jitter=0.2,
+        ignored_classes=(),
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.ignored_classes = set(ignored_classes)
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._times_opened = 0  # since the last success, drives the backoff
+        self._retry_at = 0.0
+        self._probe_in_flight = False
+        self._failures = Counter()
+        self._rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def retry_in(self):
+        """
+        Seconds until the next probe is allowed, 0 if calls are allowed now.
+        """
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._retry_at - time.monotonic())
+
+    def allow(self):
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() >= self._retry_at:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._times_opened = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, failure_class="other"):
+        with self._lock:
+            self._failures[failure_class] += 1
+            if failure_class in self.ignored_classes:
+                self._probe_in_flight = False
+                return
+            if self._state == OPEN:
+                return  # a call that started before the circuit opened
+
+            self._consecutive_failures += 1
+            if (
+                self._state == HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in": (
+                    max(0.0, self._retry_at - time.monotonic())
+                    if self._state == OPEN
+                    else 0.0
+                ),
+                "rejected": self._rejected,
+                "failures": dict(self._failures),
+            }
+
+    def _open(self):
+        backoff = min(self.max_backoff, self.base_backoff * 2**self._times_opened)
+        backoff *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._times_opened += 1
+        self._state = OPEN
+        self._retry_at = time.monotonic() + backoff
+        self._probe_in_flight = False
+        print(
+            f"Circuit opened after {self._consecutive_failures} failures; retry in {backoff:.0f} s"
+        )
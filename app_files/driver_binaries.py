@@ -0,0 +1,143 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from app_files.atomic_json import write_json_atomic
+
+# Resolved browser and driver paths, reused across restarts (ignored by git)
+BINARIES_CACHE_PATH = (
+    Path(__file__).resolve().parent.parent / "data" / "chrome_binaries.json"
+)
+# Browser executables looked up on the PATH, in order, unless CHROME_BIN is set
+BROWSER_NAMES = [
+    "chromium",
+    "chromium-browser",
+    "google-chrome",
+    "google-chrome-stable",
+    "chrome",
+]
+
+_VERSION = re.compile(r"\d+(?:\.\d+)+")
+
+_binaries = None
+_binaries_lock = threading.Lock()
+
+
+class ChromeBinaries(NamedTuple):
+    """
+    Where the browser and its matching chromedriver are installed.
+
+    - **"browser_path"**: the Chrome/Chromium executable, or "" to let chromedriver find it
+    - **"browser_version"**: its version, e.g. "124.0.6367.91", or "" if unknown
+    - **"driver_path"**: the chromedriver executable
+    """
+
+    browser_path: str
+    browser_version: str
+    driver_path: str
+
+
+def detect_browser():
+    """
+    (path, version) of the installed Chrome/Chromium, ("", "") if none is found.
+    """
+    candidates = [os.environ.get("CHROME_BIN")] + BROWSER_NAMES
+    for name in candidates:
+        path = name and shutil.which(name)
+        if not path:
+            continue
+        try:
+            output = subprocess.run(
+                [path, "--version"], capture_output=True, text=True, timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        version = _VERSION.search(output)
+        return path, version.group(0) if version else ""
+    return "", ""
+
+
+def _resolve_driver(browser_path):
+    """
+    Path of a chromedriver for the browser at `browser_path`: Selenium Manager first,
+    then webdriver-manager, which both download a matching driver if needed.
+    """
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+        args = ["--browser", "chrome"]
+        if browser_path:
+            args += ["--browser-path", browser_path]
+        driver_path = SeleniumManager().binary_paths(args)["driver_path"]
+        if driver_path and os.path.isfile(driver_path):
+            return driver_path
+    except Exception as e:
+        print(f"Selenium Manager failed: {e}. Falling back to webdriver-manager...")
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    try:
+        from webdriver_manager.core.os_manager import ChromeType
+    except ImportError:  # webdriver-manager < 4
+        from webdriver_manager.core.utils import ChromeType
+
+    chrome_type = (
+        ChromeType.CHROMIUM if "chromium" in browser_path.lower() else ChromeType.GOOGLE
+    )
+    return ChromeDriverManager(chrome_type=chrome_type).install()
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return ChromeBinaries(**json.load(f))
+    except FileNotFoundError:
+        return None
+    except (ValueError, TypeError) as e:
+        print(f"Ignoring unreadable browser binaries cache {path}: {e}")
+        return None
+
+
+def _save_cache(binaries, path):
+    write_json_atomic(path, binaries._asdict())
+
+
+def resolve_binaries(path=BINARIES_CACHE_PATH, refresh=False):
+    """
+    The browser and driver paths, resolved once and cached in memory and on disk.
+
+    The disk cache is kept as long as the installed browser reports the same version
+    and the cached driver still exists; `refresh` forces a new resolution
+    (e.g. after the driver failed to start the browser).
+    """
+    global _binaries
+    with _binaries_lock:
+        if _binaries is not None and not refresh:
+            return _binaries
+
+        browser_path, browser_version = detect_browser()
+        cached = None if refresh else _load_cache(path)
+        if (
+            cached is not None
+            and cached.browser_path == browser_path
+            and cached.browser_version == browser_version
+            and os.path.isfile(cached.driver_path)
+        ):
+            _binaries = cached
+            return _binaries
+
+        print(
+            f"Resolving chromedriver for {browser_path or 'Chrome'} "
+            f"{browser_version or '(unknown version)'}"
+        )
+        binaries = ChromeBinaries(
+            browser_path, browser_version, _resolve_driver(browser_path)
+        )
+        _save_cache(binaries, path)
+        _binaries = binaries
+        return _binaries
@@ -0,0 +1,211 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DriverPoolTimeout(Exception):
+    """
+    Raised when no WebDriver could be checked out of the pool in time.
+    """
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "created_at", "uses")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    A bounded, process-wide pool of warm (already launched) WebDrivers.
+
+    - **"factory"**: a callable that launches and returns a new WebDriver
+    - **"max_size"**: the maximum number of browsers alive at any time
+    - **"max_age"**: seconds after which an idle browser is quit and relaunched
+    - **"max_uses"**: number of checkouts after which a browser is recycled
+    - **"checkout_timeout"**: default seconds to wait for a free browser
+    - **"prelaunch"**: number of browsers launched in the background on creation
+
+    Drivers are checked out with the `driver()` context manager. A driver that
+    raises while checked out is discarded instead of being returned to the pool.
+    """
+
+    def __init__(
+        self,
+        factory,
+        max_size=2,
+        max_age=15 * 60,
+        max_uses=200,
+        checkout_timeout=20,
+        prelaunch=1,
+    ):
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = []  # LIFO stack, so the warmest browser is reused first
+        self._size = 0  # idle + checked out + being launched
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "launched": 0,
+            "reused": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+            "discarded": 0,
+            "timeouts": 0,
+        }
+
+        atexit.register(self.close)
+
+        if prelaunch:
+            threading.Thread(
+                target=self._prelaunch,
+                args=(min(prelaunch, self.max_size),),
+                name="driver-pool-prelaunch",
+                daemon=True,
+            ).start()
+
+    # --- Public API ---
+    @contextmanager
+    def driver(self, timeout=None):
+        """
+        Check out a warm WebDriver for the duration of the `with` block.
+        """
+        entry = self._checkout(self.checkout_timeout if timeout is None else timeout)
+        try:
+            yield entry.driver
+        except Exception:
+            # The browser may be in an unknown state (crashed tab, dead session)
+            self._discard(entry)
+            raise
+        else:
+            self._release(entry)
+
+    def stats(self):
+        with self._cond:
+            return dict(self._stats, size=self._size, idle=len(self._idle))
+
+    def close(self):
+        """
+        Quit every idle browser and refuse further checkouts.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._quit(entry)
+
+    # --- Internals ---
+    def _prelaunch(self, count):
+        for _ in range(count):
+            with self._cond:
+                if self._closed or self._size >= self.max_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._launch()
+            except Exception as e:
+                print(f"Error pre-launching WebDriver: {e}")
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                return
+            self._release(entry)
+
+    def _launch(self):
+        entry = _PooledDriver(self._factory())
+        with self._cond:
+            self._stats["launched"] += 1
+        return entry
+
+    def _checkout(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise DriverPoolTimeout("WebDriver pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        launch = False
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1  # reserve the slot before launching
+                        entry = None
+                        launch = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise DriverPoolTimeout(
+                            f"No WebDriver available within {timeout} seconds"
+                        )
+                    self._cond.wait(remaining)
+
+            if launch:
+                try:
+                    entry = self._launch()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_usable(entry):
+                # Replace the stale browser and try again with the same deadline
+                self._discard(entry)
+                continue
+
+            entry.uses += 1
+            if entry.uses > 1:
+                with self._cond:
+                    self._stats["reused"] += 1
+            return entry
+
+    def _is_usable(self, entry):
+        if time.monotonic() - entry.created_at > self.max_age or (
+            self.max_uses and entry.uses >= self.max_uses
+        ):
+            with self._cond:
+                self._stats["recycled"] += 1
+            return False
+        try:
+            # Cheap round trip that fails if the browser or session has died
+            entry.driver.current_url
+        except Exception as e:
+            print(f"Discarding unhealthy WebDriver: {e}")
+            with self._cond:
+                self._stats["unhealthy"] += 1
+            return False
+        return True
+
+    def _release(self, entry):
+        with self._cond:
+            if not self._closed:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+            self._size -= 1
+        self._quit(entry)
+
+    def _discard(self, entry):
+        with self._cond:
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+        self._quit(entry)
+
+    @staticmethod
+    def _quit(entry):
+        try:
+            entry.driver.quit()
+        except Exception as quit_e:
+            print(f"Error quitting WebDriver: {quit_e}")
@@ -0,0 +1,99 @@
+import re
+import threading
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app_files.rates import LIVE_RATES_URL, ist_timestamp, prefixed_symbol
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+}
+
+# Only the rate <span>s and their containers are of interest; everything else is
+# skipped while parsing
+_CONTAINER_IDS = ("divProduct", "silverproduct")
+_RATE_ELEMENTS = SoupStrainer(
+    id=re.compile(r"^(GoldSymbol|GoldSell|divProduct|silverproduct)$")
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    A process-wide `requests.Session`, so connections to the rates site are kept alive
+    and reused between fetches.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=8,
+                max_retries=Retry(total=1, backoff_factor=0.2),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(_HEADERS)
+            _session = session
+        return _session
+
+
+def parse_rates_html(html):
+    """
+    Parse the `GoldSymbol`/`GoldSell` span pairs of the live rates page into a
+    {symbol: rate} dict. Symbols get the same Gold/Silver prefix as the Selenium scraper.
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=_RATE_ELEMENTS)
+    rates = {}
+
+    for container in soup.find_all("div", id=list(_CONTAINER_IDS)):
+        symbols = container.find_all("span", id="GoldSymbol")
+        sells = container.find_all("span", id="GoldSell")
+        for symbol, sell in zip(symbols, sells):
+            symbol_text = symbol.get_text(strip=True)
+            rate_text = sell.get_text(strip=True)
+            if symbol_text and rate_text:
+                rates[prefixed_symbol(symbol_text, container["id"])] = rate_text
+
+    if not rates:
+        # No known containers, fall back to pairing the rate elements (of any tag)
+        # in document order, like the browser scraper does
+        symbols = soup.find_all(id="GoldSymbol")
+        sells = soup.find_all(id="GoldSell")
+        for symbol, sell in zip(symbols, sells):
+            symbol_text = symbol.get_text(strip=True)
+            rate_text = sell.get_text(strip=True)
+            if symbol_text and rate_text:
+                rates[symbol_text] = rate_text
+
+    return rates
+
+
+def get_rates_with_http(url=LIVE_RATES_URL, timeout=5):
+    """
+    Plain HTTP approach to get rates, without a browser.
+
+    Returns a rates dict like the Selenium scraper. It holds only the timestamp
+    when the page has no server-rendered rates (e.g. they are filled in by JavaScript).
+    """
+    try:
+        response = get_session().get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        error_message = f"An error occurred during the HTTP fetch: {e}"
+        print(error_message)
+        return {"error": error_message}
+
+    rates = {"timestamp": ist_timestamp()}
+    rates.update(parse_rates_html(response.text))
+    return rates
@@ -0,0 +1,216 @@
+"""
+A bill of several items, with its totals kept up to date as lines are added and edited.
+
+Each line is priced once, exactly and before GST, with `gold_sell_exact` (paise and mg)
+when it is added or edited, and its row is formatted then. The invoice keeps running
+sums of the lines' amounts: adding, editing or removing a line adds or subtracts that
+one line's amounts, however long the bill. The sums are integers, so they never drift
+from a fresh total of the lines.
+
+GST is charged on the taxable total of the invoice, half as CGST and half as SGST,
+each rounded to the paisa as on a tax invoice.
+"""
+
+import threading
+from types import MappingProxyType
+from typing import NamedTuple
+
+from app_files.money import GST_PPM, PPM, div_round, gold_sell_exact, to_mg
+
+
+class InvoiceItem(NamedTuple):
+    """
+    An item as entered: the arguments of `gold_sell` (rupees, grams, percent) and a
+    description.
+    """
+
+    description: str
+    gold_rate: float
+    qty: int
+    weight: float
+    making_charge_perc: float
+    hm_charges_per_pc: float
+    extra_charges: float
+    carat: int
+    is_24k_rate: bool
+
+
+class InvoiceLine(NamedTuple):
+    """
+    - **"item"**: the `InvoiceItem`
+    - **"amounts"**: its `SaleAmounts` before GST, in paise and mg
+    - **"revision"**: 1 when added, increased by every edit
+    - **"texts"**: read-only {name: markdown} of the row as the page displays it
+    """
+
+    item: InvoiceItem
+    amounts: tuple
+    revision: int
+    texts: MappingProxyType
+
+
+class InvoiceTotals(NamedTuple):
+    """
+    The totals of an `Invoice`: money in paise, weights in mg.
+    """
+
+    lines: int
+    pieces: int
+    weight: int
+    gold_charges: int
+    making_charges: int
+    hm_charges: int
+    total_before_tax: int
+    cgst: int
+    sgst: int
+    tax: int
+    total_price: int
+    pure_gold_weight: int
+    total_recouped_pure_weight: int
+
+
+# The amounts of the lines the invoice sums
+_SUMMED = (
+    "gold_charges",
+    "making_charges",
+    "hm_charges",
+    "total_before_tax",
+    "pure_gold_weight",
+    "total_recouped_pure_weight",
+)
+
+
+def format_paise(paise):
+    sign = "-" if paise < 0 else ""
+    paise = abs(paise)
+    return f"{sign}₹{paise // 100:,}.{paise % 100:02d}"
+
+
+def format_mg(mg):
+    sign = "-" if mg < 0 else ""
+    mg = abs(mg)
+    return f"{sign}{mg // 1000:,}.{mg % 1000:03d} gm."
+
+
+def _line_texts(item, amounts):
+    rate_basis = "24k" if item.is_24k_rate else f"{item.carat}k"
+    return MappingProxyType(
+        {
+            "description": f"**{item.description or 'Item'}**",
+            "details": (
+                f"{item.carat}k · {item.qty} pc. · {item.weight:,.3f} gm. · "
+                f"M.C. {item.making_charge_perc:.3f}% · "
+                f"₹{item.gold_rate:,.2f}/gm. ({rate_basis})"
+            ),
+            "amount": f"**{format_paise(amounts.total_before_tax)}**",
+            "breakdown": (
+                f"Gold {format_paise(amounts.gold_charges)} + "
+                f"M.C. {format_paise(amounts.making_charges)} + "
+                f"H.M. {format_paise(amounts.hm_charges)}"
+            ),
+        }
+    )
+
+
+class Invoice:
+    """
+    The lines of a bill, by line id in the order they were added, and their totals.
+    """
+
+    def __init__(self, calculate_with_tax=True, gst_ppm=GST_PPM):
+        self.calculate_with_tax = calculate_with_tax
+        self.gst_ppm = gst_ppm
+        self.lines = {}
+        self._next_id = 1
+        self._sums = dict.fromkeys(_SUMMED, 0)
+        self._pieces = 0
+        self._weight = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.lines)
+
+    def _priced(self, item, revision):
+        amounts = gold_sell_exact(
+            item.gold_rate,
+            item.qty,
+            item.weight,
+            item.making_charge_perc,
+            item.hm_charges_per_pc,
+            item.extra_charges,
+            False,
+            item.carat,
+            item.is_24k_rate,
+        )
+        return InvoiceLine(item, amounts, revision, _line_texts(item, amounts))
+
+    def _count(self, line, sign):
+        for name in _SUMMED:
+            self._sums[name] += sign * getattr(line.amounts, name)
+        self._pieces += sign * line.item.qty
+        self._weight += sign * to_mg(line.item.weight)
+
+    def add(self, item):
+        """
+        Add an `InvoiceItem`; returns the id of its line.
+        """
+        line = self._priced(item, 1)
+        with self._lock:
+            line_id = self._next_id
+            self._next_id += 1
+            self.lines[line_id] = line
+            self._count(line, 1)
+        return line_id
+
+    def update(self, line_id, **changes):
+        """
+        Change some fields of a line's item (e.g. `qty=2`); returns the new line.
+        """
+        with self._lock:
+            old = self.lines[line_id]
+            line = self._priced(old.item._replace(**changes), old.revision + 1)
+            self._count(old, -1)
+            self._count(line, 1)
+            self.lines[line_id] = line
+        return line
+
+    def remove(self, line_id):
+        with self._lock:
+            line = self.lines.pop(line_id, None)
+            if line is not None:
+                self._count(line, -1)
+
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+            self._sums = dict.fromkeys(_SUMMED, 0)
+            self._pieces = 0
+            self._weight = 0
+
+    def totals(self):
+        """
+        The `InvoiceTotals`, from the running sums.
+        """
+        with self._lock:
+            sums = dict(self._sums)
+            lines, pieces, weight = len(self.lines), self._pieces, self._weight
+        half_gst = (
+            div_round(sums["total_before_tax"] * (self.gst_ppm // 2), PPM)
+            if self.calculate_with_tax
+            else 0
+        )
+        return InvoiceTotals(
+            lines=lines,
+            pieces=pieces,
+            weight=weight,
+            gold_charges=sums["gold_charges"],
+            making_charges=sums["making_charges"],
+            hm_charges=sums["hm_charges"],
+            total_before_tax=sums["total_before_tax"],
+            cgst=half_gst,
+            sgst=half_gst,
+            tax=2 * half_gst,
+            total_price=sums["total_before_tax"] + 2 * half_gst,
+            pure_gold_weight=sums["pure_gold_weight"],
+            total_recouped_pure_weight=sums["total_recouped_pure_weight"],
+        )
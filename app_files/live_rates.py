@@ -0,0 +1,257 @@
+import time
+
+import streamlit as st
+
+from app_files.circuit_breaker import CircuitBreaker
+from app_files.providers import (
+    POLICY_FIRST_VALID,
+    CallableRateProvider,
+    RateAggregator,
+)
+from app_files.rate_cache import load_rates, save_rates
+from app_files.rate_fetch import fetch_rates
+from app_files.rate_history import RateHistory
+from app_files.rate_poller import RatePoller
+from app_files.single_flight import FetchLease, SingleFlight
+
+# Seconds between background refreshes of the live rates
+POLL_INTERVAL = 30
+# How the live rates are picked when several providers answer (see app_files.providers)
+RATE_POLICY = POLICY_FIRST_VALID
+PREFERRED_PROVIDERS = ["vickygold.in"]
+# Seconds all providers together get to answer
+PROVIDER_DEADLINE = 20
+# Age (seconds) after which the calculators warn that the live rates are stale
+STALE_AFTER = 15 * 60
+# Age (seconds) after which the calculators refuse to bill on the live rates
+EXPIRED_AFTER = 6 * 60 * 60
+
+# Gold rates (per gram) the pages start from without live rates
+DEFAULT_CARAT_RATE = 9000.00
+DEFAULT_24K_RATE = 9818.18  # Approximate 24k equivalent
+
+RATES_FRESH = "fresh"
+RATES_STALE = "stale"
+RATES_EXPIRED = "expired"
+
+
+# --- Process-wide pool of warm browsers ---
+# The pool, once a fetch has needed a browser
+_driver_pool = None
+
+
+@st.cache_resource
+def get_driver_pool():
+    """
+    One pool of pre-launched headless Chrome instances shared by all sessions,
+    so a fetch only refreshes an already loaded page.
+    """
+    global _driver_pool
+    from app_files.scraper import create_driver_pool
+
+    _driver_pool = create_driver_pool()
+    return _driver_pool
+
+
+def started_driver_pool():
+    """
+    The driver pool, or None while plain HTTP has served every fetch (so showing its
+    stats never launches a browser).
+    """
+    return _driver_pool
+
+
+# --- Circuit breaker around the Selenium scraper ---
+@st.cache_resource
+def get_scraper_breaker():
+    """
+    Stops launching browsers while the site or chromedriver keeps failing; the pages
+    keep showing the last-known-good rates meanwhile.
+    """
+    return CircuitBreaker(
+        failure_threshold=3,
+        base_backoff=30,
+        max_backoff=15 * 60,
+        ignored_classes=("pool_busy",),
+    )
+
+
+# --- Rate providers, queried concurrently ---
+@st.cache_resource
+def get_rate_aggregator():
+    """
+    The sources of the live rates of Au and Ag. More sites can be added here as
+    `RateProvider`s reporting the same symbol names.
+    """
+    providers = [
+        CallableRateProvider(
+            "vickygold.in",
+            lambda: fetch_rates(get_driver_pool, breaker=get_scraper_breaker()),
+        ),
+    ]
+    return RateAggregator(
+        providers, RATE_POLICY, PROVIDER_DEADLINE, preferred=PREFERRED_PROVIDERS
+    )
+
+
+# --- One rate fetch at a time, across sessions and server processes ---
+@st.cache_resource
+def get_rate_fetch():
+    """
+    The providers' fetch, coalesced: concurrent refreshes share the fetch in flight,
+    and with several server processes only the one holding the lease scrapes.
+    """
+    return SingleFlight(
+        get_rate_aggregator().fetch,
+        timeout=PROVIDER_DEADLINE + 10,
+        lease=FetchLease(ttl=PROVIDER_DEADLINE * 3),
+    )
+
+
+# --- Durable history of every fetched snapshot ---
+@st.cache_resource
+def get_rate_history():
+    return RateHistory()
+
+
+# --- Process-wide background rate poller ---
+@st.cache_resource
+def get_rate_poller():
+    """
+    One poller per server process. It fetches the live rates from the providers
+    on a schedule; every session and page reads its latest snapshot.
+    Every snapshot is also appended to the rate history.
+    """
+    history = get_rate_history()
+    poller = RatePoller(
+        get_rate_fetch(),
+        POLL_INTERVAL,
+        on_publish=[
+            lambda snapshot: history.append(snapshot.rates, snapshot.fetched_at),
+            lambda snapshot: save_rates(snapshot.rates, snapshot.fetched_at),
+        ],
+    )
+    # Serve the last-known-good rates from disk right away (stale-while-revalidate)
+    last_known_good = load_rates()
+    if last_known_good is not None:
+        poller.seed(*last_known_good)
+    return poller.start()
+
+
+def apply_rates(snapshot, reset_user_rate=False):
+    """
+    Copy a rate snapshot into the session state used by the calculator pages.
+
+    With `reset_user_rate`, a manually entered gold rate is replaced by the live one.
+    """
+    st.session_state["live_rates"] = dict(snapshot.rates)
+    st.session_state["live_rates_version"] = snapshot.version
+    st.session_state["live_rates_fetched_at"] = snapshot.fetched_at
+    st.session_state["last_fetch_error"] = None
+
+    # Reset the user_modified_gold_rate flag when fetching new rates
+    # This allows the new rates to be applied to all pages
+    if reset_user_rate and "user_modified_gold_rate" in st.session_state:
+        del st.session_state["user_modified_gold_rate"]
+
+    # The rates parsed once at fetch time; pages read numbers from these records
+    st.session_state["live_rate_book"] = snapshot.book
+
+    # Every carat's rate, derived once when the snapshot was published
+    carat_rates = snapshot.carat_rates
+    if carat_rates is None:
+        # No 24k base rate in these rates: drop the previous snapshot's gold rates, so
+        # the pages fall back to their defaults rather than show outdated live rates
+        for key in ("carat_rates", "current_gold_rate_per_gram", "gold_rate_916"):
+            st.session_state.pop(key, None)
+        return
+
+    st.session_state["carat_rates"] = carat_rates
+    # The live 24k rate per gram, and the 916 (22k) rate per 10 g for display
+    st.session_state["current_gold_rate_per_gram"] = carat_rates.rate(24)
+    st.session_state["gold_rate_916"] = carat_rates.rate(22, per_10g=True)
+
+    if reset_user_rate:
+        # Update the gold_rate session state variable for pages
+        if "is_22k" in st.session_state and st.session_state["is_22k"]:
+            st.session_state.gold_rate = carat_rates.rate(22)
+        else:
+            # For 24k, use the direct rate
+            st.session_state.gold_rate = carat_rates.rate(24)
+
+
+def default_gold_rates(carat):
+    """
+    The default gold rates per gram of a calculator page for `carat` gold:
+    (rate as per `carat`, rate as 24k), from the live carat rates when there are some.
+    """
+    carat_rates = st.session_state.get("carat_rates")
+    if carat_rates is None:
+        return DEFAULT_CARAT_RATE, DEFAULT_24K_RATE
+    return carat_rates.rate(carat), carat_rates.rate_as_24k(carat)
+
+
+def sync_live_rates():
+    """
+    Pick up the latest rate snapshot, if it is newer than the one this session has seen.
+
+    Called at the top of every page; it is a dictionary lookup unless the rates changed.
+    A gold rate the user typed in is kept, the pages only update their defaults.
+    """
+    snapshot = get_rate_poller().snapshot()
+    if snapshot is not None and snapshot.version != st.session_state.get(
+        "live_rates_version"
+    ):
+        apply_rates(snapshot)
+    return snapshot
+
+
+def rates_age():
+    """
+    Seconds since the rates used by this session were fetched, or None without live rates.
+    """
+    fetched_at = st.session_state.get("live_rates_fetched_at")
+    return None if fetched_at is None else max(0.0, time.time() - fetched_at)
+
+
+def rates_freshness(age):
+    if age is None or age < STALE_AFTER:
+        return RATES_FRESH
+    if age < EXPIRED_AFTER:
+        return RATES_STALE
+    return RATES_EXPIRED
+
+
+def format_age(age):
+    if age < 60:
+        return "just now"
+    if age < 3600:
+        return f"{age // 60:.0f} min ago"
+    if age < 86400:
+        return f"{age // 3600:.0f} h {age % 3600 // 60:.0f} min ago"
+    return f"{age // 86400:.0f} days ago"
+
+
+def check_rates_freshness():
+    """
+    Warn on a calculator page when the live rates in use are stale, and stop the page
+    when they are too old to bill on. A gold rate the user typed in is always accepted.
+    """
+    age = rates_age()
+    freshness = rates_freshness(age)
+    if freshness == RATES_FRESH or st.session_state.get("user_modified_gold_rate"):
+        return freshness
+
+    if freshness == RATES_STALE:
+        st.warning(
+            f"⚠️ The live gold rate was fetched {format_age(age)}. "
+            "Check it before billing."
+        )
+    else:
+        st.error(
+            f"⛔ The live gold rate was fetched {format_age(age)} and is too old to "
+            "bill on. Fetch the latest rates on the Home page or enter the rate manually."
+        )
+        get_rate_poller().refresh()
+        st.stop()
+    return freshness
@@ -0,0 +1,107 @@
+"""
+Back-solve the making charge % of quoted totals in a CSV file and flag the outliers.
+
+The file is read and written in chunks, so it may be larger than memory. It needs the
+columns gold_rate, gold_weight and total_price; hm_charges, no_pcs, gst, extra_charges,
+carat and is_24k_rate are optional, and blank cells in them take the defaults of
+`gold_making_charges`. Every input row is written out with the columns
+making_charge_perc, making_charges, flag (empty, "negative", "implausible" or "invalid")
+and invalid_columns, naming the cells that couldn't be read as numbers.
+
+The audit is the "making_charges" job of `app_files.bulk_jobs`, run over CSV files.
+
+Usage (from the repository root):
+    python -m app_files.making_charge_audit quotes.csv audited.csv
+    python -m app_files.making_charge_audit quotes.csv outliers.csv --flagged-only --max-perc 30
+"""
+
+import argparse
+import time
+from collections import Counter
+from functools import partial
+
+from app_files.bulk_jobs import FORMAT_CSV, INVALID_COLUMNS, JOBS, run_chunk, run_job
+from app_files.calculate_batch import FLAG_INVALID, FLAG_OK, MAX_PLAUSIBLE_MAKING_PERC
+
+
+def audit_job(max_perc=MAX_PLAUSIBLE_MAKING_PERC):
+    """
+    The "making_charges" bulk job, flagging making charges above `max_perc` %.
+    """
+    job = JOBS["making_charges"]
+    return job._replace(calculate=partial(job.calculate, max_perc=max_perc))
+
+
+def audit_chunk(chunk, max_perc=MAX_PLAUSIBLE_MAKING_PERC):
+    """
+    The rows of `chunk` (a DataFrame) with the solved making charges and their flags.
+    Rows with a cell that isn't a number (or a blank required cell) are solved as NaN,
+    flagged "invalid" and the cells named in invalid_columns.
+    """
+    return run_chunk(audit_job(max_perc), chunk)
+
+
+def audit_csv(
+    source,
+    destination,
+    chunk_rows=100_000,
+    max_perc=MAX_PLAUSIBLE_MAKING_PERC,
+    flagged_only=False,
+):
+    """
+    Audit the quotes in the CSV file `source` chunk by chunk, writing the results to the
+    CSV file `destination`. Returns (rows read, Counter of flags, Counter of the
+    columns with invalid cells).
+    """
+    flags = Counter()
+    invalid = Counter()
+
+    def on_chunk(result):
+        flags.update(result["flag"].value_counts().to_dict())
+        invalid.update(
+            result[INVALID_COLUMNS].str.split().explode().value_counts().to_dict()
+        )
+        return result[result["flag"] != FLAG_OK] if flagged_only else result
+
+    report = run_job(
+        audit_job(max_perc),
+        source,
+        destination,
+        chunk_rows,
+        source_format=FORMAT_CSV,
+        destination_format=FORMAT_CSV,
+        on_chunk=on_chunk,
+    )
+    return report.rows, flags, invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="CSV file of quotes")
+    parser.add_argument("destination", help="CSV file to write the results to")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--max-perc", type=float, default=MAX_PLAUSIBLE_MAKING_PERC)
+    parser.add_argument(
+        "--flagged-only", action="store_true", help="only write the flagged rows"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows, flags, invalid = audit_csv(
+        args.source, args.destination, args.chunk_rows, args.max_perc, args.flagged_only
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"{rows:,} rows in {elapsed:.1f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    for flag, count in sorted(flags.items()):
+        print(f"  {flag or 'ok':>12}: {count:,}")
+    for name, count in sorted(invalid.items()):
+        print(f"{count:,} row(s) have a {name} that isn't a number.")
+    if flags[FLAG_INVALID]:
+        print(
+            "Rows flagged invalid with no invalid_columns have a zero rate or weight."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+# Significant digits floats are compared on, so 1.1 and 1.1000000000000001 share an entry
+KEY_DIGITS = 12
+
+
+def normalize(value):
+    """
+    A hashable, canonical form of a calculator input: floats are rounded to KEY_DIGITS
+    significant digits (and integral ones compare equal to the ints), sequences become tuples.
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        value = float(f"{value:.{KEY_DIGITS}g}")
+        return int(value) if value.is_integer() else value
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(item) for item in value)
+    return value
+
+
+def size_of(value):
+    """
+    Approximate memory (bytes) held by a cached value and what it contains.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        size += sum(size_of(k) + size_of(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(size_of(item) for item in value)
+    return size
+
+
+class LRUMemo:
+    """
+    A thread-safe least-recently-used cache of computed values, bounded by the number
+    of entries and by their approximate size in bytes.
+    """
+
+    def __init__(self, max_entries=2048, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        # Computed outside the lock; two sessions missing at once both compute,
+        # which is cheaper than making every reader wait
+        value = compute()
+        size = size_of(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while (
+                    len(self._entries) > self.max_entries
+                    or self._bytes > self.max_bytes
+                ):
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+                    self._evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else None,
+                "evictions": self._evictions,
+            }
+
+
+def memoized(memo):
+    """
+    Decorator caching a function's results in `memo` (an `LRUMemo`, or a function
+    returning one), keyed on the function and its normalized arguments.
+
+    The function is called with the normalized arguments too, so the result cached under
+    a key doesn't depend on which of its equal inputs came first (53 and 53.0 are both
+    passed, and formatted, as 53).
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            cache = memo() if callable(memo) else memo
+            args = normalize(args)
+            kwargs = {name: normalize(v) for name, v in kwargs.items()}
+            key = (function.__qualname__, args, tuple(sorted(kwargs.items())))
+            return cache.get_or_compute(key, lambda: function(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
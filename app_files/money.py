@@ -0,0 +1,412 @@
+"""
+Exact fixed-point versions of the calculators in `app_files.calculate`, for billing.
+
+Amounts are integers throughout:
+- money in paise (₹1 = 100), rates in paise per gram
+- weights in milligrams
+- percentages, purity baselines and GST in parts per million (4 % = 40_000, 0.92 = 920_000)
+
+Every intermediate amount is rounded half up to the paisa or milligram at a fixed step,
+so totals are reproducible to the paisa whatever the platform or the order of a batch.
+GST is charged as CGST and SGST, half each, each rounded separately as on a tax invoice.
+
+Values entered as rupees/grams/percent are converted once with `to_paise`, `to_mg` and
+`to_ppm` (or use the `*_exact` wrappers, which take the arguments of the float functions).
+The `*_batch` functions take NumPy int64 arrays and return exactly the same integers.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+PAISE_PER_RUPEE = 100
+MG_PER_GRAM = 1000
+PPM = 1_000_000  # parts per million in a whole, 10_000 in a percent
+
+# GST on gold (3 %), charged half as CGST and half as SGST
+GST_PPM = 30_000
+
+
+def _scaled(value, scale):
+    # Through str() so a float like 0.1 is read as the decimal the user entered
+    return int((Decimal(str(value)) * scale).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def to_paise(rupees):
+    return _scaled(rupees, PAISE_PER_RUPEE)
+
+
+def to_mg(grams):
+    return _scaled(grams, MG_PER_GRAM)
+
+
+def to_ppm(percent):
+    """
+    A percentage (e.g. 12.5) in parts per million.
+    """
+    return _scaled(percent, PPM // 100)
+
+
+def fraction_to_ppm(fraction):
+    """
+    A fraction (e.g. a baseline of 0.92) in parts per million.
+    """
+    return _scaled(fraction, PPM)
+
+
+def div_round(numerator, denominator):
+    """
+    numerator / denominator rounded half up (towards +inf on a tie), in integers.
+    Works the same on Python ints and NumPy integer arrays.
+    """
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def _select(condition, if_true, if_false):
+    # A per-row flag selects per row (NumPy is only needed for those)
+    if isinstance(condition, (bool, int)):
+        return if_true if condition else if_false
+    import numpy as np
+
+    return np.where(condition, if_true, if_false)
+
+
+def _batch(function, amounts_type, flags, kwargs):
+    """
+    Call `function` with every argument in `kwargs` as an int64 array (bool for the
+    names in `flags`) and broadcast every result to the common shape.
+    """
+    import numpy as np
+
+    arrays = {
+        name: np.asarray(value, bool if name in flags else np.int64)
+        for name, value in kwargs.items()
+    }
+    shape = np.broadcast_shapes(*(array.shape for array in arrays.values()))
+    return amounts_type._make(
+        np.broadcast_to(amount, shape) for amount in function(**arrays)
+    )
+
+
+class SaleAmounts(NamedTuple):
+    """
+    The results of `gold_sell_paise`, as `gold_sell` returns them but in paise and
+    milligrams, with the GST split into CGST and SGST (tax = cgst + sgst).
+    """
+
+    hm_rate: int
+    gold_charges: int
+    making_charges: int
+    hm_charges: int
+    cgst: int
+    sgst: int
+    tax: int
+    total_before_tax: int
+    total_price: int
+    pure_gold_weight: int
+    total_recouped_pure_weight: int
+    making_charge_wt_pure: int
+
+
+def gold_sell_paise(
+    gold_rate,
+    qty,
+    weight,
+    making_charge_ppm,
+    hm_charges_per_pc,
+    extra_charges=0,
+    calculate_with_tax=True,
+    carat=22,
+    is_24k_rate=False,
+    gst_ppm=GST_PPM,
+):
+    """
+    `gold_sell` in integers: `gold_rate` in paise per gram, `weight` in mg, charges in
+    paise and the making charge in ppm.
+    """
+    hm_rate = _select(is_24k_rate, div_round(gold_rate * carat, 24), gold_rate)
+
+    gold_charges = div_round(hm_rate * weight, MG_PER_GRAM)
+    making_charges = div_round(gold_charges * making_charge_ppm, PPM) + extra_charges
+    hm_charges = hm_charges_per_pc * qty
+    total_before_tax = gold_charges + making_charges + hm_charges
+
+    half_gst = div_round(total_before_tax * (gst_ppm // 2), PPM) * calculate_with_tax
+    tax = 2 * half_gst
+    total_price = total_before_tax + tax
+
+    pure_gold_weight = div_round(weight * carat, 24)
+    total_recouped_pure_weight = div_round(
+        pure_gold_weight * (PPM + making_charge_ppm), PPM
+    )
+    return SaleAmounts(
+        hm_rate,
+        gold_charges,
+        making_charges,
+        hm_charges,
+        half_gst,
+        half_gst,
+        tax,
+        total_before_tax,
+        total_price,
+        pure_gold_weight,
+        total_recouped_pure_weight,
+        total_recouped_pure_weight - pure_gold_weight,
+    )
+
+
+def gold_sell_paise_batch(
+    gold_rate,
+    qty,
+    weight,
+    making_charge_ppm,
+    hm_charges_per_pc,
+    extra_charges=0,
+    calculate_with_tax=True,
+    carat=22,
+    is_24k_rate=False,
+    gst_ppm=GST_PPM,
+):
+    """
+    `gold_sell_paise` over arrays; returns a `SaleAmounts` of int64 arrays.
+    """
+    return _batch(
+        gold_sell_paise,
+        SaleAmounts,
+        ("calculate_with_tax", "is_24k_rate"),
+        dict(
+            gold_rate=gold_rate,
+            qty=qty,
+            weight=weight,
+            making_charge_ppm=making_charge_ppm,
+            hm_charges_per_pc=hm_charges_per_pc,
+            extra_charges=extra_charges,
+            calculate_with_tax=calculate_with_tax,
+            carat=carat,
+            is_24k_rate=is_24k_rate,
+            gst_ppm=gst_ppm,
+        ),
+    )
+
+
+def gold_sell_exact(
+    gold_rate=9400,
+    qty=1,
+    weight=1,
+    making_charge_perc=14,
+    hm_charges_per_pc=53,
+    extra_charges=0,
+    calculate_with_tax=True,
+    carat=22,
+    is_24k_rate=False,
+):
+    """
+    `gold_sell_paise` with the arguments of `gold_sell` (rupees, grams, percent).
+    """
+    return gold_sell_paise(
+        to_paise(gold_rate),
+        qty,
+        to_mg(weight),
+        to_ppm(making_charge_perc),
+        to_paise(hm_charges_per_pc),
+        to_paise(extra_charges),
+        calculate_with_tax,
+        carat,
+        is_24k_rate,
+    )
+
+
+class MakingChargeAmounts(NamedTuple):
+    """
+    The results of `gold_making_charges_paise`: the making charge in ppm of the gold
+    value and in paise.
+    """
+
+    making_charge_ppm: int
+    making_charges: int
+
+
+def gold_making_charges_paise(
+    gold_rate,
+    gold_weight,
+    total_price,
+    hm_charges,
+    no_pcs=1,
+    gst_ppm=GST_PPM,
+    extra_charges=0,
+    carat=22,
+    is_24k_rate=False,
+):
+    """
+    `gold_making_charges` in integers (paise per gram, mg, paise, ppm). The price before
+    GST is taken off the total first, rounded to the paisa, then the charges and gold value.
+    A quote with no gold value (a zero rate or weight) solves to 0 ppm.
+    """
+    gold_rate = _select(is_24k_rate, div_round(gold_rate * carat, 24), gold_rate)
+
+    gold_value = div_round(gold_rate * gold_weight, MG_PER_GRAM)
+    total_before_tax = div_round(total_price * PPM, PPM + gst_ppm)
+    making_charges = total_before_tax - extra_charges - hm_charges * no_pcs - gold_value
+    no_gold = gold_value == 0
+    making_charge_ppm = _select(
+        no_gold, 0, div_round(making_charges * PPM, _select(no_gold, 1, gold_value))
+    )
+    return MakingChargeAmounts(making_charge_ppm, making_charges)
+
+
+def gold_making_charges_paise_batch(
+    gold_rate,
+    gold_weight,
+    total_price,
+    hm_charges,
+    no_pcs=1,
+    gst_ppm=GST_PPM,
+    extra_charges=0,
+    carat=22,
+    is_24k_rate=False,
+):
+    """
+    `gold_making_charges_paise` over arrays. Rows with no gold value solve to 0 ppm.
+    """
+    return _batch(
+        gold_making_charges_paise,
+        MakingChargeAmounts,
+        ("is_24k_rate",),
+        dict(
+            gold_rate=gold_rate,
+            gold_weight=gold_weight,
+            total_price=total_price,
+            hm_charges=hm_charges,
+            no_pcs=no_pcs,
+            gst_ppm=gst_ppm,
+            extra_charges=extra_charges,
+            carat=carat,
+            is_24k_rate=is_24k_rate,
+        ),
+    )
+
+
+def gold_making_charges_exact(
+    gold_rate=9100,
+    gold_weight=1,
+    total_price=12000,
+    hm_charges=53,
+    no_pcs=1,
+    gst=3,
+    extra_charges=0,
+    carat=22,
+    is_24k_rate=False,
+):
+    """
+    `gold_making_charges_paise` with the arguments of `gold_making_charges`.
+    """
+    return gold_making_charges_paise(
+        to_paise(gold_rate),
+        to_mg(gold_weight),
+        to_paise(total_price),
+        to_paise(hm_charges),
+        no_pcs,
+        to_ppm(gst),
+        to_paise(extra_charges),
+        carat,
+        is_24k_rate,
+    )
+
+
+class CostPriceAmounts(NamedTuple):
+    """
+    The results of `cost_price_gold_paise`, like those of `cost_price_gold`:
+    weights in mg, prices in paise and the break-even making charge in ppm.
+    """
+
+    total_pure_wt: int
+    total_payable_wt: int
+    goldsmith_loss_wt: int
+    goldsmith_loss_wt_24k_price: int
+    breakeven_making_ppm: int
+    cp_total: int
+
+
+def cost_price_gold_paise(
+    gold_rate,
+    goldsmith_loss_ppm,
+    baseline_ppm,
+    carat=22,
+    extra_charges=0,
+    total_weight=1000,
+    is_24k_rate=False,
+):
+    """
+    `cost_price_gold` in integers (paise per gram, ppm, paise, mg). A piece with no
+    weight has a 0 ppm breakeven making charge.
+    """
+    gold_rate_24k = _select(is_24k_rate, gold_rate, div_round(gold_rate * 24, carat))
+
+    total_pure_wt = div_round(total_weight * carat, 24)
+    total_payable_wt = div_round(
+        total_weight * (baseline_ppm + goldsmith_loss_ppm), PPM
+    )
+    goldsmith_loss_wt = total_payable_wt - total_pure_wt
+    no_gold = total_pure_wt == 0
+    return CostPriceAmounts(
+        total_pure_wt,
+        total_payable_wt,
+        goldsmith_loss_wt,
+        div_round(goldsmith_loss_wt * gold_rate_24k, MG_PER_GRAM),
+        _select(
+            no_gold,
+            0,
+            div_round(goldsmith_loss_wt * PPM, _select(no_gold, 1, total_pure_wt)),
+        ),
+        div_round(total_payable_wt * gold_rate_24k, MG_PER_GRAM) + extra_charges,
+    )
+
+
+def cost_price_gold_paise_batch(
+    gold_rate,
+    goldsmith_loss_ppm,
+    baseline_ppm,
+    carat=22,
+    extra_charges=0,
+    total_weight=1000,
+    is_24k_rate=False,
+):
+    """
+    `cost_price_gold_paise` over arrays, e.g. the pieces of a lot.
+    """
+    return _batch(
+        cost_price_gold_paise,
+        CostPriceAmounts,
+        ("is_24k_rate",),
+        dict(
+            gold_rate=gold_rate,
+            goldsmith_loss_ppm=goldsmith_loss_ppm,
+            baseline_ppm=baseline_ppm,
+            carat=carat,
+            extra_charges=extra_charges,
+            total_weight=total_weight,
+            is_24k_rate=is_24k_rate,
+        ),
+    )
+
+
+def cost_price_gold_exact(
+    gold_rate=9100,
+    goldsmith_loss_perc=4,
+    baseline=0.92,
+    carat=22,
+    extra_charges=0,
+    total_weight=1,
+    is_24k_rate=False,
+):
+    """
+    `cost_price_gold_paise` with the arguments of `cost_price_gold`.
+    """
+    return cost_price_gold_paise(
+        to_paise(gold_rate),
+        to_ppm(goldsmith_loss_perc),
+        fraction_to_ppm(baseline),
+        carat,
+        to_paise(extra_charges),
+        to_mg(total_weight),
+        is_24k_rate,
+    )
@@ -0,0 +1,256 @@
+import statistics
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from app_files.rates import META_KEYS, has_rates, parse_rate_value
+
+# Policies to pick the result of a fan-out
+POLICY_FIRST_VALID = "first_valid"  # the first provider to answer with rates
+POLICY_MEDIAN = "median"  # per symbol, the median of all valid answers
+POLICY_PREFERRED = "preferred"  # the preferred provider, failing over in order
+
+
+class RateProvider(ABC):
+    """
+    A source of live rates. Subclasses implement `fetch()`.
+
+    `fetch()` returns a rates dict like the scrapers do: a "timestamp", {symbol: rate}
+    pairs, or an "error". Providers should report the same symbol names
+    (e.g. "Gold 995 100gms") so their answers can be compared.
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    def fetch(self):
+        pass
+
+
+class CallableRateProvider(RateProvider):
+    """
+    A provider around a plain function returning a rates dict.
+    """
+
+    def __init__(self, name, fetch):
+        self.name = name
+        self._fetch = fetch
+
+    def fetch(self):
+        return self._fetch()
+
+
+class HttpRateProvider(RateProvider):
+    """
+    A site with the same live rates page layout, fetched over plain HTTP only.
+    """
+
+    def __init__(self, name, url, timeout=5):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        from app_files.http_fetcher import get_rates_with_http
+
+        return get_rates_with_http(self.url, self.timeout)
+
+
+class ProviderStats:
+    """
+    Latency and error counters of one provider.
+    """
+
+    __slots__ = (
+        "calls",
+        "successes",
+        "errors",
+        "timeouts",
+        "skipped",
+        "last_latency",
+        "total_latency",
+        "last_error",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_latency = None
+        self.total_latency = 0.0
+        self.last_error = None
+
+    def as_dict(self):
+        finished = self.successes + self.errors
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "last_latency_ms": (
+                None if self.last_latency is None else self.last_latency * 1000
+            ),
+            "mean_latency_ms": (
+                self.total_latency / finished * 1000 if finished else None
+            ),
+            "last_error": self.last_error,
+        }
+
+
+class RateAggregator:
+    """
+    Queries several `RateProvider`s concurrently under a shared deadline and picks
+    a result with one of the POLICY_* policies.
+
+    A provider that is still busy with a previous (slow) call is skipped rather than
+    queued, so one hanging site never ties up more than one worker thread.
+    """
+
+    def __init__(
+        self, providers, policy=POLICY_FIRST_VALID, deadline=20, preferred=None
+    ):
+        if policy not in (POLICY_FIRST_VALID, POLICY_MEDIAN, POLICY_PREFERRED):
+            raise ValueError(f"Unknown rate provider policy: {policy}")
+        self.providers = list(providers)
+        self.policy = policy
+        self.deadline = deadline
+        # Order in which providers are preferred (by name), the rest follow in list order
+        preferred = list(preferred or [])
+        self._preference = preferred + [
+            p.name for p in self.providers if p.name not in preferred
+        ]
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(self.providers)), thread_name_prefix="rate-provider"
+        )
+        self._lock = threading.Lock()
+        self._busy = set()
+        self._stats = {p.name: ProviderStats() for p in self.providers}
+
+    def stats(self):
+        """
+        {provider name: latency and error counters}
+        """
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def fetch(self):
+        """
+        Fan out to all providers and return the rates picked by the policy.
+        The chosen provider(s) are recorded under the "source" key.
+        """
+        started = time.monotonic()
+        futures = {}
+        for provider in self.providers:
+            with self._lock:
+                if provider.name in self._busy:
+                    self._stats[provider.name].skipped += 1
+                    continue
+                self._busy.add(provider.name)
+                self._stats[provider.name].calls += 1
+            futures[self._executor.submit(self._call, provider)] = provider.name
+
+        results = {}  # provider name -> rates, for valid answers only
+        pending = set(futures)
+        while pending:
+            remaining = self.deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                rates = future.result()
+                if has_rates(rates):
+                    results[futures[future]] = rates
+            if self._decided(results, pending, futures):
+                break
+
+        with self._lock:
+            for future in pending:
+                self._stats[futures[future]].timeouts += 1
+
+        return self._pick(results, futures)
+
+    # --- Internals ---
+    def _call(self, provider):
+        started = time.monotonic()
+        try:
+            rates = provider.fetch()
+        except Exception as e:
+            rates = {"error": f"{provider.name}: {e}"}
+        latency = time.monotonic() - started
+
+        with self._lock:
+            self._busy.discard(provider.name)
+            stats = self._stats[provider.name]
+            stats.last_latency = latency
+            stats.total_latency += latency
+            if has_rates(rates):
+                stats.successes += 1
+            else:
+                stats.errors += 1
+                stats.last_error = rates.get("error", "No rates were found.")
+        return rates
+
+    def _decided(self, results, pending, futures):
+        if self.policy == POLICY_FIRST_VALID:
+            return bool(results)
+        if self.policy == POLICY_PREFERRED:
+            # Done once no provider ahead of the best answer so far can still answer
+            still_running = {futures[f] for f in pending}
+            for name in self._preference:
+                if name in results:
+                    return True
+                if name in still_running:
+                    return False
+        # The median waits for everyone (or the deadline)
+        return False
+
+    def _pick(self, results, futures):
+        if not results:
+            errors = "; ".join(
+                f"{name}: {self._stats[name].last_error or 'timed out'}"
+                for name in futures.values()
+            )
+            return {"error": f"No rate provider returned rates ({errors})"}
+
+        if self.policy == POLICY_MEDIAN and len(results) > 1:
+            return _median_rates(results)
+
+        for name in self._preference:
+            if name in results:
+                return dict(results[name], source=name)
+
+
+def _median_rates(results):
+    """
+    Combine several answers: per symbol, the median of the numeric rates reported.
+    """
+    names = sorted(results)
+    rates = {"timestamp": max(r.get("timestamp", "") for r in results.values())}
+    symbols = []
+    for name in names:
+        symbols += [
+            key for key in results[name] if key not in META_KEYS and key not in symbols
+        ]
+
+    for symbol in symbols:
+        values = []
+        for name in names:
+            try:
+                values.append(parse_rate_value(results[name][symbol]))
+            except (KeyError, ValueError):
+                continue
+        if values:
+            median = statistics.median(values)
+            rates[symbol] = (
+                f"{median:.0f}" if median == int(median) else f"{median:.2f}"
+            )
+
+    rates["source"] = "median of " + ", ".join(names)
+    return rates
@@ -0,0 +1,30 @@
+import json
+from pathlib import Path
+
+from app_files.atomic_json import write_json_atomic
+
+# Default location of the last-known-good rates (ignored by git)
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "last_rates.json"
+
+
+def save_rates(rates, fetched_at, path=CACHE_PATH):
+    """
+    Persist the last-known-good rates, atomically, so a crash mid-write never
+    leaves a truncated file behind.
+    """
+    write_json_atomic(path, {"fetched_at": fetched_at, "rates": dict(rates)})
+
+
+def load_rates(path=CACHE_PATH):
+    """
+    The last-known-good rates as (rates, fetched_at), or None if there are none (yet).
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return dict(data["rates"]), float(data["fetched_at"])
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring unreadable rate cache {path}: {e}")
+        return None
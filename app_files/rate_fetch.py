@@ -0,0 +1,39 @@
+from app_files.rates import LIVE_RATES_URL, has_rates
+
+# Tiers, in the order they are tried
+TIER_HTTP = "http"
+TIER_SELENIUM = "selenium"
+
+
+def fetch_rates(
+    get_pool, http_url=LIVE_RATES_URL, breaker=None, page_url=LIVE_RATES_URL
+):
+    """
+    Tiered rate fetcher.
+
+    Tries a plain HTTP GET of `http_url` (the live rates page, or the data endpoint it polls)
+    first and falls back to a browser only when that returns no rates. `get_pool` returns
+    the driver pool and is only called on fallback, so no browser is launched while HTTP works.
+    The tier that served the rates is recorded under the "tier" key.
+    `breaker` is the circuit breaker guarding the browser tier, which loads `page_url`.
+    """
+    # Imported on first use: requests and BeautifulSoup are only needed by the poller
+    # thread, not to render a page
+    from app_files.http_fetcher import get_rates_with_http
+
+    rates = get_rates_with_http(http_url)
+    if has_rates(rates):
+        rates["tier"] = TIER_HTTP
+        return rates
+
+    print(
+        f"No rates over plain HTTP ({rates.get('error', 'empty page')}). Using Selenium..."
+    )
+
+    # Imported here so the browser stack is only loaded when it is actually needed
+    from app_files.scraper import get_rates_with_selenium
+
+    rates = get_rates_with_selenium(get_pool(), breaker=breaker, url=page_url)
+    if "error" not in rates:
+        rates["tier"] = TIER_SELENIUM
+    return rates
@@ -0,0 +1,159 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app_files.rates import META_KEYS, parse_rate_value
+
+# Default location of the history database (ignored by git)
+HISTORY_PATH = Path(__file__).resolve().parent.parent / "data" / "rate_history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rates (
+    fetched_at REAL NOT NULL,  -- unix time (seconds) of the fetch
+    symbol TEXT NOT NULL,
+    rate REAL,  -- numeric value, NULL if the displayed rate couldn't be parsed
+    rate_text TEXT NOT NULL,  -- the rate as displayed by the source
+    source TEXT,
+    PRIMARY KEY (symbol, fetched_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rates_by_time ON rates (fetched_at);
+"""
+
+
+class RateHistory:
+    """
+    Append-only store of every fetched rate snapshot, in SQLite.
+
+    Rows are keyed by (symbol, fetch time), so the per-symbol range, downsampling and
+    "as of" queries are index range scans. Times are unix timestamps in seconds.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def append(self, rates, fetched_at=None):
+        """
+        Store every rate of a rates dict, as fetched at `fetched_at` (default: now).
+        Returns the number of rates stored.
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        source = rates.get("source") or rates.get("tier")
+        rows = []
+        for symbol, rate_text in rates.items():
+            if symbol in META_KEYS or symbol == "error":
+                continue
+            try:
+                rate = parse_rate_value(rate_text)
+            except ValueError:
+                rate = None
+            rows.append((fetched_at, symbol, rate, rate_text, source))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def symbols(self):
+        with self._lock:
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT DISTINCT symbol FROM rates ORDER BY symbol"
+                )
+            ]
+
+    def range(self, start, end, symbol=None):
+        """
+        [(fetched_at, symbol, rate)] fetched in [start, end], oldest first.
+        """
+        if symbol is None:
+            query = (
+                "SELECT fetched_at, symbol, rate FROM rates"
+                " WHERE fetched_at BETWEEN ? AND ? ORDER BY fetched_at, symbol"
+            )
+            params = (start, end)
+        else:
+            query = (
+                "SELECT fetched_at, symbol, rate FROM rates"
+                " WHERE symbol = ? AND fetched_at BETWEEN ? AND ? ORDER BY fetched_at"
+            )
+            params = (symbol, start, end)
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def downsample(self, symbol, start, end, bucket_seconds):
+        """
+        The rate of `symbol` in [start, end], summarised per `bucket_seconds` bucket for charting.
+
+        Returns [(bucket_start, open, high, low, close, samples)], oldest first.
+        """
+        query = """
+            SELECT
+                bucket_start,
+                MAX(CASE WHEN nth_first = 1 THEN rate END),
+                MAX(rate),
+                MIN(rate),
+                MAX(CASE WHEN nth_last = 1 THEN rate END),
+                COUNT(*)
+            FROM (
+                SELECT
+                    bucket_start,
+                    rate,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY bucket_start ORDER BY fetched_at
+                    ) AS nth_first,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY bucket_start ORDER BY fetched_at DESC
+                    ) AS nth_last
+                FROM (
+                    SELECT
+                        CAST(fetched_at / :bucket AS INTEGER) * :bucket AS bucket_start,
+                        fetched_at,
+                        rate
+                    FROM rates
+                    WHERE symbol = :symbol AND fetched_at BETWEEN :start AND :end
+                        AND rate IS NOT NULL
+                )
+            )
+            GROUP BY bucket_start
+            ORDER BY bucket_start
+        """
+        params = {
+            "bucket": bucket_seconds,
+            "symbol": symbol,
+            "start": start,
+            "end": end,
+        }
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    def as_of(self, when, symbol=None):
+        """
+        The rates in force at time `when`: {symbol: (fetched_at, rate, rate_text)} of the
+        latest fetch at or before `when`, for `symbol` only if given.
+        """
+        symbols = [symbol] if symbol is not None else self.symbols()
+        result = {}
+        with self._lock:
+            for sym in symbols:
+                row = self._conn.execute(
+                    "SELECT fetched_at, rate, rate_text FROM rates"
+                    " WHERE symbol = ? AND fetched_at <= ?"
+                    " ORDER BY fetched_at DESC LIMIT 1",
+                    (sym, when),
+                ).fetchone()
+                if row is not None:
+                    result[sym] = row
+        return result
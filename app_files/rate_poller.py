@@ -0,0 +1,148 @@
+import threading
+import time
+from types import MappingProxyType
+from typing import NamedTuple
+
+from app_files.carat_rates import CaratRateTable, carat_rates_from_book
+from app_files.rate_records import RateBook, parse_rates
+from app_files.rates import has_rates
+
+
+class RateSnapshot(NamedTuple):
+    """
+    An immutable set of live rates, as published by the `RatePoller`.
+
+    - **"version"**: increases by one with every successful fetch
+    - **"rates"**: read-only {symbol: rate} mapping, including the "timestamp" (and "tier")
+    - **"fetched_at"**: `time.time()` at which the rates were fetched
+    - **"book"**: the rates parsed into typed records, so readers never re-parse strings
+    - **"carat_rates"**: the gold rates of every carat derived from the book, or None
+      without a 24k gold rate
+    """
+
+    version: int
+    rates: MappingProxyType
+    fetched_at: float
+    book: RateBook
+    carat_rates: CaratRateTable
+
+
+def make_snapshot(version, rates, fetched_at):
+    """
+    A `RateSnapshot` of `rates`, parsed and with the carat rates derived, once.
+    """
+    book = parse_rates(rates)
+    return RateSnapshot(
+        version,
+        MappingProxyType(dict(rates)),
+        fetched_at,
+        book,
+        carat_rates_from_book(book),
+    )
+
+
+class RatePoller:
+    """
+    Refreshes the live rates on a background thread and publishes them as a `RateSnapshot`.
+
+    Readers only ever look at the latest snapshot (a single attribute read), so no page
+    or session waits on a scrape. A failed fetch keeps the previous snapshot and is
+    reported through `last_error`. Each `on_publish` callback is called with every
+    new snapshot, on the poller thread.
+    """
+
+    def __init__(self, fetch, interval=30, retry_interval=10, on_publish=()):
+        self._fetch = fetch
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self._on_publish = list(on_publish)
+
+        self._snapshot = None
+        self.last_error = None
+        self._wakeup = threading.Event()
+        self._published = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="rate-poller", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def seed(self, rates, fetched_at):
+        """
+        Publish previously fetched rates (e.g. the last-known-good rates from disk)
+        as the first snapshot, so readers have something to show until the first fetch.
+        Ignored once a snapshot exists; `on_publish` callbacks are not called.
+        """
+        with self._published:
+            if self._snapshot is None:
+                self._snapshot = make_snapshot(1, rates, fetched_at)
+                self._published.notify_all()
+
+    def snapshot(self):
+        """
+        The latest published snapshot, or None before the first successful fetch.
+        """
+        return self._snapshot
+
+    def refresh(self):
+        """
+        Ask the poller to fetch right away instead of waiting for the next tick.
+        """
+        self._wakeup.set()
+
+    def wait_for_snapshot(self, timeout, newer_than=0):
+        """
+        Block until a snapshot with a version above `newer_than` is published
+        (or `timeout` seconds pass) and return the latest snapshot.
+        """
+        deadline = time.monotonic() + timeout
+        with self._published:
+            while self._snapshot is None or self._snapshot.version <= newer_than:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._published.wait(remaining)
+            return self._snapshot
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            ok = self._poll_once()
+            self._wakeup.wait(self.interval if ok else self.retry_interval)
+
+    def _poll_once(self):
+        try:
+            rates = self._fetch()
+        except Exception as e:
+            rates = {"error": f"An error occurred while polling rates: {e}"}
+
+        if not has_rates(rates):
+            self.last_error = rates.get("error", "No rates were found.")
+            print(f"Rate poller: {self.last_error}")
+            return False
+
+        with self._published:
+            version = self._snapshot.version + 1 if self._snapshot else 1
+            self._snapshot = make_snapshot(version, rates, time.time())
+            snapshot = self._snapshot
+            self.last_error = None
+            self._published.notify_all()
+
+        for callback in self._on_publish:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Rate poller: error in snapshot callback: {e}")
+        return True
@@ -0,0 +1,100 @@
+import re
+from typing import NamedTuple
+
+from app_files.rates import META_KEYS, parse_rate_value
+
+_PURITY = re.compile(r"(?<![\d.])(\d{3})(?![\d.]|\s*(?:gms?|g|kgs?)\b)", re.IGNORECASE)
+_UNIT = re.compile(r"(\d+(?:\.\d+)?)\s*(gms?|g|kgs?)\b", re.IGNORECASE)
+
+
+class RateRecord(NamedTuple):
+    """
+    One live rate, parsed once when it is fetched.
+
+    - **"symbol"**: the name shown by the source, e.g. "Gold 995 100gms (T+0)"
+    - **"metal"**: "gold", "silver" or "" if unknown
+    - **"purity"**: fineness in parts per thousand, e.g. "995", or "" if unknown
+    - **"unit"**: the quantity the rate is for, e.g. "100gms", "1kg", or ""
+    - **"value"**: the rate in ₹
+    - **"source"**: where the rate came from
+    """
+
+    symbol: str
+    metal: str
+    purity: str
+    unit: str
+    value: float
+    source: str
+
+
+class RateBook:
+    """
+    The parsed rates of one snapshot, indexed by metal and by (metal, purity).
+    """
+
+    __slots__ = ("records", "_by_metal", "_by_purity")
+
+    def __init__(self, records):
+        self.records = tuple(records)
+        self._by_metal = {}
+        self._by_purity = {}
+        for record in self.records:
+            self._by_metal.setdefault(record.metal, []).append(record)
+            self._by_purity.setdefault((record.metal, record.purity), []).append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def by_metal(self, metal):
+        return self._by_metal.get(metal, [])
+
+    def find(self, metal, purity, unit=None):
+        """
+        The first rate of `metal` at `purity` (and for `unit`, if given), or None.
+        """
+        for record in self._by_purity.get((metal, purity), ()):
+            if unit is None or record.unit.lower() == unit.lower():
+                return record
+        return None
+
+
+def parse_symbol(symbol):
+    """
+    (metal, purity, unit) of a rate name like "Gold 995 100gms (T+0)" or "Silver 999 30kg".
+    """
+    lowered = symbol.lower()
+    if "gold" in lowered:
+        metal = "gold"
+    elif "silver" in lowered:
+        metal = "silver"
+    else:
+        metal = ""
+
+    unit = _UNIT.search(symbol)
+    purity = _PURITY.search(symbol)
+    return (
+        metal,
+        purity.group(1) if purity else "",
+        f"{unit.group(1)}{unit.group(2).lower()}" if unit else "",
+    )
+
+
+def parse_rates(rates):
+    """
+    Turn a rates dict of display strings into a `RateBook`. Rates without a number are skipped.
+    """
+    source = rates.get("source") or rates.get("tier") or ""
+    records = []
+    for symbol, rate_text in rates.items():
+        if symbol in META_KEYS or symbol == "error":
+            continue
+        try:
+            value = parse_rate_value(rate_text)
+        except ValueError:
+            print(f"Skipping rate without a number: {symbol}={rate_text!r}")
+            continue
+        records.append(RateRecord(symbol, *parse_symbol(symbol), value, source))
+    return RateBook(records)
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import pytz
+
+LIVE_RATES_URL = "https://vickygold.in/Liverate.html"
+
+# Keys in a rates dict that are metadata and not rates
+META_KEYS = ("timestamp", "tier", "source")
+
+
+def ist_timestamp():
+    """
+    Get the current time in IST, formatted the way it is shown on the Home page.
+    """
+    ist = pytz.timezone("Asia/Kolkata")
+    return datetime.now(ist).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+
+def prefixed_symbol(symbol_text, container_id):
+    """
+    Add a "Gold "/"Silver " prefix for clarity, based on the container of the
+    rate on the live rates page, if the symbol doesn't already say so.
+    """
+    if container_id == "silverproduct" and "Silver" not in symbol_text:
+        prefix = "Silver "
+    elif container_id == "divProduct" and "Gold" not in symbol_text:
+        prefix = "Gold "
+    else:
+        prefix = ""
+    return f"{prefix}{symbol_text}"
+
+
+def has_rates(rates):
+    """
+    True if `rates` holds at least one rate (besides metadata) and no error.
+    """
+    return "error" not in rates and any(key not in META_KEYS for key in rates)
+
+
+def parse_rate_value(rate_str):
+    """
+    The numeric value of a displayed rate, e.g. "75,150" -> 75150.0 or "₹ 75150.50" -> 75150.5.
+    When the text holds several numbers, the last one is the rate.
+    Raises ValueError if there is no number in it.
+    """
+    tokens = [token for token in rate_str.split() if any(c.isdigit() for c in token)]
+    if not tokens:
+        raise ValueError(f"No number in rate {rate_str!r}")
+    # Remove non-numeric characters except decimal point
+    return float("".join(c for c in tokens[-1] if c.isdigit() or c == "."))
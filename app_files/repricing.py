@@ -0,0 +1,167 @@
+"""
+Reprice tagged stock when the live gold rate changes, touching only what changed.
+
+The total price `gold_sell` gives a piece is affine in the gold rate:
+    total = slope * rate + intercept
+with slope = weight * (1 + making %) * (1 + GST), times carat / 24 for pieces priced
+from the 24k rate, and intercept = (extra charges + hallmark charges) * (1 + GST).
+Both are computed once per piece. The pieces of one carat and rate basis share a rate,
+so the table is sorted into one contiguous slice per (carat, basis) group: a rate change
+reprices only the groups whose rate moved, at one multiply-add per piece, and reports
+only the pieces whose rounded tag price changed.
+"""
+
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+# Tag prices are rounded (half up) to a multiple of this, in ₹
+TAG_STEP = 1.0
+
+
+class TagChanges(NamedTuple):
+    """
+    The pieces whose tag price changed in one `InventoryRepricer.reprice`.
+
+    - **"sku"**: their ids
+    - **"old_tag"**: their tag prices before (NaN on the first pricing)
+    - **"new_tag"**: their tag prices now
+    - **"groups"**: number of (carat, basis) groups whose rate changed
+    - **"seconds"**: time the update took
+    """
+
+    sku: np.ndarray
+    old_tag: np.ndarray
+    new_tag: np.ndarray
+    groups: int
+    seconds: float
+
+
+def _inventory_column(inventory, name, default, rows, dtype=np.float64):
+    values = inventory[name] if name in inventory else default
+    return np.broadcast_to(np.asarray(values, dtype), (rows,))
+
+
+class InventoryRepricer:
+    """
+    The tag prices of a stock of pieces, kept up to date with the gold rates.
+
+    `inventory` is a table (a dict of arrays or a pandas DataFrame) with the columns
+    sku, weight, carat and making_charge_perc; qty, hm_charges_per_pc, extra_charges
+    and is_24k_rate are optional and default to those of `gold_sell`.
+    """
+
+    def __init__(self, inventory, tag_step=TAG_STEP, calculate_with_tax=True):
+        self.tag_step = tag_step
+        rows = len(np.asarray(inventory["sku"]))
+        carat = _inventory_column(inventory, "carat", 22, rows, np.int64)
+        is_24k_rate = _inventory_column(inventory, "is_24k_rate", False, rows, bool)
+
+        # One contiguous slice per (carat, basis) group
+        key = carat * 2 + is_24k_rate
+        order = np.argsort(key, kind="stable")
+        key = key[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        ends = np.r_[starts[1:], rows]
+        self._groups = [
+            (int(key[start] // 2), bool(key[start] % 2), slice(start, end))
+            for start, end in zip(starts, ends)
+        ]
+
+        def column(name, default, dtype=np.float64):
+            return _inventory_column(inventory, name, default, rows, dtype)[order]
+
+        self.sku = np.asarray(inventory["sku"])[order]
+        self.carat = carat[order]
+        self.is_24k_rate = is_24k_rate[order]
+        weight = column("weight", 1)
+        making_charge_perc = column("making_charge_perc", 14)
+        qty = column("qty", 1)
+        hm_charges_per_pc = column("hm_charges_per_pc", 53)
+        extra_charges = column("extra_charges", 0)
+
+        tax_factor = 1.03 if calculate_with_tax else 1.0
+        rate_factor = np.where(self.is_24k_rate, self.carat / 24, 1.0)
+        self.slope = rate_factor * weight * (1 + making_charge_perc / 100) * tax_factor
+        self.intercept = (extra_charges + hm_charges_per_pc * qty) * tax_factor
+
+        self.price = np.full(rows, np.nan)
+        self.tag = np.full(rows, np.nan)
+        self._rates = [None] * len(self._groups)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sku)
+
+    def reprice(self, rate_for):
+        """
+        Reprice the groups whose rate changed. `rate_for(carat, is_24k_rate)` gives the
+        gold rate per gram of a group. Returns the `TagChanges`.
+        """
+        started = time.perf_counter()
+        moved_rows = []
+        old_tags = []
+        groups = 0
+        with self._lock:
+            for g, (carat, is_24k_rate, rows) in enumerate(self._groups):
+                rate = float(rate_for(carat, is_24k_rate))
+                if rate == self._rates[g]:
+                    continue
+                self._rates[g] = rate
+                groups += 1
+
+                # Evaluated from slope and intercept rather than by adding
+                # slope * Δrate, so many ticks don't accumulate rounding errors
+                price = self.price[rows]
+                np.multiply(self.slope[rows], rate, out=price)
+                price += self.intercept[rows]
+                tag = np.floor(price / self.tag_step + 0.5) * self.tag_step
+
+                # NaN (not priced yet) compares unequal, so a first pricing reports all
+                moved = np.flatnonzero(tag != self.tag[rows])
+                if moved.size:
+                    moved_rows.append(moved + rows.start)
+                    old_tags.append(self.tag[rows][moved])
+                    self.tag[rows] = tag
+
+            moved = np.concatenate(moved_rows) if moved_rows else np.empty(0, int)
+            return TagChanges(
+                self.sku[moved],
+                np.concatenate(old_tags) if old_tags else np.empty(0),
+                self.tag[moved],
+                groups,
+                time.perf_counter() - started,
+            )
+
+    def reprice_with(self, carat_rates):
+        """
+        Reprice from a `CaratRateTable`: pieces priced as per carat at their carat's
+        rate, pieces priced from the 24k rate at the live 24k rate.
+        """
+        return self.reprice(
+            lambda carat, is_24k_rate: carat_rates.rate(24 if is_24k_rate else carat)
+        )
+
+    def on_snapshot(self, snapshot):
+        """
+        Reprice with a `RateSnapshot`'s carat rates, e.g. as a `RatePoller` `on_publish`
+        callback. Returns the `TagChanges`, or None when the snapshot has no gold rates;
+        reporting them is up to the caller.
+        """
+        if snapshot.carat_rates is not None:
+            return self.reprice_with(snapshot.carat_rates)
+
+    def tags(self):
+        """
+        {column: array} of every piece's sku, carat, basis, price and tag price.
+        """
+        with self._lock:
+            return {
+                "sku": self.sku,
+                "carat": self.carat,
+                "is_24k_rate": self.is_24k_rate,
+                "price": self.price.copy(),
+                "tag": self.tag.copy(),
+            }
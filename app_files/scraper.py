@@ -0,0 +1,457 @@
+import re
+import time
+from collections import deque
+
+from selenium import webdriver
+from selenium.common.exceptions import (
+    NoSuchDriverException,
+    SessionNotCreatedException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.wait import WebDriverWait
+
+from app_files.driver_binaries import resolve_binaries
+from app_files.driver_pool import DriverPool, DriverPoolTimeout
+from app_files.rates import LIVE_RATES_URL, ist_timestamp, prefixed_symbol
+
+# Overall seconds to wait for the rates to show up on the page
+READY_TIMEOUT = 10
+# Minimum number of non-empty rates for the page to count as loaded
+READY_MIN_RATES = 2
+# Seconds the rates must stay unchanged before they are read
+READY_SETTLE_TIME = 0.3
+# Seconds between two readiness checks
+READY_POLL_INTERVAL = 0.1
+
+# Time-to-ready (seconds, or None on timeout) of the most recent fetches
+_ready_times = deque(maxlen=200)
+# (time-to-rates in seconds, bytes transferred, browser RSS in bytes) of the most recent fetches
+_fetch_metrics = deque(maxlen=200)
+
+# Resources the rates page doesn't need to show the rates; blocked through DevTools
+BLOCKED_URL_PATTERNS = [
+    # Images, fonts, media and stylesheets
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.svg",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.eot",
+    "*.mp4",
+    "*.webm",
+    "*.mp3",
+    "*.css",
+    # Ads, analytics and social widgets
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*facebook.com/tr*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+]
+# Upper bound of Chrome's disk cache, in bytes
+CHROME_DISK_CACHE_SIZE = 32 * 1024 * 1024
+
+# Bytes transferred for the document and every resource it loaded
+_TRANSFERRED_BYTES_SCRIPT = """
+return performance
+    .getEntriesByType("navigation")
+    .concat(performance.getEntriesByType("resource"))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+_RATE_TEXTS_SCRIPT = """
+return Array.from(
+    document.querySelectorAll("span#GoldSell"),
+    (span) => span.textContent.trim()
+);
+"""
+
+
+# Returns the [symbol, rate, container id] triples of the GoldSymbol/GoldSell spans,
+# where the container is the 4th ancestor of the symbol (the "../../../.." XPath),
+# and the [symbol, rate] pairs of any element with those ids for the direct-ID fallback
+_EXTRACT_RATES_SCRIPT = """
+const text = (el) => (el.innerText || el.textContent || "").trim();
+const ancestor = (el, levels) => {
+    for (let i = 0; i < levels && el; i++) el = el.parentElement;
+    return el;
+};
+const pairs = (symbols, rates) =>
+    Array.from({ length: Math.min(symbols.length, rates.length) }, (_, i) => [
+        symbols[i],
+        rates[i],
+    ]);
+
+const spans = pairs(
+    document.querySelectorAll("span[id='GoldSymbol']"),
+    document.querySelectorAll("span[id='GoldSell']")
+).map(([symbol, rate]) => {
+    const container = ancestor(symbol, 4);
+    return [text(symbol), text(rate), container ? container.id : null];
+});
+const any = pairs(
+    document.querySelectorAll("[id='GoldSymbol']"),
+    document.querySelectorAll("[id='GoldSell']")
+).map(([symbol, rate]) => [text(symbol), text(rate)]);
+
+return { spans: spans, any: any };
+"""
+
+# Simple pattern to find GoldSymbol and GoldSell pairs in HTML
+_RATE_PAIR_PATTERN = re.compile(
+    r'id="GoldSymbol"[^>]*>([^<]+)</span>.*?id="GoldSell"[^>]*>([^<]+)</span>',
+    re.DOTALL,
+)
+
+
+class RatesReady:
+    """
+    Expected condition for `WebDriverWait`: at least `min_rates` non-empty `GoldSell`
+    spans whose values have not changed for `settle_time` seconds.
+
+    Each check reads all the values in one `execute_script` round trip.
+    """
+
+    def __init__(self, min_rates=READY_MIN_RATES, settle_time=READY_SETTLE_TIME):
+        self.min_rates = min_rates
+        self.settle_time = settle_time
+        self._last_values = None
+        self._stable_since = None
+
+    def __call__(self, driver):
+        values = driver.execute_script(_RATE_TEXTS_SCRIPT) or []
+        if sum(1 for value in values if value) < self.min_rates:
+            self._last_values = None
+            return False
+
+        now = time.monotonic()
+        if values != self._last_values:
+            self._last_values = values
+            self._stable_since = now
+            return False
+        return now - self._stable_since >= self.settle_time
+
+
+def wait_for_rates(driver, timeout=READY_TIMEOUT):
+    """
+    Wait until the rates on the page are ready, for at most `timeout` seconds.
+
+    Returns the time-to-ready in seconds, or None if the deadline passed first
+    (the caller still tries to read whatever is on the page).
+    """
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=READY_POLL_INTERVAL).until(
+            RatesReady()
+        )
+        ready_time = time.monotonic() - started
+        print(f"Rates ready after {ready_time * 1000:.0f} ms")
+    except TimeoutException:
+        ready_time = None
+        print(f"Rates not ready within {timeout} seconds, reading them anyway...")
+    _ready_times.append(ready_time)
+    return ready_time
+
+
+def readiness_stats():
+    """
+    Summary of the time-to-ready of recent fetches, to tune the readiness settings.
+    """
+    times = sorted(t for t in _ready_times if t is not None)
+    stats = {"fetches": len(_ready_times), "timeouts": len(_ready_times) - len(times)}
+    if times:
+        stats.update(
+            min_ms=times[0] * 1000,
+            p50_ms=times[len(times) // 2] * 1000,
+            p95_ms=times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+            max_ms=times[-1] * 1000,
+        )
+    return stats
+
+
+def _launch_chrome(binaries, options):
+    if binaries.browser_path:
+        options.binary_location = binaries.browser_path
+    # A Service owns the chromedriver process of one browser and is stopped on quit(),
+    # so each browser gets its own, built from the resolved path
+    return webdriver.Chrome(
+        service=Service(executable_path=binaries.driver_path), options=options
+    )
+
+
+def create_chrome_driver():
+    """
+    Launch a new headless Chrome, used as the factory of the driver pool.
+    """
+    # Setup chrome options
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")  # Often necessary in headless mode
+    # A small viewport is enough to read a few <span>s
+    options.add_argument("--window-size=1024,768")
+
+    # Lean scraping profile: no extensions, background traffic or images, bounded cache
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+    options.add_argument("--metrics-recording-only")
+    options.add_argument("--mute-audio")
+    options.add_argument("--no-first-run")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    # The cache stays in each browser's own temporary profile, so pooled browsers never
+    # share (and lock) one cache directory
+    options.add_argument(f"--disk-cache-size={CHROME_DISK_CACHE_SIZE}")
+    options.add_experimental_option(
+        "prefs", {"profile.managed_default_content_settings.images": 2}
+    )
+    # Return from driver.get() once the DOM is parsed; wait_for_rates() does the rest
+    options.page_load_strategy = "eager"
+
+    # The browser and driver are resolved once per process (and cached on disk), so
+    # launching a browser never waits on Selenium Manager or a driver download
+    binaries = resolve_binaries()
+    try:
+        driver = _launch_chrome(binaries, options)
+    except (SessionNotCreatedException, NoSuchDriverException) as e:
+        # Most likely the browser was upgraded under us: resolve a matching driver once
+        print(f"Could not start Chrome with the cached driver: {e}. Resolving again...")
+        driver = _launch_chrome(resolve_binaries(refresh=True), options)
+
+    # No implicit wait: readiness is checked explicitly by wait_for_rates(), and the
+    # fallback lookups should fail fast instead of waiting for missing elements
+    driver.implicitly_wait(0)
+
+    # Block non-essential requests (images, fonts, CSS, ads, analytics)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"Could not block non-essential requests: {e}")
+    return driver
+
+
+def browser_rss(driver):
+    """
+    Resident memory (bytes) of the chromedriver and all its Chrome processes, or None
+    where /proc is not available.
+    """
+    try:
+        pids = [driver.service.process.pid]
+    except AttributeError:
+        return None
+
+    total = 0
+    seen = set()
+    while pids:
+        pid = pids.pop()
+        if pid in seen:
+            continue
+        seen.add(pid)
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+            with open(f"/proc/{pid}/task/{pid}/children") as f:
+                pids += [int(child) for child in f.read().split()]
+        except (OSError, ValueError):
+            if pid == driver.service.process.pid:
+                return None
+    return total
+
+
+def record_fetch_metrics(driver, time_to_rates):
+    try:
+        transferred = driver.execute_script(_TRANSFERRED_BYTES_SCRIPT)
+    except Exception:
+        transferred = None
+    _fetch_metrics.append((time_to_rates, transferred, browser_rss(driver)))
+
+
+def page_load_stats():
+    """
+    Summary of recent fetches: time-to-rates, bytes transferred and browser memory.
+    """
+    if not _fetch_metrics:
+        return {"fetches": 0}
+    times = sorted(m[0] for m in _fetch_metrics)
+    transferred = [m[1] for m in _fetch_metrics if m[1] is not None]
+    rss = [m[2] for m in _fetch_metrics if m[2] is not None]
+    return {
+        "fetches": len(_fetch_metrics),
+        "p50_time_to_rates_ms": times[len(times) // 2] * 1000,
+        "max_time_to_rates_ms": times[-1] * 1000,
+        "mean_kb_transferred": (
+            sum(transferred) / len(transferred) / 1024 if transferred else None
+        ),
+        "peak_browser_rss_mb": max(rss) / 1024 / 1024 if rss else None,
+    }
+
+
+def create_driver_pool(max_size=2):
+    """
+    Create the pool of warm browsers shared by every session of the app.
+    The browser and driver binaries are resolved here, once, before the first launch.
+    """
+    try:
+        resolve_binaries()
+    except Exception as e:
+        print(f"Could not resolve the Chrome binaries: {e}")
+    return DriverPool(create_chrome_driver, max_size=max_size)
+
+
+def load_live_rates_page(driver, url=LIVE_RATES_URL):
+    """
+    Bring the live rates page up to date in an already running browser.
+    """
+    if driver.current_url.split("#")[0] == url:
+        driver.refresh()
+    else:
+        driver.get(url)
+
+
+def extract_rates(driver, rates):
+    """
+    Read the gold and silver rates off the loaded page into `rates`.
+
+    All symbols, rates and container ids are read in a single `execute_script`
+    round trip; only when that finds nothing is the page source pulled for the regex fallback.
+    """
+    try:
+        # Use a single approach to extract all rates at once
+        # This avoids refreshing the page between gold and silver extraction
+        extracted = driver.execute_script(_EXTRACT_RATES_SCRIPT) or {}
+
+        # Process all rates
+        for symbol_text, rate_text, parent_id in extracted.get("spans", []):
+            # Skip empty entries
+            if not symbol_text or not rate_text:
+                continue
+
+            # Add appropriate prefix for clarity if not already present
+            rates[prefixed_symbol(symbol_text, parent_id)] = rate_text
+
+        # Check if any rates were found besides the timestamp
+        if len(rates) <= 1:
+            # Last resort - direct extraction by ID (already collected by the same script)
+            print(
+                "No rates found with container approach. Trying direct ID extraction..."
+            )
+            for symbol_text, rate_text in extracted.get("any", []):
+                if symbol_text and rate_text:
+                    rates[symbol_text] = rate_text
+
+    except Exception as e:
+        print(f"Error extracting rates: {e}")
+        # Continue to fallback methods
+
+    # If still no rates, try parsing the page source using regex
+    if len(rates) <= 1:
+        try:
+            html_content = driver.page_source
+            matches = _RATE_PAIR_PATTERN.findall(html_content)
+
+            for symbol, rate in matches:
+                if symbol.strip() and rate.strip():
+                    rates[symbol.strip()] = rate.strip()
+
+        except Exception as e:
+            print(f"Error during HTML content extraction: {e}")
+
+    return rates
+
+
+class NoRatesFound(Exception):
+    """
+    Raised when the live rates page loaded but no rates could be read off it.
+    """
+
+
+def classify_failure(exc):
+    """
+    A short failure class of a scraping error, used for the circuit breaker counters.
+    """
+    if isinstance(exc, DriverPoolTimeout):
+        return "pool_busy"  # all browsers busy, the site itself may be fine
+    if isinstance(exc, NoRatesFound):
+        return "no_rates"
+    if isinstance(exc, (SessionNotCreatedException, NoSuchDriverException)):
+        return "driver"
+    if isinstance(exc, TimeoutException):
+        return "timeout"
+    if isinstance(exc, WebDriverException) and "net::ERR" in str(exc):
+        return "network"
+    if isinstance(exc, WebDriverException):
+        return "webdriver"
+    return "other"
+
+
+def get_rates_with_selenium(
+    pool, ready_timeout=READY_TIMEOUT, breaker=None, url=LIVE_RATES_URL
+):
+    """
+    Selenium-based approach to get rates, using a warm browser from `pool`.
+
+    With a `breaker` (a `CircuitBreaker`), no browser is used while the circuit is open,
+    so an outage of the site or a broken chromedriver doesn't cost a browser launch per fetch.
+    """
+    if breaker is not None and not breaker.allow():
+        return {
+            "error": "Scraping is paused after repeated failures, "
+            f"retrying in {breaker.retry_in():.0f} seconds."
+        }
+
+    try:
+        with pool.driver() as driver:
+            started = time.monotonic()
+            # Get the dynamic content from the website
+            load_live_rates_page(driver, url)
+
+            # Get the current time in IST
+            rates = {"timestamp": ist_timestamp()}
+
+            # Unified approach to extract both gold and silver rates at once
+            # Wait for the elements to be properly loaded
+            wait_for_rates(driver, ready_timeout)
+
+            # Collect the rates
+            extract_rates(driver, rates)
+            if len(rates) > 1:
+                record_fetch_metrics(driver, time.monotonic() - started)
+
+        # Checked once the browser is back in the pool: a page without rates yet
+        # is no reason to throw away a healthy browser
+        if len(rates) <= 1:
+            raise NoRatesFound("No rates were found on the live rates page.")
+
+    except Exception as e:
+        if breaker is not None:
+            breaker.record_failure(classify_failure(e))
+        error_message = f"An error occurred during scraping: {e}"
+        print(error_message)  # Log the error for debugging
+        return {"error": error_message}
+
+    if breaker is not None:
+        breaker.record_success()
+    # Return the collected rates
+    return rates
@@ -0,0 +1,207 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Default location of the lease shared by the server processes (ignored by git)
+LEASE_PATH = Path(__file__).resolve().parent.parent / "data" / "fetch_lease.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT,  -- process holding the lease, NULL when free
+    expires_at REAL NOT NULL DEFAULT 0,  -- unix time after which the lease may be taken over
+    result TEXT,  -- JSON of the last result published under the lease
+    finished_at REAL NOT NULL DEFAULT 0  -- unix time the last result was published
+);
+"""
+
+
+class FetchLease:
+    """
+    A lease in SQLite that lets one of several server processes run a fetch while the
+    others wait for the result it publishes.
+
+    A lease expires after `ttl` seconds, so a process that died mid-fetch doesn't block
+    the others for longer than that.
+    """
+
+    def __init__(self, name="live_rates", path=LEASE_PATH, ttl=60):
+        self.name = name
+        self.ttl = ttl
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode, transactions are started explicitly
+        self._conn = sqlite3.connect(
+            str(path), timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO lease (name) VALUES (?)", (self.name,)
+        )
+
+    def acquire(self):
+        """
+        Take the lease if it is free or expired. Returns whether this process holds it.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                taken = self._conn.execute(
+                    "UPDATE lease SET owner = ?, expires_at = ? "
+                    "WHERE name = ? AND (owner IS NULL OR owner = ? OR expires_at < ?)",
+                    (self.owner, now + self.ttl, self.name, self.owner, now),
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return taken == 1
+
+    def release(self, result=None):
+        """
+        Free the lease, publishing `result` (a JSON-serialisable dict) to the waiters.
+        """
+        with self._lock:
+            if result is None:
+                self._conn.execute(
+                    "UPDATE lease SET owner = NULL, expires_at = 0 "
+                    "WHERE name = ? AND owner = ?",
+                    (self.name, self.owner),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE lease SET owner = NULL, expires_at = 0, result = ?, "
+                    "finished_at = ? WHERE name = ? AND owner = ?",
+                    (json.dumps(result), time.time(), self.name, self.owner),
+                )
+
+    def result_since(self, since):
+        """
+        (result, held) - the result published after `since` (unix time) or None, and
+        whether another process currently holds an unexpired lease.
+        """
+        with self._lock:
+            owner, expires_at, result, finished_at = self._conn.execute(
+                "SELECT owner, expires_at, result, finished_at FROM lease WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+        held = owner is not None and owner != self.owner and expires_at >= time.time()
+        if result is not None and finished_at > since:
+            return json.loads(result), held
+        return None, held
+
+
+class _Call:
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls of `fetch`: while one call is in flight, every other
+    caller waits (up to `timeout` seconds) for its result instead of fetching again.
+
+    With a `FetchLease`, the same holds across server processes: the process that gets
+    the lease fetches, the others wait for the result it publishes in the lease.
+    `fetch` returns a rates dict; a caller that gives up waiting gets an "error".
+    """
+
+    def __init__(self, fetch, timeout=30, lease=None, poll_interval=0.2):
+        self._fetch = fetch
+        self.timeout = timeout
+        self.lease = lease
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._call = None
+        self._executed = 0
+        self._coalesced = 0
+        self._coalesced_remote = 0
+        self._timeouts = 0
+
+    def __call__(self):
+        with self._lock:
+            call = self._call
+            leader = call is None
+            if leader:
+                call = self._call = _Call()
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                with self._lock:
+                    self._timeouts += 1
+                return {"error": "Timed out waiting for the rate fetch in flight."}
+            with self._lock:
+                self._coalesced += 1
+            return call.result
+
+        try:
+            call.result = self._run()
+        except Exception as e:
+            call.result = {"error": f"An error occurred while fetching rates: {e}"}
+        finally:
+            with self._lock:
+                self._call = None
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """
+        Fetches executed by this process, and calls answered by a fetch in flight
+        (in this process or, through the lease, in another one).
+        """
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "coalesced_remote": self._coalesced_remote,
+                "timeouts": self._timeouts,
+            }
+
+    def _execute(self):
+        with self._lock:
+            self._executed += 1
+        return self._fetch()
+
+    def _run(self):
+        if self.lease is None:
+            return self._execute()
+
+        started = time.time()
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if self.lease.acquire():
+                rates = None
+                try:
+                    rates = self._execute()
+                    return rates
+                finally:
+                    self.lease.release(
+                        rates if rates and "error" not in rates else None
+                    )
+
+            # Another process is fetching; wait for its result or for the lease to free up
+            while time.monotonic() < deadline:
+                result, held = self.lease.result_since(started)
+                if result is not None:
+                    with self._lock:
+                        self._coalesced_remote += 1
+                    return result
+                if not held:
+                    break  # released without a result, or expired: try to take over
+                time.sleep(self.poll_interval)
+            else:
+                with self._lock:
+                    self._timeouts += 1
+                return {"error": "Timed out waiting for another process's rate fetch."}
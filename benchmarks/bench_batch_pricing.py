@@ -0,0 +1,74 @@
+"""
+Throughput of `gold_sell_batch` against a Python loop over `gold_sell`.
+
+Prices a random inventory (weight, qty, making %, hallmark, extra charges, carat) at one
+gold rate, checks that every row matches the scalar function exactly, and reports rows
+per second. The scalar loop is timed on the first `--loop-rows` rows only.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_batch_pricing
+    python -m benchmarks.bench_batch_pricing --sizes 10000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app_files.calculate import gold_sell
+from app_files.calculate_batch import gold_sell_batch
+
+
+def random_inventory(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "weight": rng.uniform(0.5, 80, rows).round(3),
+        "qty": rng.integers(1, 5, rows),
+        "making_charge_perc": rng.uniform(6, 25, rows).round(2),
+        "hm_charges_per_pc": np.full(rows, 53),
+        "extra_charges": rng.choice([0.0, 250.0, 1200.0], rows),
+        "carat": rng.choice([14, 18, 22, 24], rows),
+    }
+
+
+def scalar_loop(gold_rate, table, rows):
+    columns = [table[name][:rows].tolist() for name in table]
+    return [gold_sell(gold_rate, **dict(zip(table, row))) for row in zip(*columns)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="*", default=[10_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument("--loop-rows", type=int, default=10_000)
+    parser.add_argument("--gold-rate", type=float, default=9150.0)
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        table = random_inventory(rows)
+
+        started = time.perf_counter()
+        columns = gold_sell_batch(args.gold_rate, **table)
+        batch_seconds = time.perf_counter() - started
+
+        loop_rows = min(rows, args.loop_rows)
+        started = time.perf_counter()
+        expected = scalar_loop(args.gold_rate, table, loop_rows)
+        loop_seconds = time.perf_counter() - started
+
+        exact = all(
+            np.array_equal(column[:loop_rows], [row[i] for row in expected])
+            for i, column in enumerate(columns)
+        )
+        print(
+            f"{rows:>11,} rows: batch {batch_seconds * 1000:9.1f} ms "
+            f"({rows / batch_seconds:14,.0f} rows/s) | loop "
+            f"{loop_rows / loop_seconds:10,.0f} rows/s | "
+            f"speed-up {rows / batch_seconds / (loop_rows / loop_seconds):6.0f}x | "
+            f"exact match on {loop_rows:,} rows: {exact}"
+        )
+
+
+if __name__ == "__main__":
+    main()
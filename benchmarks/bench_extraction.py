@@ -0,0 +1,100 @@
+"""
+Compare the single `execute_script` rate extraction with the previous per-element loop.
+
+Both run against a recorded live rates page served locally, in the same warm browser.
+Reports WebDriver round trips (commands sent to the driver) and latency per extraction.
+
+Usage (from the repository root, needs Chrome/Chromium):
+    python -m benchmarks.bench_extraction --iterations 50
+"""
+
+import argparse
+import statistics
+import time
+
+from selenium.webdriver.common.by import By
+
+from app_files.rates import prefixed_symbol
+from app_files.scraper import create_chrome_driver, extract_rates
+from benchmarks.fixture_server import serve_fixtures
+
+
+def extract_rates_per_element(driver, rates):
+    """
+    The previous extraction loop: several WebDriver round trips per rate.
+    """
+    all_symbols = driver.find_elements(By.XPATH, "//span[@id='GoldSymbol']")
+    all_rates = driver.find_elements(By.XPATH, "//span[@id='GoldSell']")
+
+    for i in range(min(len(all_symbols), len(all_rates))):
+        symbol_text = all_symbols[i].text.strip()
+        rate_text = all_rates[i].text.strip()
+        if not symbol_text or not rate_text:
+            continue
+        parent_element = all_symbols[i].find_element(By.XPATH, "../../../..")
+        parent_id = parent_element.get_attribute("id")
+        rates[prefixed_symbol(symbol_text, parent_id)] = rate_text
+    return rates
+
+
+def count_round_trips(driver):
+    """
+    Wrap `driver.execute` (which every WebDriver and WebElement command goes through)
+    and return a one-item list holding the number of commands sent.
+    """
+    counter = [0]
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter[0] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def run(driver, extract, iterations):
+    counter = count_round_trips(driver)
+    latencies = []
+    rates = None
+    for _ in range(iterations):
+        counter[0] = 0
+        started = time.perf_counter()
+        rates = extract(driver, {"timestamp": ""})
+        latencies.append((time.perf_counter() - started) * 1000)
+    del driver.execute  # back to the class method
+    return rates, counter[0], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--page", default="liverate_normal.html")
+    args = parser.parse_args()
+
+    driver = create_chrome_driver()
+    try:
+        with serve_fixtures() as base_url:
+            driver.get(base_url + args.page)
+
+            results = {}
+            for name, extract in (
+                ("per-element loop", extract_rates_per_element),
+                ("execute_script", extract_rates),
+            ):
+                rates, round_trips, latencies = run(driver, extract, args.iterations)
+                results[name] = rates
+                print(
+                    f"{name:>18}: {len(rates) - 1} rates, {round_trips} round trips, "
+                    f"median {statistics.median(latencies):.1f} ms, "
+                    f"max {max(latencies):.1f} ms"
+                )
+
+            same = results["per-element loop"] == results["execute_script"]
+            print(f"Same rates from both approaches: {same}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
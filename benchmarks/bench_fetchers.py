@@ -0,0 +1,206 @@
+"""
+Benchmark the rate fetchers against recorded live rates pages, with saved baselines.
+
+Every page in benchmarks/fixtures/expected.json is served locally and fetched N times by
+each fetcher: plain HTTP, the Selenium scraper and the tiered fetcher the app uses.
+Reports p50/p95/p99 latency, peak Python memory (and browser memory for Selenium) and
+whether the parsed rates match the expected values.
+
+Usage (from the repository root, Selenium runs need Chrome/Chromium):
+    python -m benchmarks.bench_fetchers --iterations 20 --save-baseline main
+    python -m benchmarks.bench_fetchers --iterations 20 --compare main
+
+Exits with status 1 when `--compare` finds a p95 regression or a fixture that is no
+longer parsed correctly.
+"""
+
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from pathlib import Path
+
+from app_files.http_fetcher import get_rates_with_http
+from app_files.rate_fetch import fetch_rates
+from app_files.rate_records import parse_rates
+from app_files.rates import has_rates
+from benchmarks.fixture_server import FIXTURES_DIR, serve_fixtures
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+EXPECTED_PATH = FIXTURES_DIR / "expected.json"
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def is_correct(rates, expected, can_run_js):
+    """
+    Whether `rates` hold exactly the expected values. A fetcher that can't run the
+    page's scripts is correct on a script-filled page when it reports no rates, so
+    the tiered fetcher knows to fall back.
+    """
+    if expected["needs_js"] and not can_run_js:
+        return not has_rates(rates)
+    values = sorted(record.value for record in parse_rates(rates))
+    return values == sorted(expected["values"])
+
+
+def run(fetch, url, expected, can_run_js, iterations):
+    latencies = []
+    correct = True
+    for _ in range(iterations):
+        started = time.perf_counter()
+        rates = fetch(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+        correct = correct and is_correct(rates, expected, can_run_js)
+
+    # One more, untimed, fetch for the memory peak (tracemalloc slows everything down)
+    tracemalloc.start()
+    try:
+        fetch(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "peak_python_kb": peak / 1024,
+        "correct": correct,
+    }
+
+
+def create_pool():
+    """
+    A one-browser pool, or None if no browser can be started here.
+    """
+    try:
+        from app_files.scraper import create_driver_pool
+
+        pool = create_driver_pool(max_size=1)
+        with pool.driver():
+            pass
+        return pool
+    except Exception as e:
+        print(f"Skipping the Selenium fetchers, no browser available: {e}")
+        return None
+
+
+def fetchers(pool):
+    """
+    [(name, fetch(url), can_run_js)] of the fetchers to benchmark.
+    """
+    entries = [("http", get_rates_with_http, False)]
+    if pool is not None:
+        from app_files.scraper import get_rates_with_selenium
+
+        entries.append(
+            ("selenium", lambda url: get_rates_with_selenium(pool, url=url), True)
+        )
+        entries.append(
+            (
+                "tiered",
+                lambda url: fetch_rates(lambda: pool, http_url=url, page_url=url),
+                True,
+            )
+        )
+    return entries
+
+
+def compare(results, baseline, tolerance, min_slack_ms):
+    """
+    Lines describing the regressions of `results` against `baseline`.
+    """
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if before["correct"] and not result["correct"]:
+            regressions.append(f"{key}: rates no longer parsed correctly")
+        allowed = max(
+            before["p95_ms"] * (1 + tolerance), before["p95_ms"] + min_slack_ms
+        )
+        if result["p95_ms"] > allowed:
+            regressions.append(
+                f"{key}: p95 {result['p95_ms']:.1f} ms, baseline {before['p95_ms']:.1f} ms"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--fixtures", nargs="*", help="pages to fetch (default: all)")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed p95 slowdown (fraction)"
+    )
+    parser.add_argument(
+        "--min-slack-ms", type=float, default=2.0, help="p95 slowdown always allowed"
+    )
+    args = parser.parse_args()
+
+    with open(EXPECTED_PATH, encoding="utf-8") as f:
+        expected = json.load(f)
+    pages = args.fixtures or list(expected)
+
+    pool = create_pool()
+    results = {}
+    try:
+        with serve_fixtures() as base_url:
+            print(
+                f"{'fetcher/page':<40} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                f"{'peak KB':>8}  correct"
+            )
+            for name, fetch, can_run_js in fetchers(pool):
+                for page in pages:
+                    key = f"{name}/{page}"
+                    result = run(
+                        fetch,
+                        base_url + page,
+                        expected[page],
+                        can_run_js,
+                        args.iterations,
+                    )
+                    results[key] = result
+                    print(
+                        f"{key:<40} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} "
+                        f"{result['p99_ms']:8.1f} {result['peak_python_kb']:8.0f}  "
+                        f"{'yes' if result['correct'] else 'NO'}"
+                    )
+    finally:
+        if pool is not None:
+            from app_files.scraper import page_load_stats
+
+            print(f"\nBrowser: {page_load_stats()}")
+            pool.close()
+
+    if args.save_baseline:
+        BASELINES_DIR.mkdir(exist_ok=True)
+        path = BASELINES_DIR / f"{args.save_baseline}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline {path}")
+
+    if args.compare:
+        with open(BASELINES_DIR / f"{args.compare}.json", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_slack_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) against baseline {args.compare}")
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
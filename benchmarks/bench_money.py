@@ -0,0 +1,150 @@
+"""
+Compare the integer-paise money engine with the float calculator and a Decimal version.
+
+Prices the same random sales four ways: `gold_sell` on floats, a `decimal.Decimal`
+implementation with the engine's rounding rules, `gold_sell_paise` on ints and
+`gold_sell_paise_batch` on NumPy arrays. Reports sales per second, checks that the
+Decimal and integer totals agree to the paisa, and shows the float grand total.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_money --rows 100000
+"""
+
+import argparse
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+from app_files.calculate import gold_sell
+from app_files.money import gold_sell_paise, gold_sell_paise_batch
+
+PAISA = Decimal("0.01")
+MG = Decimal("0.001")
+HALF_GST = Decimal("0.015")
+
+
+def gold_sell_decimal(
+    gold_rate, qty, weight, making_charge_perc, hm_charges_per_pc, extra_charges, carat
+):
+    """
+    A taxed sale at a per-carat rate in Decimal, rounded like `gold_sell_paise` (half up
+    to the paisa or mg after each step). Returns the same amounts, in rupees and grams.
+    """
+    gold_charges = (gold_rate * weight).quantize(PAISA, ROUND_HALF_UP)
+    making_charges = (gold_charges * making_charge_perc / 100).quantize(
+        PAISA, ROUND_HALF_UP
+    ) + extra_charges
+    hm_charges = hm_charges_per_pc * qty
+    total_before_tax = gold_charges + making_charges + hm_charges
+    half_gst = (total_before_tax * HALF_GST).quantize(PAISA, ROUND_HALF_UP)
+    pure_gold_weight = (weight * carat / 24).quantize(MG, ROUND_HALF_UP)
+    total_recouped_pure_weight = (
+        pure_gold_weight * (1 + making_charge_perc / 100)
+    ).quantize(MG, ROUND_HALF_UP)
+    return (
+        gold_rate,
+        gold_charges,
+        making_charges,
+        hm_charges,
+        half_gst,
+        half_gst,
+        2 * half_gst,
+        total_before_tax,
+        total_before_tax + 2 * half_gst,
+        pure_gold_weight,
+        total_recouped_pure_weight,
+        total_recouped_pure_weight - pure_gold_weight,
+    )
+
+
+def random_sales(rows, seed=0):
+    """
+    Sales in integer units: paise per gram, pieces, mg, ppm, paise, paise, carat.
+    """
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(800_000, 1_000_000, rows),
+        rng.integers(1, 5, rows),
+        rng.integers(500, 80_000, rows),
+        rng.integers(60_000, 250_000, rows),
+        np.full(rows, 5_300),
+        rng.choice([0, 25_000, 120_050], rows),
+        rng.choice([14, 18, 22], rows),
+    )
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    columns = random_sales(args.rows)
+    rate, qty, weight, making_ppm, hm, extra, carat = columns
+    int_rows = list(zip(*(column.tolist() for column in columns)))
+
+    float_amounts, float_seconds = timed(
+        lambda: [
+            gold_sell(r / 100, q, w / 1000, m / 10_000, h / 100, e / 100, True, c)
+            for r, q, w, m, h, e, c in int_rows
+        ]
+    )
+    decimal_rows = [
+        (
+            Decimal(r) / 100,
+            q,
+            Decimal(w) / 1000,
+            Decimal(m) / 10_000,
+            Decimal(h) / 100,
+            Decimal(e) / 100,
+            c,
+        )
+        for r, q, w, m, h, e, c in int_rows
+    ]
+    decimal_amounts, decimal_seconds = timed(
+        lambda: [gold_sell_decimal(*row) for row in decimal_rows]
+    )
+    int_amounts, int_seconds = timed(
+        lambda: [
+            gold_sell_paise(r, q, w, m, h, e, True, c)
+            for r, q, w, m, h, e, c in int_rows
+        ]
+    )
+    batch, batch_seconds = timed(
+        lambda: gold_sell_paise_batch(
+            rate, qty, weight, making_ppm, hm, extra, True, carat
+        )
+    )
+
+    for name, seconds in (
+        ("float gold_sell", float_seconds),
+        ("Decimal", decimal_seconds),
+        ("int gold_sell_paise", int_seconds),
+        ("int64 batch", batch_seconds),
+    ):
+        print(f"{name:>20}: {args.rows / seconds:14,.0f} sales/s")
+
+    # Decimal amounts in rupees and grams, in paise and mg like the integer ones
+    scales = [100] * 9 + [1000] * 3
+    agree = (
+        [
+            tuple(int(amount * scale) for amount, scale in zip(amounts, scales))
+            for amounts in decimal_amounts
+        ]
+        == int_amounts
+        == list(zip(*(column.tolist() for column in batch)))
+    )
+    exact_total = sum(amounts.total_price for amounts in int_amounts)
+    print(f"\nDecimal, int and batch amounts agree to the paisa/mg: {agree}")
+    print(f"Grand total, exact: ₹ {exact_total // 100:,}.{exact_total % 100:02d}")
+    print(f"Grand total, float: ₹ {sum(amounts[6] for amounts in float_amounts):,.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Latency of repricing tagged stock on every rate tick, incrementally and in full.
+
+Prices a random inventory (100,000 pieces by default) with `InventoryRepricer`, then
+moves the 24k rate in a random walk. Each tick builds the carat rate table and reprices
+the stock twice: incrementally (only the groups whose rate moved, reporting only the
+changed tags) and in full with `gold_sell_batch`. Reports the per-tick latency of both
+and checks that the tags agree.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_repricing --skus 100000 --ticks 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app_files.calculate_batch import gold_sell_batch
+from app_files.carat_rates import build_carat_rates
+from app_files.repricing import InventoryRepricer
+from benchmarks.bench_batch_pricing import random_inventory
+
+
+def percentiles(seconds):
+    p50, p95, p99 = np.percentile(np.asarray(seconds) * 1000, [50, 95, 99])
+    return f"p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms"
+
+
+def full_reprice(table, carat_rates, tag_step):
+    gold_rate = np.where(
+        table["is_24k_rate"],
+        carat_rates.rate(24),
+        np.asarray(carat_rates.per_gram)[table["carat"]],
+    )
+    columns = {name: values for name, values in table.items() if name != "sku"}
+    total_price = gold_sell_batch(gold_rate, **columns).total_price
+    return np.floor(total_price / tag_step + 0.5) * tag_step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=75_000.0, help="24k per 10 g")
+    parser.add_argument("--tag-step", type=float, default=1.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    table = random_inventory(args.skus)
+    table["sku"] = np.arange(args.skus)
+    table["is_24k_rate"] = rng.random(args.skus) < 0.2
+
+    started = time.perf_counter()
+    repricer = InventoryRepricer(table, args.tag_step)
+    repricer.reprice_with(build_carat_rates(args.rate))
+    groups = np.unique(table["carat"] * 2 + table["is_24k_rate"]).size
+    print(
+        f"Built and priced {args.skus:,} pieces in "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms ({groups} carat/basis groups)"
+    )
+
+    incremental, full, changed, groups = [], [], [], []
+    rate = args.rate
+    tags = full_reprice(table, build_carat_rates(rate), args.tag_step)
+    for _ in range(args.ticks):
+        rate = round(rate + rng.normal(0, 15), 2)
+        carat_rates = build_carat_rates(rate)
+
+        changes = repricer.reprice_with(carat_rates)
+        incremental.append(changes.seconds)
+        changed.append(len(changes.sku))
+        groups.append(changes.groups)
+
+        started = time.perf_counter()
+        new_tags = full_reprice(table, carat_rates, args.tag_step)
+        np.flatnonzero(new_tags != tags)
+        full.append(time.perf_counter() - started)
+        tags = new_tags
+
+    # The repricer keeps the pieces sorted by group; compare by sku
+    current = repricer.tags()
+    by_sku = np.empty(args.skus)
+    by_sku[current["sku"]] = current["tag"]
+    mismatches = np.count_nonzero(by_sku != tags)
+
+    print(f"\n{args.ticks} ticks of the 24k rate:")
+    print(f" incremental: {percentiles(incremental)}")
+    print(f"        full: {percentiles(full)}")
+    print(
+        f"Per tick: {np.mean(groups):.1f} groups repriced, "
+        f"{np.mean(changed):,.0f} tags changed on average"
+    )
+    print(f"Tags differing from a full repricing: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
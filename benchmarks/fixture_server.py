@@ -0,0 +1,29 @@
+import http.server
+import threading
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_fixtures(directory=FIXTURES_DIR):
+    """
+    Serve the recorded pages in `directory` on a free local port for the duration
+    of the `with` block. Yields the base URL, e.g. "http://127.0.0.1:54321/".
+    """
+    handler = partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,88 @@
+"""
+Import-time profile of the app's startup path, checked against a budget.
+
+Runs a fresh interpreter with `python -X importtime`, imports the `--preload` modules
+(Streamlit, which the server has loaded before any page runs) and then the app modules,
+and reports what the app modules add, per module, in ms.
+
+Usage (from the repository root):
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --budget-ms 150 --top 20 app_files.live_rates
+
+Exits with status 1 when the app modules take longer than the budget.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Modules imported when a page runs, on top of Streamlit
+STARTUP_MODULES = ["app_files.live_rates", "app_files.breakdowns"]
+# Milliseconds the startup modules may add to a cold start
+STARTUP_BUDGET_MS = 100
+
+
+def profile_imports(modules, preload=("streamlit",)):
+    """
+    Import `modules` in a fresh interpreter after `preload` and return
+    [(module, self_ms, cumulative_ms, depth)] for everything the modules imported,
+    in import order.
+    """
+    code = "; ".join(
+        [f"import {name}" for name in preload]
+        + ["import sys", "sys.stderr.write('--app--\\n')"]
+        + [f"import {name}" for name in modules]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    entries = []
+    after_preload = False
+    for line in result.stderr.splitlines():
+        if line == "--app--":
+            after_preload = True
+            continue
+        if not after_preload or not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append(
+            (name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth)
+        )
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=STARTUP_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--preload", nargs="*", default=["streamlit"])
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args()
+
+    entries = profile_imports(args.modules, args.preload)
+    # Top-level entries hold the cumulative time of everything below them
+    total_ms = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+
+    print(f"{'self ms':>9} {'cumul. ms':>10}  module")
+    for name, self_ms, cumulative_ms, depth in sorted(
+        entries, key=lambda entry: entry[1], reverse=True
+    )[: args.top]:
+        print(f"{self_ms:9.1f} {cumulative_ms:10.1f}  {name}")
+
+    within_budget = total_ms <= args.budget_ms
+    print(
+        f"\nTotal: {total_ms:.1f} ms for {', '.join(args.modules)} "
+        f"(budget {args.budget_ms:.0f} ms) - {'OK' if within_budget else 'OVER BUDGET'}"
+    )
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
 import streamlit as st
-from app_files.calculate import gold_sell
+from app_files.live_rates import (
+    check_rates_freshness,
+    default_gold_rates,
+    sync_live_rates,
+)
+from app_files.breakdowns import gold_sell_breakdown, gold_sell_what_if
+from app_files.invoice import Invoice, InvoiceItem, format_mg, format_paise
 
 st.title("Gold Buy Calculator")
 
@@ -29,6 +35,9 @@ if "user_modified_gold_rate" not in st.session_state:
 if "calculate_with_tax" not in st.session_state:
     st.session_state.calculate_with_tax = True
 
+# Pick up the latest live rates shared by all sessions
+sync_live_rates()
+
 
 # Input fields
 with st.container():
@@ -57,19 +66,8 @@ with st.container():
         )
         st.session_state.is_24k_rate = is_24k_rate
 
-        # Initialize the default rates
-        default_carat_rate = 9000.00
-        default_24k_rate = 9818.18  # Approximate 24k equivalent
-
-        # Update rates if we have external gold rate data available
-        if "gold_rate_916" in st.session_state:
-            default_carat_rate = float(st.session_state["gold_rate_916"] / 10)
-            default_24k_rate = float((st.session_state["gold_rate_916"] / 10) / 22 * 24)
-        elif "current_gold_rate_per_gram" in st.session_state:
-            default_carat_rate = float(
-                round((st.session_state["current_gold_rate_per_gram"] / 24.0) * carat)
-            )
-            default_24k_rate = float(st.session_state["current_gold_rate_per_gram"])
+        # The live rates for this carat, looked up in the carat rate table
+        default_carat_rate, default_24k_rate = default_gold_rates(carat)
 
         # Keep gold rate synchronized with live defaults unless the user overrides it manually
         if not st.session_state.user_modified_gold_rate:
@@ -115,6 +113,7 @@ with st.container():
 
         weight = st.number_input(
             "Enter the weight of each item (grams)",
+            min_value=0.0,
             value=st.session_state.gold_weight,
             step=0.001,
             format="%.3f",
@@ -124,6 +123,7 @@ with st.container():
 
         making_charge_perc = st.number_input(
             "Making charge percentage",
+            min_value=0.0,
             value=st.session_state.making_charge_perc,
             step=0.001,
             format="%.3f",
@@ -160,8 +160,21 @@ with st.container():
     # Results section in the second column
     with col2:
         st.subheader("Results")
+        # Warn about stale live rates, refuse to bill on expired ones
+        check_rates_freshness()
 
-        # Perform calculation with current values
+        # Perform calculation with current values (memoized, with the texts to display)
+        results, texts = gold_sell_breakdown(
+            gold_rate,
+            qty,
+            weight,
+            making_charge_perc,
+            hm_charges_per_pc,
+            extra_charges,
+            calculate_with_tax,  # Pass the tax toggle value
+            carat,
+            is_24k_rate,  # is_22k is opposite of is_24k_rate
+        )
         (
             hm_rate,
             gold_charges,
@@ -173,17 +186,7 @@ with st.container():
             pure_gold_weight,
             total_recouped_pure_weight,
             making_charge_wt_pure,
-        ) = gold_sell(
-            gold_rate,
-            qty,
-            weight,
-            making_charge_perc,
-            hm_charges_per_pc,
-            extra_charges,
-            calculate_with_tax,  # Pass the tax toggle value
-            carat,
-            is_24k_rate,  # is_22k is opposite of is_24k_rate
-        )
+        ) = results
 
         # Update session state with calculated values
         st.session_state.total_before_tax = total_before_tax
@@ -195,46 +198,43 @@ with st.container():
         col1_disp, col2_disp = st.columns([1, 1], gap="small")
         with st.container():
             with col1_disp:
-                st.markdown(f""":orange[₹**{gold_charges:,.2f}**]""")
+                st.markdown(texts["gold_charges"])
             with col2_disp:
-                st.markdown(f"""(₹**{hm_rate:,.2f}/gm.**)""")
+                st.markdown(texts["hm_rate"])
 
         st.write("Making charges:")
         col1_disp, col2_disp = st.columns([1, 1], gap="small")
         with st.container():
             with col1_disp:
-                st.markdown(f""":green[₹ **{making_charges:,.2f}**]""")
+                st.markdown(texts["making_charges"])
             with col2_disp:
-                st.markdown(f"""**(₹{making_charges/weight:,.2f}/gm.)**""")
+                st.markdown(texts["making_charges_per_gm"])
             if extra_charges:
-                st.caption(
-                    f"Making Charges: ₹{(making_charges-extra_charges):,.2f} \
-                    + Extra charges: ₹{extra_charges:,.2f}"
-                )
+                st.caption(texts["making_and_extra"])
 
         st.write("Hallmark Charges")
         col1_disp, col2_disp = st.columns([1, 1], gap="small")
         with st.container():
             with col1_disp:
-                st.markdown(f":green[₹**{hm_charges:,.2f}**]")
+                st.markdown(texts["hm_charges"])
             with col2_disp:
-                st.markdown(f"""**(₹{hm_charges_per_pc}/pc.)**""")
+                st.markdown(texts["hm_charges_per_pc"])
         if calculate_with_tax:
-            st.caption(f"Total before tax: ₹{total_before_tax:,.2f}")
+            st.caption(texts["total_before_tax"])
             st.write("Tax (GST):")
             col1_disp, col2_disp = st.columns([1, 1], gap="small")
             with st.container():
                 with col1_disp:
-                    st.markdown(f""":green[₹ **{tax:,.2f}**]""")
+                    st.markdown(texts["tax"])
                 with col2_disp:
                     st.markdown("""**(3%)**""")
-                st.caption(f"SGST: ₹{tax/2:,.2f} + CGST: ₹{tax/2:,.2f}")
+                st.caption(texts["gst_split"])
         else:
             st.write("Tax (GST):")
             st.markdown(":green[₹ **0.00**] (Tax calculation disabled)")
 
         st.markdown("### Total Price:")
-        st.markdown(f"""## :green[₹ **{total_price:,.2f}**]""")
+        st.markdown(texts["total_price"])
 
     with st.expander("**Show Detailed Info. ℹ️**"):
         col1, col2 = st.columns([1, 1], gap="small")
@@ -242,9 +242,7 @@ with st.container():
             st.markdown("- **:orange[Gold Charges]**:")
         with col2:
             st.markdown("The price of the gold in the ornament as per Carat.")
-            st.caption(
-                f"Here we have used **{carat} Carat** gold, whose price is **₹{hm_rate:,.2f}** per gram."
-            )
+            st.caption(texts["gold_charges_info"])
 
         col1, col2 = st.columns([1, 1], gap="small")
         with col1:
@@ -256,9 +254,7 @@ with st.container():
             st.caption(
                 "Extra charges are the charges levied on the ornament for adding extra features like stones, conch bangles etc."
             )
-            st.caption(
-                f"Here we have used **{making_charge_perc:.3f}%** making charges, which is **₹{making_charges:,.2f}** and extra charges of **₹{extra_charges:,.2f}**."
-            )
+            st.caption(texts["making_charges_info"])
 
         col1, col2 = st.columns([1, 1], gap="small")
         with col1:
@@ -267,9 +263,7 @@ with st.container():
             st.markdown(
                 "The price of testing the purity of the ornament and assigning a unique ID (HUID) to the ornament."
             )
-            st.caption(
-                f"The standard hallmark charges are **₹{hm_charges_per_pc}/pc.**"
-            )
+            st.caption(texts["hm_charges_info"])
 
         col1, col2 = st.columns([1, 1], gap="small")
         with col1:
@@ -280,9 +274,7 @@ with st.container():
                     "State Goods and Services Tax (SGST) & Central Goods and Services Tax (CGST). This tax is levied on **:orange[Gold Charges]** + **:green[Making Charges]** + **:green[Hallmark Charges]**."
                 )
                 st.caption("The standard GST rate is **3%**. (1.5% SGST + 1.5% CGST)")
-                st.caption(
-                    f"Here we have used **1.5%** SGST {tax/2:,.2f} + **1.5%** CGST {tax/2:,.2f} = **₹{tax:,.2f}**."
-                )
+                st.caption(texts["tax_info"])
             else:
                 st.markdown("Tax calculation is currently disabled.")
                 st.caption("No GST is being applied to this calculation.")
@@ -299,6 +291,267 @@ with st.container():
             st.markdown("- **:green[Pure Gold Weight Recouped]**:")
         with col2:
             # Add pure weight calculation information
-            st.markdown(
-                f"**Pure Wt.** ({pure_gold_weight:.4f} gm.) + **Excess Pure M.C. Wt.** ({making_charge_wt_pure:.4f} gm.) = **Total Recouped Pure Wt.** ({total_recouped_pure_weight:.4f} gm.)"
+            st.markdown(texts["pure_weight_info"])
+
+# What-if grid: the total price over two inputs at once, from one vectorized calculation
+with st.expander("**What if? 🔍**"):
+    what_if = st.radio(
+        "Vary",
+        ["Gold rate × Making charge %", "Weight × Carat"],
+        horizontal=True,
+        key="what_if_axes",
+    )
+    cells = st.slider(
+        "Values per axis", min_value=3, max_value=100, value=11, key="what_if_cells"
+    )
+    # Offsets around the current value: -n..+n steps
+    offsets = [i - (cells - 1) // 2 for i in range(cells)]
+
+    inputs = dict(
+        gold_rate=gold_rate,
+        qty=qty,
+        weight=weight,
+        making_charge_perc=making_charge_perc,
+        hm_charges_per_pc=hm_charges_per_pc,
+        extra_charges=extra_charges,
+        calculate_with_tax=calculate_with_tax,
+        carat=carat,
+        is_24k_rate=is_24k_rate,
+    )
+    if what_if == "Gold rate × Making charge %":
+        col1, col2 = st.columns(2)
+        with col1:
+            rate_step = st.number_input(
+                "Gold rate step (₹/gm.)", min_value=0.01, value=10.0, key="what_if_rate"
             )
+        with col2:
+            making_step = st.number_input(
+                "Making charge step (%)",
+                min_value=0.001,
+                value=0.5,
+                format="%.3f",
+                key="what_if_making",
+            )
+        row_name, row_values = "gold_rate", [
+            rate
+            for rate in (round(gold_rate + i * rate_step, 2) for i in offsets)
+            if rate > 0
+        ]
+        # No making charge (e.g. on coins) is a real price, a negative one isn't
+        column_name, column_values = "making_charge_perc", [
+            perc
+            for perc in (
+                round(making_charge_perc + i * making_step, 3) for i in offsets
+            )
+            if perc >= 0
+        ]
+        row_label, column_label = "Gold rate (₹/gm.)", "Making charge (%)"
+    else:
+        weight_step = st.number_input(
+            "Weight step (grams)",
+            min_value=0.001,
+            value=0.5,
+            format="%.3f",
+            key="what_if_weight",
+        )
+        carats = st.multiselect(
+            "Carats",
+            list(range(1, 25)),
+            default=[14, 18, 20, 22, 24],
+            key="what_if_carats",
+        )
+        row_name, row_values = "weight", [
+            round(weight + i * weight_step, 3)
+            for i in offsets
+            if weight + i * weight_step > 0
+        ]
+        column_name, column_values = "carat", sorted(carats)
+        row_label, column_label = "Weight (grams)", "Carat"
+        # The purity changes across the grid, so price it from the 24k rate
+        if not is_24k_rate:
+            inputs.update(gold_rate=gold_rate / (carat / 24), is_24k_rate=True)
+
+    if row_values and column_values:
+        totals = gold_sell_what_if(
+            row_name, row_values, column_name, column_values, **inputs
+        )
+        st.caption(
+            f"Total price (₹) for {len(row_values)} × {len(column_values)} combinations; "
+            f"the current price is ₹{total_price:,.2f}."
+        )
+        if st.toggle("Show as heatmap", value=True, key="what_if_heatmap"):
+            import altair as alt
+
+            grid = totals.stack().rename("total_price").reset_index()
+            st.altair_chart(
+                alt.Chart(grid)
+                .mark_rect()
+                .encode(
+                    x=alt.X(
+                        f"{column_name}:O",
+                        title=column_label,
+                        axis=alt.Axis(format=",.3~f"),
+                    ),
+                    y=alt.Y(
+                        f"{row_name}:O",
+                        title=row_label,
+                        sort="descending",
+                        axis=alt.Axis(format=",.3~f"),
+                    ),
+                    color=alt.Color("total_price:Q", title="Total (₹)"),
+                    tooltip=[
+                        alt.Tooltip(f"{row_name}:Q", title=row_label, format=",.3~f"),
+                        alt.Tooltip(
+                            f"{column_name}:Q", title=column_label, format=",.3~f"
+                        ),
+                        alt.Tooltip("total_price:Q", title="Total (₹)", format=",.2f"),
+                    ],
+                ),
+                use_container_width=True,
+            )
+        else:
+            st.dataframe(
+                totals.rename_axis(index=row_label, columns=column_label).style.format(
+                    "{:,.2f}"
+                ),
+                use_container_width=True,
+            )
+
+# Invoice: several items on one bill, with totals kept up to date line by line
+if "invoice" not in st.session_state:
+    st.session_state.invoice = Invoice()
+
+
+def add_invoice_line(item):
+    st.session_state.invoice.add(
+        item._replace(description=st.session_state.invoice_description)
+    )
+    st.session_state.invoice_description = ""
+
+
+def update_invoice_line(line_id):
+    st.session_state.invoice.update(
+        line_id,
+        description=st.session_state[f"invoice_{line_id}_description"],
+        qty=st.session_state[f"invoice_{line_id}_qty"],
+        weight=st.session_state[f"invoice_{line_id}_weight"],
+        making_charge_perc=st.session_state[f"invoice_{line_id}_making"],
+        extra_charges=st.session_state[f"invoice_{line_id}_extra"],
+    )
+
+
+@st.fragment
+def invoice_section(item, calculate_with_tax):
+    """
+    Reruns on its own when the invoice is edited, without the calculator above.
+    Every line's row was formatted when it was added or last edited.
+    """
+    invoice = st.session_state.invoice
+    invoice.calculate_with_tax = calculate_with_tax
+
+    st.subheader("Invoice 🧾")
+    with st.form("invoice_add", border=False):
+        st.text_input(
+            "Description of the item above (e.g. chain, ring, bangle)",
+            key="invoice_description",
+        )
+        st.form_submit_button(
+            "Add to invoice ➕", on_click=add_invoice_line, args=(item,)
+        )
+
+    for line_id, line in list(invoice.lines.items()):
+        with st.container(border=True):
+            col1, col2, col3 = st.columns([4, 2, 1], gap="small")
+            with col1:
+                st.markdown(line.texts["description"])
+                st.caption(line.texts["details"])
+            with col2:
+                st.markdown(line.texts["amount"])
+                st.caption(line.texts["breakdown"])
+            with col3:
+                with st.popover("✏️", use_container_width=True):
+                    with st.form(f"invoice_{line_id}_edit", border=False):
+                        st.text_input(
+                            "Description",
+                            value=line.item.description,
+                            key=f"invoice_{line_id}_description",
+                        )
+                        st.number_input(
+                            "Quantity",
+                            min_value=1,
+                            step=1,
+                            value=line.item.qty,
+                            key=f"invoice_{line_id}_qty",
+                        )
+                        st.number_input(
+                            "Weight (grams)",
+                            min_value=0.0,
+                            value=line.item.weight,
+                            step=0.001,
+                            format="%.3f",
+                            key=f"invoice_{line_id}_weight",
+                        )
+                        st.number_input(
+                            "Making charge percentage",
+                            min_value=0.0,
+                            value=line.item.making_charge_perc,
+                            step=0.001,
+                            format="%.3f",
+                            key=f"invoice_{line_id}_making",
+                        )
+                        st.number_input(
+                            "Extra charges",
+                            value=float(line.item.extra_charges),
+                            key=f"invoice_{line_id}_extra",
+                        )
+                        st.form_submit_button(
+                            "Update", on_click=update_invoice_line, args=(line_id,)
+                        )
+                st.button(
+                    "🗑️",
+                    key=f"invoice_{line_id}_remove",
+                    on_click=invoice.remove,
+                    args=(line_id,),
+                    use_container_width=True,
+                )
+
+    if not invoice.lines:
+        st.caption("No items yet. Add the item priced above to start a bill.")
+        return
+
+    totals = invoice.totals()
+    col1, col2, col3 = st.columns(3, gap="small")
+    with col1:
+        st.write(f"Items: **{totals.lines}** ({totals.pieces} pc.)")
+        st.write(f"Weight: **{format_mg(totals.weight)}**")
+        st.write(f"Pure Wt.: **{format_mg(totals.pure_gold_weight)}**")
+        st.caption(
+            f"Total Recouped Pure Wt.: {format_mg(totals.total_recouped_pure_weight)}"
+        )
+    with col2:
+        st.write(f"Total before tax: **{format_paise(totals.total_before_tax)}**")
+        if calculate_with_tax:
+            st.write(f"SGST (1.5%): **{format_paise(totals.sgst)}**")
+            st.write(f"CGST (1.5%): **{format_paise(totals.cgst)}**")
+        else:
+            st.caption("No GST is being applied to this invoice.")
+    with col3:
+        st.markdown("### Invoice Total:")
+        st.markdown(f"## :green[**{format_paise(totals.total_price)}**]")
+    st.button("Clear invoice", on_click=invoice.clear, key="invoice_clear")
+
+
+invoice_section(
+    InvoiceItem(
+        "",
+        gold_rate,
+        qty,
+        weight,
+        making_charge_perc,
+        hm_charges_per_pc,
+        extra_charges,
+        carat,
+        is_24k_rate,
+    ),
+    calculate_with_tax,
+)
@@ -1,5 +1,10 @@
 import streamlit as st
-from app_files.calculate import gold_making_charges
+from app_files.live_rates import (
+    check_rates_freshness,
+    default_gold_rates,
+    sync_live_rates,
+)
+from app_files.breakdowns import making_charges_breakdown
 
 st.title("Making Charge Calculator")
 
@@ -25,32 +30,19 @@ if "is_24k_rate" not in st.session_state:
 if "calculate_with_tax" not in st.session_state:
     st.session_state.calculate_with_tax = True
 
+# Pick up the latest live rates shared by all sessions
+sync_live_rates()
+
 col1, col2 = st.columns([2, 1], gap="large")
 
-# Initialize the default rates for 22k and 24k
-default_22k_rate = 9000.00
-default_24k_rate = 9818.18  # Approximate 24k equivalent
-
-# Update rates if we have the 916 gold rate available
-if "gold_rate_916" in st.session_state:
-    # Use the 916 (22k) gold rate directly for 22k
-    default_22k_rate = float(
-        st.session_state["gold_rate_916"] / 10
-    )  # Convert from 100g to per gram
-    # Calculate 24k rate: (916 rate / 22 * 24)
-    default_24k_rate = float((st.session_state["gold_rate_916"] / 10) / 22 * 24)
-elif "current_gold_rate_per_gram" in st.session_state:
-    # Fallback to the old calculation method
-    default_22k_rate = float(
-        round((st.session_state["current_gold_rate_per_gram"] / 24.0) * 22.0)
-    )
-    default_24k_rate = float(st.session_state["current_gold_rate_per_gram"])
+# The live rates for the selected carat, looked up in the carat rate table
+default_carat_rate, default_24k_rate = default_gold_rates(st.session_state.carat)
 
 # Only update the session state rate if this is the first page load
 # or if the user hasn't manually changed the rate
 if "user_modified_gold_rate" not in st.session_state:
     if not st.session_state.is_24k_rate:  # Using carat-specific rate
-        st.session_state.gold_rate = default_22k_rate
+        st.session_state.gold_rate = default_carat_rate
     else:  # Using 24k rate
         st.session_state.gold_rate = default_24k_rate
 
@@ -80,15 +72,7 @@ with col1:
         if is_24k_rate:
             st.session_state.gold_rate = default_24k_rate
         else:
-            # Calculate carat-specific rate
-            if "current_gold_rate_per_gram" in st.session_state:
-                st.session_state.gold_rate = float(
-                    round(
-                        (st.session_state["current_gold_rate_per_gram"] / 24.0) * carat
-                    )
-                )
-            else:
-                st.session_state.gold_rate = default_22k_rate
+            st.session_state.gold_rate = default_carat_rate
 
     def update_gold_rate():
         st.session_state.gold_rate = st.session_state.gold_rate_mc
@@ -175,8 +159,11 @@ with col1:
 # Results
 with col2:
     st.subheader("Results:")
+    # Warn about stale live rates, refuse to bill on expired ones
+    check_rates_freshness()
 
-    making_charge_perc, making_charges = gold_making_charges(
+    # Memoized, with the texts to display
+    (making_charge_perc, making_charges), texts = making_charges_breakdown(
         gold_rate,
         gold_weight,
         total_price,
@@ -195,6 +182,6 @@ with col2:
     st.session_state.calculated_making_charges = making_charges
 
     st.write("Making Charge Percentage:")
-    st.markdown(f"## :green[**{making_charge_perc:.3f}%**]")
+    st.markdown(texts["making_charge_perc"])
     st.write("Making Charge INR:")
-    st.markdown(f"""## :green[₹ **{making_charges:,.2f}**]""")
+    st.markdown(texts["making_charges"])
@@ -1,5 +1,10 @@
 import streamlit as st
-from app_files.calculate import cost_price_gold
+from app_files.live_rates import (
+    check_rates_freshness,
+    default_gold_rates,
+    sync_live_rates,
+)
+from app_files.breakdowns import cost_price_breakdown
 
 st.title("Cost Price Calculator")
 
@@ -15,26 +20,13 @@ if "is_24k_rate" not in st.session_state:
 if "carat" not in st.session_state:
     st.session_state.carat = 22
 
+# Pick up the latest live rates shared by all sessions
+sync_live_rates()
+
 col1, col2 = st.columns([1, 1], gap="large")
 
-# Initialize the default rates for 22k and 24k
-default_22k_rate = 9000.00
-default_24k_rate = 9818.18  # Approximate 24k equivalent
-
-# Update rates if we have the 916 gold rate available
-if "gold_rate_916" in st.session_state:
-    # Use the 916 (22k) gold rate directly for 22k
-    default_22k_rate = float(
-        st.session_state["gold_rate_916"] / 10
-    )  # Convert from 100g to per gram
-    # Calculate 24k rate: (916 rate / 22 * 24)
-    default_24k_rate = float((st.session_state["gold_rate_916"] / 10) / 22 * 24)
-elif "current_gold_rate_per_gram" in st.session_state:
-    # Fallback to the old calculation method
-    default_22k_rate = float(
-        round((st.session_state["current_gold_rate_per_gram"] / 24.0) * 22.0)
-    )
-    default_24k_rate = float(st.session_state["current_gold_rate_per_gram"])
+# The live rates for the selected carat, looked up in the carat rate table
+default_carat_rate, default_24k_rate = default_gold_rates(st.session_state.carat)
 
 with st.container():
     with col1:
@@ -70,16 +62,7 @@ with st.container():
                 if is_24k_rate:
                     st.session_state.gold_rate = default_24k_rate
                 else:
-                    # Calculate carat-specific rate
-                    if "current_gold_rate_per_gram" in st.session_state:
-                        st.session_state.gold_rate = float(
-                            round(
-                                (st.session_state["current_gold_rate_per_gram"] / 24.0)
-                                * carat
-                            )
-                        )
-                    else:
-                        st.session_state.gold_rate = default_22k_rate
+                    st.session_state.gold_rate = default_carat_rate
 
         def update_gold_rate():
             st.session_state.gold_rate = st.session_state.gold_rate_cp
@@ -140,14 +123,10 @@ with st.container():
 
     with col2:
         st.subheader("Results")
-        (
-            total_pure_wt,
-            total_payable_wt,
-            goldsmith_loss_wt,
-            goldsmith_loss_wt_24k_price,
-            breakeven_making_perc,
-            cp_total,
-        ) = cost_price_gold(
+        # Warn about stale live rates, refuse to bill on expired ones
+        check_rates_freshness()
+        # Memoized, with the texts to display
+        _, texts = cost_price_breakdown(
             gold_rate,
             goldsmith_loss_perc,
             baseline,
@@ -160,23 +139,113 @@ with st.container():
         col1, col2 = st.columns([1, 1], gap="small")
         with col1:
             st.write("Pure Weight:")
-            st.markdown(f":green[**{total_pure_wt:,.4f} gm.**]")
+            st.markdown(texts["total_pure_wt"])
         with col2:
             st.write("Goldsmith Loss Wt.:")
-            st.markdown(f":green[**{goldsmith_loss_wt:,.4f} gm.**]")
+            st.markdown(texts["goldsmith_loss_wt"])
 
         st.write("### Total Payable Wt.:")
-        st.markdown(f"## :orange[**{total_payable_wt:,.4f} gm.**]")
+        st.markdown(texts["total_payable_wt"])
         col1, col2 = st.columns([1, 1], gap="small")
         with col1:
             st.write("Excess Wt. (Actual Making Charges):")
-            st.markdown(f":green[**{goldsmith_loss_wt:,.4f} gm.**]")
+            st.markdown(texts["goldsmith_loss_wt"])
         with col2:
             st.write("Excess Wt. Price:")
-            st.markdown(f":green[**₹ {goldsmith_loss_wt_24k_price:,.2f}**]")
+            st.markdown(texts["goldsmith_loss_wt_24k_price"])
 
         st.write("Breakeven Making Charges (%):")
-        st.markdown(f"### :orange[**{breakeven_making_perc:,.2f}%**]")
+        st.markdown(texts["breakeven_making_perc"])
 
         st.markdown("### Cost Price:")
-        st.markdown(f"## :orange[₹ **{cp_total:,.2f}**]")
+        st.markdown(texts["cp_total"])
+
+# Cost a whole lot delivered by the goldsmith at once
+st.divider()
+st.subheader("Lot Costing")
+st.write(
+    "Upload a CSV file with one row per piece. Only **total_weight** is required; "
+    "**carat**, **goldsmith_loss_perc** and **baseline** default to the values above, "
+    "**extra_charges** (per piece) to 0. The gold rate entered above is used for all pieces."
+)
+st.download_button(
+    "Download a template",
+    "total_weight,carat,goldsmith_loss_perc,baseline,extra_charges\n"
+    "10.500,22,4.0,0.92,0\n"
+    "4.250,18,5.5,0.755,150\n",
+    file_name="lot_template.csv",
+    mime="text/csv",
+)
+lot_file = st.file_uploader("Upload the lot (CSV)", type="csv", key="lot_file_cp")
+
+if lot_file is not None:
+    # Only loaded when a lot is costed, the single-piece calculator doesn't need them
+    import numpy as np
+    import pandas as pd
+
+    from app_files.calculate_batch import cost_price_gold_batch, lot_totals
+
+    lot = pd.read_csv(lot_file)
+    if "total_weight" not in lot.columns:
+        st.error("The lot needs a **total_weight** column.")
+        st.stop()
+
+    lot_columns = {
+        name: pd.to_numeric(lot[name], errors="coerce").to_numpy(float)
+        for name in [
+            "total_weight",
+            "carat",
+            "goldsmith_loss_perc",
+            "baseline",
+            "extra_charges",
+        ]
+        if name in lot.columns
+    }
+    # Skip the pieces with missing or non-numeric values
+    valid = np.all([np.isfinite(column) for column in lot_columns.values()], axis=0)
+    if not valid.all():
+        st.warning(f"Skipped {(~valid).sum()} piece(s) with missing or invalid values.")
+        lot = lot[valid]
+        lot_columns = {name: column[valid] for name, column in lot_columns.items()}
+
+    # Pieces of different purity are all costed from the 24k rate
+    gold_rate_24k = gold_rate if is_24k_rate else gold_rate / (carat / 24.0)
+    lot_results = cost_price_gold_batch(
+        **{
+            "gold_rate": gold_rate_24k,
+            "goldsmith_loss_perc": goldsmith_loss_perc,
+            "baseline": baseline,
+            "carat": carat,
+            "extra_charges": 0.0,
+            **lot_columns,
+        },
+        is_24k_rate=True,
+    )
+    totals = lot_totals(lot_results)
+
+    col1, col2, col3 = st.columns(3, gap="small")
+    with col1:
+        st.write("Pieces:")
+        st.markdown(f":green[**{totals['pieces']:,}**]")
+        st.write("Pure Weight:")
+        st.markdown(f":green[**{totals['total_pure_wt']:,.4f} gm.**]")
+    with col2:
+        st.write("Total Payable Wt.:")
+        st.markdown(f":orange[**{totals['total_payable_wt']:,.4f} gm.**]")
+        st.write("Excess Wt.:")
+        st.markdown(f":green[**{totals['goldsmith_loss_wt']:,.4f} gm.**]")
+    with col3:
+        st.write("Breakeven Making Charges (%):")
+        if totals["breakeven_making_perc"] is not None:
+            st.markdown(f":orange[**{totals['breakeven_making_perc']:,.2f}%**]")
+        st.write("Cost Price:")
+        st.markdown(f":orange[₹ **{totals['cp_total']:,.2f}**]")
+
+    costed_lot = lot.assign(**lot_results._asdict())
+    st.dataframe(costed_lot, hide_index=True, use_container_width=True)
+    st.download_button(
+        "Download the costed lot (CSV)",
+        costed_lot.to_csv(index=False),
+        file_name=lot_file.name.rsplit(".", 1)[0] + "_costed.csv",
+        mime="text/csv",
+    )
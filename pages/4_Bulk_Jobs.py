@@ -0,0 +1,97 @@
+import os
+import tempfile
+
+import streamlit as st
+from app_files.bulk_jobs import (
+    FORMATS_BY_SUFFIX,
+    JOBS,
+    file_format,
+    run_job,
+    template,
+)
+
+st.title("Bulk Calculations")
+
+st.write(
+    "Run one of the calculators over a whole file of items, quotes or pieces: "
+    "upload a CSV, Excel (.xlsx) or Parquet file with one row per record and download "
+    "the results. The file is processed in chunks; for files larger than the upload "
+    "limit, use `python -m app_files.bulk_jobs` on the server."
+)
+
+job = JOBS[
+    st.selectbox(
+        "Calculation",
+        list(JOBS),
+        format_func=lambda name: JOBS[name].title,
+        key="bulk_job",
+    )
+]
+st.write(
+    f"Required columns: **{', '.join(job.required)}**. Optional: "
+    f"{', '.join(name for name in job.example if name not in job.required)} "
+    "(blank or missing columns take the calculator's defaults)."
+)
+st.download_button(
+    "Download a template",
+    template(job).to_csv(index=False),
+    file_name=f"{job.name}_template.csv",
+    mime="text/csv",
+)
+
+source = st.file_uploader(
+    "Upload the file",
+    type=[suffix.lstrip(".") for suffix in FORMATS_BY_SUFFIX],
+    key="bulk_source",
+)
+output_suffix = st.radio(
+    "Output format", [".csv", ".xlsx", ".parquet"], horizontal=True, key="bulk_output"
+)
+chunk_rows = st.number_input(
+    "Rows per chunk", min_value=1_000, value=100_000, step=10_000, key="bulk_chunk"
+)
+
+if source is not None and st.button("Run", type="primary"):
+    status = st.empty()
+    output = tempfile.NamedTemporaryFile(suffix=output_suffix, delete=False)
+    output.close()
+    try:
+        report = run_job(
+            job,
+            source,
+            output.name,
+            int(chunk_rows),
+            source_format=file_format(source.name),
+            progress=lambda rows, seconds: status.caption(
+                f"{rows:,} rows ({rows / max(seconds, 1e-9):,.0f} rows/s)"
+            ),
+        )
+        with open(output.name, "rb") as f:
+            result = f.read()
+    except (ValueError, ImportError) as e:
+        st.session_state.pop("bulk_result", None)
+        st.error(f"The file could not be processed: {e}")
+        st.stop()
+    finally:
+        os.remove(output.name)
+
+    # Kept for the reruns that follow, e.g. the one the download button triggers
+    st.session_state.bulk_result = (
+        source.name.rsplit(".", 1)[0] + f"_{job.name}{output_suffix}",
+        result,
+        report,
+    )
+    status.empty()
+
+if "bulk_result" in st.session_state:
+    file_name, result, report = st.session_state.bulk_result
+    st.success(
+        f"{report.rows:,} rows in {report.seconds:.1f} s "
+        f"({report.rows_per_second:,.0f} rows/s)"
+    )
+    if report.invalid_rows:
+        st.warning(
+            f"{report.invalid_rows:,} row(s) have values that couldn't be read; "
+            "see the invalid_columns column."
+        )
+    st.download_button("Download the results", result, file_name=file_name)
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from app_files.atomic_json import write_json_atomic
+
+
+def test_writes_and_replaces(tmp_path):
+    path = tmp_path / "data" / "rates.json"
+
+    write_json_atomic(path, {"rate": 1})
+    write_json_atomic(path, {"rate": 2})
+
+    assert json.loads(path.read_text()) == {"rate": 2}
+    assert [p.name for p in path.parent.iterdir()] == ["rates.json"]
+
+
+def test_a_failed_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / "rates.json"
+    write_json_atomic(path, {"rate": 1})
+
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"rate": 2, "fetched_at": object()})
+
+    assert json.loads(path.read_text()) == {"rate": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["rates.json"]
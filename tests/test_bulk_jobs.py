@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app_files.bulk_jobs import (
+    INVALID_COLUMNS,
+    JOBS,
+    file_format,
+    run_chunk,
+    run_job,
+    template,
+)
+
+SUFFIXES = [".csv", ".xlsx", ".parquet"]
+
+
+def write(table, path):
+    if path.suffix == ".xlsx":
+        table.to_excel(path, index=False)
+    elif path.suffix == ".parquet":
+        table.to_parquet(path, index=False)
+    else:
+        table.to_csv(path, index=False)
+
+
+def read(path):
+    if path.suffix == ".xlsx":
+        return pd.read_excel(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def ramp(job, rows):
+    """
+    `rows` copies of the job's template, the first numeric column growing by 1 per row.
+    """
+    table = pd.concat([template(job)] * rows, ignore_index=True)
+    name = job.required[0]
+    table[name] = table[name] + np.arange(rows)
+    return table
+
+
+@pytest.mark.parametrize("name", sorted(JOBS))
+def test_every_job_runs_its_template(name):
+    job = JOBS[name]
+    assert job.name == name
+    assert set(job.required) <= set(job.numeric)
+    assert set(template(job).columns) == set(job.numeric) | set(job.flags)
+
+    result = run_chunk(job, template(job).astype("string"))
+
+    assert result[INVALID_COLUMNS].tolist() == [""]
+    results = result.drop(columns=[*template(job).columns, INVALID_COLUMNS])
+    assert not results.empty
+    assert results.select_dtypes("number").notna().all(axis=None)
+
+
+def test_unsupported_file_type():
+    with pytest.raises(ValueError, match=".txt"):
+        file_format("items.txt")
+
+
+def test_chunks_give_the_same_results_as_one_pass(tmp_path):
+    write(ramp(JOBS["gold_sell"], 10), tmp_path / "items.csv")
+    progress = []
+
+    report = run_job(
+        "gold_sell",
+        tmp_path / "items.csv",
+        tmp_path / "chunked.csv",
+        chunk_rows=4,
+        progress=lambda rows, seconds: progress.append(rows),
+    )
+    run_job("gold_sell", tmp_path / "items.csv", tmp_path / "whole.csv")
+
+    assert (report.rows, report.invalid_rows) == (10, 0)
+    assert progress == [4, 8, 10]
+    pd.testing.assert_frame_equal(
+        read(tmp_path / "chunked.csv"), read(tmp_path / "whole.csv")
+    )
+
+
+@pytest.mark.parametrize("source_suffix", SUFFIXES)
+@pytest.mark.parametrize("destination_suffix", SUFFIXES)
+def test_readers_and_writers(tmp_path, source_suffix, destination_suffix):
+    if ".xlsx" in (source_suffix, destination_suffix):
+        pytest.importorskip("openpyxl")
+    job = JOBS["cost_price"]
+    source = tmp_path / f"lot{source_suffix}"
+    destination = tmp_path / f"costed{destination_suffix}"
+    write(ramp(job, 5), source)
+
+    run_job(job, source, destination, chunk_rows=2)
+
+    costed = read(destination)
+    expected = run_chunk(job, ramp(job, 5).astype("string"))
+    assert list(costed.columns) == list(expected.columns)
+    assert np.allclose(costed["cp_total"], expected["cp_total"])
+    assert costed[INVALID_COLUMNS].fillna("").tolist() == [""] * 5
+
+
+def test_on_chunk_selects_the_rows_written(tmp_path):
+    write(ramp(JOBS["gold_sell"], 6), tmp_path / "items.csv")
+
+    report = run_job(
+        "gold_sell",
+        tmp_path / "items.csv",
+        tmp_path / "priced.csv",
+        chunk_rows=4,
+        on_chunk=lambda result: result.iloc[:1],
+    )
+
+    assert report.rows == 6
+    assert read(tmp_path / "priced.csv")["gold_rate"].tolist() == [9150, 9154]
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app_files.calculate import gold_sell
+from app_files.calculate_batch import (
+    cost_price_gold_batch,
+    gold_making_charges_batch,
+    gold_sell_batch,
+)
+
+
+def test_a_table_is_priced_like_the_scalar_calculator():
+    table = pd.DataFrame(
+        {"weight": [1.5, 10.0], "making_charge_perc": [12, 8.5], "carat": [22, 18]}
+    )
+
+    columns = gold_sell_batch(9150, **table)
+
+    for i, row in table.iterrows():
+        assert [column[i] for column in columns] == list(gold_sell(9150, **row))
+
+
+@pytest.mark.parametrize(
+    "batch, misspelled",
+    [
+        (gold_sell_batch, "wieght"),
+        (gold_making_charges_batch, "gold_weigth"),
+        (cost_price_gold_batch, "total_wieght"),
+    ],
+)
+def test_an_unknown_column_raises(batch, misspelled):
+    with pytest.raises(TypeError, match=misspelled):
+        batch(**{misspelled: np.ones(3)})
@@ -0,0 +1,121 @@
+import random
+
+from app_files.invoice import Invoice, InvoiceItem, InvoiceTotals
+from app_files.money import GST_PPM, PPM, div_round, gold_sell_exact, to_mg
+
+
+def item(description="Ring", **fields):
+    values = dict(
+        gold_rate=9150.0,
+        qty=1,
+        weight=4.25,
+        making_charge_perc=12.0,
+        hm_charges_per_pc=53.0,
+        extra_charges=0.0,
+        carat=22,
+        is_24k_rate=False,
+    )
+    return InvoiceItem(description, **{**values, **fields})
+
+
+def recomputed(items, calculate_with_tax=True):
+    """
+    The totals of an invoice of `items`, priced afresh.
+    """
+    amounts = [gold_sell_exact(*item[1:7], False, *item[7:]) for item in items]
+    total_before_tax = sum(a.total_before_tax for a in amounts)
+    half_gst = (
+        div_round(total_before_tax * (GST_PPM // 2), PPM) if calculate_with_tax else 0
+    )
+    return InvoiceTotals(
+        lines=len(items),
+        pieces=sum(item.qty for item in items),
+        weight=sum(to_mg(item.weight) for item in items),
+        gold_charges=sum(a.gold_charges for a in amounts),
+        making_charges=sum(a.making_charges for a in amounts),
+        hm_charges=sum(a.hm_charges for a in amounts),
+        total_before_tax=total_before_tax,
+        cgst=half_gst,
+        sgst=half_gst,
+        tax=2 * half_gst,
+        total_price=total_before_tax + 2 * half_gst,
+        pure_gold_weight=sum(a.pure_gold_weight for a in amounts),
+        total_recouped_pure_weight=sum(a.total_recouped_pure_weight for a in amounts),
+    )
+
+
+def test_running_totals_match_a_full_recompute():
+    rng = random.Random(0)
+    invoice = Invoice()
+    items = {}
+
+    for step in range(200):
+        action = rng.choice(["add", "add", "update", "remove"])
+        if action == "add" or not items:
+            new = item(
+                f"Item {step}",
+                qty=rng.randint(1, 4),
+                weight=round(rng.uniform(0.5, 40), 3),
+                making_charge_perc=round(rng.uniform(0, 25), 3),
+                carat=rng.choice([18, 22, 24]),
+                is_24k_rate=rng.random() < 0.3,
+            )
+            items[invoice.add(new)] = new
+        elif action == "update":
+            line_id = rng.choice(list(items))
+            changes = dict(qty=rng.randint(1, 4), weight=round(rng.uniform(0.5, 40), 3))
+            line = invoice.update(line_id, **changes)
+            items[line_id] = items[line_id]._replace(**changes)
+            assert line.item == items[line_id]
+        else:
+            line_id = rng.choice(list(items))
+            invoice.remove(line_id)
+            del items[line_id]
+
+        assert invoice.totals() == recomputed(list(items.values()))
+
+
+def test_edits_are_revisions_of_a_line():
+    invoice = Invoice()
+    line_id = invoice.add(item())
+
+    line = invoice.update(line_id, qty=3)
+
+    assert (line.revision, line.item.qty) == (2, 3)
+    assert line.texts["details"].startswith("22k · 3 pc.")
+    assert len(invoice) == 1
+
+
+def test_gst_is_split_into_cgst_and_sgst_rounded_to_the_paisa():
+    invoice = Invoice()
+    # ₹100.00 of gold and ₹0.50 of extra charges: 1.5 % of ₹100.50 is ₹1.5075
+    invoice.add(
+        item(gold_rate=100, weight=1, making_charge_perc=0, hm_charges_per_pc=0)
+    )
+    invoice.add(
+        item(
+            gold_rate=0,
+            weight=1,
+            making_charge_perc=0,
+            hm_charges_per_pc=0,
+            extra_charges=0.5,
+        )
+    )
+
+    totals = invoice.totals()
+
+    assert totals.total_before_tax == 100_50
+    assert (totals.cgst, totals.sgst, totals.tax) == (1_51, 1_51, 3_02)
+    assert totals.total_price == 103_52
+
+
+def test_no_gst_and_clear():
+    invoice = Invoice(calculate_with_tax=False)
+    invoice.add(item())
+    assert invoice.totals() == recomputed([item()], calculate_with_tax=False)
+    assert invoice.totals().tax == 0
+
+    invoice.clear()
+
+    assert invoice.totals() == recomputed([])
+    assert invoice.lines == {}
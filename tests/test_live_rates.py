@@ -0,0 +1,47 @@
+import pytest
+
+from app_files import live_rates
+from app_files.rate_poller import make_snapshot
+
+LIVE = {"timestamp": "10:00", "Gold GOLD 995 100gms (T+0)": "75150"}
+SILVER_ONLY = {"timestamp": "10:05", "Silver 999 30kg": "89250"}
+
+
+class SessionState(dict):
+    """
+    The item and attribute access of `st.session_state`, outside a script run.
+    """
+
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def session_state(monkeypatch):
+    state = SessionState()
+    monkeypatch.setattr(live_rates.st, "session_state", state)
+    return state
+
+
+def test_live_carat_rates_become_the_defaults(session_state):
+    live_rates.apply_rates(make_snapshot(1, LIVE, 0.0), reset_user_rate=True)
+
+    carat_rates = session_state["carat_rates"]
+    assert session_state.gold_rate == carat_rates.rate(24)
+    assert live_rates.default_gold_rates(22) == (
+        carat_rates.rate(22),
+        carat_rates.rate_as_24k(22),
+    )
+
+
+def test_rates_without_gold_drop_the_previous_gold_rates(session_state):
+    live_rates.apply_rates(make_snapshot(1, LIVE, 0.0))
+    live_rates.apply_rates(make_snapshot(2, SILVER_ONLY, 0.0))
+
+    for key in ("carat_rates", "current_gold_rate_per_gram", "gold_rate_916"):
+        assert key not in session_state
+    assert session_state["live_rates"] == SILVER_ONLY
+    assert live_rates.default_gold_rates(22) == (
+        live_rates.DEFAULT_CARAT_RATE,
+        live_rates.DEFAULT_24K_RATE,
+    )
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from app_files.calculate import gold_making_charges
+from app_files.making_charge_audit import audit_chunk, audit_csv
+
+
+def quotes(**overrides):
+    row = {
+        "gold_rate": "9150",
+        "gold_weight": "10.5",
+        "total_price": "110000",
+        "hm_charges": "53",
+        "no_pcs": "1",
+        "gst": "3",
+        "extra_charges": "0",
+    }
+    return pd.DataFrame([{**row, **overrides}])
+
+
+def test_blank_optional_cells_take_the_defaults():
+    result = audit_chunk(quotes(hm_charges="", no_pcs=None, gst=" ", extra_charges=""))
+
+    expected = gold_making_charges(9150, 10.5, 110000)
+    assert np.allclose(result["making_charge_perc"], expected[0])
+    assert result["flag"].iloc[0] != "invalid"
+    assert result["invalid_columns"].iloc[0] == ""
+
+
+def test_text_that_is_no_number_is_named():
+    result = audit_chunk(quotes(gst="three", gold_rate=""))
+
+    assert result["flag"].iloc[0] == "invalid"
+    assert result["invalid_columns"].iloc[0] == "gold_rate gst"
+
+
+def test_audit_csv_counts_the_invalid_columns(tmp_path):
+    source = tmp_path / "quotes.csv"
+    pd.concat([quotes(), quotes(no_pcs="x"), quotes(hm_charges="")]).to_csv(
+        source, index=False
+    )
+
+    rows, flags, invalid = audit_csv(source, tmp_path / "audited.csv")
+
+    assert rows == 3
+    assert flags["invalid"] == 1
+    assert invalid == {"no_pcs": 1}
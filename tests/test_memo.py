@@ -0,0 +1,32 @@
+from app_files.memo import LRUMemo, memoized, normalize
+
+
+def test_normalize():
+    assert normalize(53.0) == 53 and isinstance(normalize(53.0), int)
+    assert normalize(1.1000000000000001) == 1.1
+    assert normalize([1.0, (2.5, "a")]) == (1, (2.5, "a"))
+    assert normalize(True) is True
+
+
+def test_equal_inputs_give_the_same_text_whichever_comes_first():
+    @memoized(LRUMemo())
+    def hm_text(hm_charges_per_pc, carat=22):
+        return f"₹{hm_charges_per_pc}/pc. on {carat}k"
+
+    assert hm_text(53.0, carat=22.0) == "₹53/pc. on 22k"
+    assert hm_text(53) == "₹53/pc. on 22k"
+    assert hm_text(45.5) == "₹45.5/pc. on 22k"
+
+
+def test_results_are_cached_per_normalized_arguments():
+    memo = LRUMemo()
+    calls = []
+
+    @memoized(memo)
+    def total(weight, making_charge_perc=12):
+        calls.append(weight)
+        return weight * (1 + making_charge_perc / 100)
+
+    assert total(10, making_charge_perc=12.0) == total(10.0, making_charge_perc=12)
+    assert calls == [10]
+    assert memo.stats()["hits"] == 1
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from app_files.money import (
+    cost_price_gold_paise,
+    cost_price_gold_paise_batch,
+    gold_making_charges_exact,
+    gold_making_charges_paise,
+    gold_making_charges_paise_batch,
+    to_mg,
+    to_paise,
+)
+
+QUOTES = [
+    # gold_rate, gold_weight, total_price (paise per gram, mg, paise)
+    (915_000, 10_500, 11_000_000),
+    (0, 10_500, 11_000_000),
+    (915_000, 0, 11_000_000),
+]
+
+
+@pytest.mark.parametrize("gold_rate, gold_weight, total_price", QUOTES[1:])
+def test_no_gold_value_solves_to_zero(gold_rate, gold_weight, total_price):
+    amounts = gold_making_charges_paise(gold_rate, gold_weight, total_price, 5_300)
+
+    assert amounts.making_charge_ppm == 0
+    # 110,000.00 / 1.03 - 53.00
+    assert amounts.making_charges == 10_679_612 - 5_300
+
+
+@pytest.mark.filterwarnings("error")
+def test_the_batch_solves_every_row_like_the_scalar_version():
+    gold_rate, gold_weight, total_price = (np.array(column) for column in zip(*QUOTES))
+
+    batch = gold_making_charges_paise_batch(gold_rate, gold_weight, total_price, 5_300)
+
+    for i, quote in enumerate(QUOTES):
+        assert (
+            batch.making_charge_ppm[i],
+            batch.making_charges[i],
+        ) == gold_making_charges_paise(*quote, 5_300)
+
+
+def test_exact_matches_the_entered_values():
+    amounts = gold_making_charges_exact(9150, 10.5, 110000, 53)
+
+    assert amounts == gold_making_charges_paise(
+        to_paise(9150), to_mg(10.5), to_paise(110000), to_paise(53)
+    )
+    assert amounts.making_charge_ppm > 0
+
+
+@pytest.mark.filterwarnings("error")
+def test_a_piece_with_no_weight_breaks_even_at_zero():
+    scalar = cost_price_gold_paise(915_000, 40_000, 920_000, total_weight=0)
+    batch = cost_price_gold_paise_batch(
+        915_000, 40_000, 920_000, total_weight=np.array([0, 10_500])
+    )
+
+    assert scalar.breakeven_making_ppm == 0
+    assert [column[0] for column in batch] == list(scalar)
+    assert batch.breakeven_making_ppm[1] > 0
@@ -0,0 +1,148 @@
+import threading
+
+import pytest
+
+from app_files.providers import (
+    POLICY_FIRST_VALID,
+    POLICY_MEDIAN,
+    POLICY_PREFERRED,
+    CallableRateProvider,
+    RateAggregator,
+    RateProvider,
+)
+
+
+def test_a_provider_must_implement_fetch():
+    class NoFetch(RateProvider):
+        pass
+
+    with pytest.raises(TypeError, match="fetch"):
+        NoFetch()
+
+
+def answers(rate):
+    return {"timestamp": "10:00", "Gold 995 100gms": rate}
+
+
+def failing():
+    raise ConnectionError("site down")
+
+
+@pytest.fixture
+def gate():
+    """
+    Held by the "slow" providers until the test is done with them.
+    """
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def provider(name, rates=None, wait_for=None):
+    def fetch():
+        if wait_for is not None:
+            wait_for.wait()
+        return rates() if callable(rates) else rates
+
+    return CallableRateProvider(name, fetch)
+
+
+def test_first_valid_takes_the_first_answer_with_rates(gate):
+    aggregator = RateAggregator(
+        [
+            provider("slow", answers("75000"), wait_for=gate),
+            provider("down", failing),
+            provider("empty", {"timestamp": "10:00"}),
+            provider("fast", answers("75150")),
+        ],
+        policy=POLICY_FIRST_VALID,
+    )
+
+    assert aggregator.fetch() == dict(answers("75150"), source="fast")
+
+
+def test_median_of_the_valid_answers():
+    aggregator = RateAggregator(
+        [
+            provider("a", answers("75,100")),
+            provider("b", answers("75400")),
+            provider("c", answers("75150.50")),
+            provider("down", failing),
+        ],
+        policy=POLICY_MEDIAN,
+    )
+
+    rates = aggregator.fetch()
+
+    assert rates["Gold 995 100gms"] == "75150.50"
+    assert rates["source"] == "median of a, b, c"
+    assert aggregator.stats()["down"]["last_error"] == "down: site down"
+
+
+def test_preferred_waits_for_the_preferred_provider():
+    first = threading.Event()
+
+    def preferred_rates():
+        # Only answers once the other provider has
+        first.wait(5)
+        return answers("75200")
+
+    aggregator = RateAggregator(
+        [
+            provider("other", lambda: first.set() or answers("75150")),
+            provider("preferred", preferred_rates),
+        ],
+        policy=POLICY_PREFERRED,
+        preferred=["preferred"],
+    )
+
+    assert aggregator.fetch() == dict(answers("75200"), source="preferred")
+
+
+def test_preferred_fails_over_in_order():
+    aggregator = RateAggregator(
+        [
+            provider("third", answers("75300")),
+            provider("second", answers("75200")),
+            provider("first", failing),
+        ],
+        policy=POLICY_PREFERRED,
+        preferred=["first", "second"],
+    )
+
+    assert aggregator.fetch()["source"] == "second"
+
+
+def test_preferred_fails_over_at_the_deadline(gate):
+    aggregator = RateAggregator(
+        [
+            provider("hanging", answers("75000"), wait_for=gate),
+            provider("backup", answers("75150")),
+        ],
+        policy=POLICY_PREFERRED,
+        preferred=["hanging"],
+        deadline=0.2,
+    )
+
+    assert aggregator.fetch()["source"] == "backup"
+    # Still hanging: skipped on the next fetch, rather than queued
+    assert aggregator.fetch()["source"] == "backup"
+    stats = aggregator.stats()["hanging"]
+    assert (stats["calls"], stats["timeouts"], stats["skipped"]) == (1, 1, 1)
+
+
+def test_no_provider_with_rates():
+    aggregator = RateAggregator(
+        [provider("down", failing), provider("empty", {"timestamp": "10:00"})],
+        policy=POLICY_MEDIAN,
+    )
+
+    assert aggregator.fetch() == {
+        "error": "No rate provider returned rates "
+        "(down: down: site down; empty: No rates were found.)"
+    }
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError, match="fastest"):
+        RateAggregator([], policy="fastest")
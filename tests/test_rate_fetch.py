@@ -0,0 +1,101 @@
+import http.server
+import threading
+import time
+from functools import partial
+
+import pytest
+
+from app_files import http_fetcher, scraper
+from app_files.rate_fetch import TIER_HTTP, TIER_SELENIUM, fetch_rates
+from benchmarks.fixture_server import FIXTURES_DIR
+
+SELENIUM_RATES = {"timestamp": "now", "Gold GOLD 995 100gms (T+0)": "75150"}
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """
+    /<fixture>.html serves a recorded page, /status/<code> answers with that status
+    and /slow answers after a second.
+    """
+
+    def do_GET(self):
+        if self.path.startswith("/status/"):
+            self.send_error(int(self.path.rsplit("/", 1)[1]))
+            return
+        if self.path == "/slow":
+            time.sleep(1)
+            self.path = "/liverate_normal.html"
+        body = (FIXTURES_DIR / self.path.lstrip("/")).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # the client gave up waiting for /slow
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def selenium(monkeypatch):
+    """
+    Stands in for the browser tier; records the pages it was asked to load.
+    """
+    calls = []
+
+    def get_rates_with_selenium(pool, breaker=None, url=None):
+        calls.append(url)
+        return dict(SELENIUM_RATES)
+
+    monkeypatch.setattr(scraper, "get_rates_with_selenium", get_rates_with_selenium)
+    # Short timeouts, so the timeout case doesn't hold up the suite
+    monkeypatch.setattr(
+        http_fetcher,
+        "get_rates_with_http",
+        partial(http_fetcher.get_rates_with_http, timeout=0.2),
+    )
+    return calls
+
+
+def test_http_serves_the_rates(server, selenium):
+    pools = []
+
+    rates = fetch_rates(lambda: pools.append(1), f"{server}/liverate_normal.html")
+
+    assert rates["tier"] == TIER_HTTP
+    assert rates["Gold GOLD 995 100gms (T+0)"] == "75150"
+    assert len(rates) == 7  # five rates, the timestamp and the tier
+    assert (selenium, pools) == ([], [])
+
+
+@pytest.mark.parametrize(
+    "path", ["/status/404", "/status/500", "/slow", "/liverate_slow.html"]
+)
+def test_falls_back_to_selenium(server, selenium, path):
+    rates = fetch_rates(lambda: None, f"{server}{path}", page_url="page")
+
+    assert rates == {**SELENIUM_RATES, "tier": TIER_SELENIUM}
+    assert selenium == ["page"]
+
+
+def test_no_tier_when_both_fail(server, monkeypatch):
+    monkeypatch.setattr(
+        scraper, "get_rates_with_selenium", lambda pool, breaker, url: {"error": "x"}
+    )
+
+    rates = fetch_rates(lambda: None, f"{server}/status/503")
+
+    assert rates == {"error": "x"}
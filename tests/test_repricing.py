@@ -0,0 +1,59 @@
+import numpy as np
+
+from app_files.calculate_batch import gold_sell_batch
+from app_files.carat_rates import build_carat_rates
+from app_files.rate_poller import make_snapshot
+from app_files.repricing import InventoryRepricer
+
+INVENTORY = {
+    "sku": np.array([101, 102, 103, 104]),
+    "weight": np.array([10.5, 2.0, 7.25, 1.0]),
+    "carat": np.array([22, 18, 22, 24]),
+    "making_charge_perc": np.array([12.0, 15.0, 8.5, 4.0]),
+    "is_24k_rate": np.array([False, True, False, False]),
+}
+
+
+def snapshot(version, rate_24k_per_10g):
+    return make_snapshot(
+        version, {"Gold GOLD 995 100gms (T+0)": str(rate_24k_per_10g)}, 0.0
+    )
+
+
+def test_tags_match_a_full_pricing():
+    carat_rates = build_carat_rates(75150)
+    repricer = InventoryRepricer(INVENTORY)
+
+    changes = repricer.reprice_with(carat_rates)
+
+    gold_rate = [
+        carat_rates.rate(24 if is_24k else carat)
+        for carat, is_24k in zip(INVENTORY["carat"], INVENTORY["is_24k_rate"])
+    ]
+    full = gold_sell_batch(
+        gold_rate, **{k: v for k, v in INVENTORY.items() if k != "sku"}
+    )
+    tags = dict(zip(changes.sku, changes.new_tag))
+    for sku, total_price in zip(INVENTORY["sku"], full.total_price):
+        # Tags are rounded half up to the rupee
+        assert tags[sku] == np.floor(total_price + 0.5)
+
+
+def test_on_snapshot_returns_the_changes_quietly(capsys):
+    repricer = InventoryRepricer(INVENTORY)
+
+    first = repricer.on_snapshot(snapshot(1, 75150))
+    same = repricer.on_snapshot(snapshot(2, 75150))
+
+    assert sorted(first.sku) == sorted(INVENTORY["sku"])
+    assert (len(same.sku), same.groups) == (0, 0)
+    assert capsys.readouterr().out == ""
+
+
+def test_on_snapshot_without_gold_rates():
+    repricer = InventoryRepricer(INVENTORY)
+
+    assert (
+        repricer.on_snapshot(make_snapshot(1, {"Silver 999 30kg": "89250"}, 0)) is None
+    )
+    assert np.isnan(repricer.tags()["tag"]).all()
@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+
+from app_files import scraper
+from app_files.circuit_breaker import CircuitBreaker
+
+
+class StubPool:
+    """
+    A driver pool that counts the browsers released to it and thrown away.
+    """
+
+    def __init__(self):
+        self.released = 0
+        self.discarded = 0
+
+    @contextmanager
+    def driver(self):
+        try:
+            yield object()
+        except Exception:
+            self.discarded += 1
+            raise
+        else:
+            self.released += 1
+
+
+def stub_page(monkeypatch, rates):
+    monkeypatch.setattr(scraper, "load_live_rates_page", lambda driver, url: None)
+    monkeypatch.setattr(scraper, "wait_for_rates", lambda driver, timeout: None)
+    monkeypatch.setattr(scraper, "record_fetch_metrics", lambda driver, seconds: None)
+    monkeypatch.setattr(
+        scraper, "extract_rates", lambda driver, found: found.update(rates) or found
+    )
+
+
+def test_page_without_rates_keeps_the_browser(monkeypatch):
+    stub_page(monkeypatch, {})
+    pool = StubPool()
+    breaker = CircuitBreaker(failure_threshold=3)
+
+    rates = scraper.get_rates_with_selenium(pool, breaker=breaker)
+
+    assert "No rates were found" in rates["error"]
+    assert (pool.released, pool.discarded) == (1, 0)
+    assert breaker.stats()["failures"] == {"no_rates": 1}
+
+
+def test_rates_are_returned_and_recorded_as_a_success(monkeypatch):
+    stub_page(monkeypatch, {"Gold 995 100gms": "75150"})
+    pool = StubPool()
+    breaker = CircuitBreaker(failure_threshold=3)
+
+    rates = scraper.get_rates_with_selenium(pool, breaker=breaker)
+
+    assert rates["Gold 995 100gms"] == "75150"
+    assert pool.released == 1
+    assert breaker.stats()["consecutive_failures"] == 0
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from app_files.single_flight import FetchLease, SingleFlight
+
+
+def test_concurrent_callers_share_one_fetch():
+    started = threading.Event()
+    finish = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+        return {"Gold": "75150"}
+
+    flight = SingleFlight(fetch, timeout=5)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight())) for _ in range(8)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)  # let the other callers reach the fetch in flight
+    finish.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"Gold": "75150"}] * 8
+    assert flight.stats() == {
+        "executed": 1,
+        "coalesced": 7,
+        "coalesced_remote": 0,
+        "timeouts": 0,
+    }
+    # Once the fetch has finished, the next call fetches again
+    flight()
+    assert len(calls) == 2
+
+
+def test_a_failed_fetch_is_an_error_for_its_callers():
+    def fetch():
+        raise ConnectionError("site down")
+
+    flight = SingleFlight(fetch)
+
+    assert flight() == {"error": "An error occurred while fetching rates: site down"}
+
+
+def test_an_expired_lease_is_taken_over(tmp_path):
+    path = tmp_path / "lease.sqlite3"
+    crashed = FetchLease(path=path, ttl=0.2)
+    other = FetchLease(path=path, ttl=0.2)
+
+    assert crashed.acquire()
+    assert not other.acquire()
+    assert other.result_since(0) == (None, True)
+
+    time.sleep(0.3)
+
+    assert other.result_since(0) == (None, False)
+    assert other.acquire()
+    assert not crashed.acquire()
+    # The former holder can't free or publish under the lease it lost
+    crashed.release({"Gold": "1"})
+    assert not crashed.acquire()
+    assert crashed.result_since(0) == (None, True)
+
+
+def test_a_waiting_process_takes_the_published_result(tmp_path):
+    path = tmp_path / "lease.sqlite3"
+    holder = FetchLease(path=path, ttl=5)
+    calls = []
+    flight = SingleFlight(
+        lambda: calls.append(1) or {"Gold": "0"},
+        timeout=5,
+        lease=FetchLease(path=path, ttl=5),
+        poll_interval=0.01,
+    )
+    assert holder.acquire()
+
+    publish = threading.Timer(0.1, holder.release, [{"Gold": "75150"}])
+    publish.start()
+    result = flight()
+    publish.join()
+
+    assert result == {"Gold": "75150"}
+    assert calls == []
+    assert flight.stats()["coalesced_remote"] == 1